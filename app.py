@@ -1,768 +1,1072 @@
-import streamlit as st
-import pandas as pd
-import random
-import time
-import plotly.express as px
-import os
-import json
-from datetime import datetime, timedelta
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-
-# --- AYARLAR ---
-st.set_page_config(page_title="AHAL TEKE Tenis Kulubü", layout="wide")
-
-# GÜN SÖZLÜĞÜ
-GUNLER_MAP = {
-    0: 'Pazartesi', 1: 'Salı', 2: 'Çarşamba',
-    3: 'Perşembe', 4: 'Cuma', 5: 'Cumartesi', 6: 'Pazar'
-}
-
-# YENİ: TAM SAATLER LİSTESİ (07:00 - 23:00 arası)
-TAM_SAATLER = [f"{str(i).zfill(2)}:00" for i in range(7, 24)]
-
-# --- GOOGLE SHEETS BAĞLANTISI ---
-@st.cache_resource
-def init_connection():
-    scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-
-    if "GOOGLE_JSON" in os.environ:
-        creds_dict = json.loads(os.environ["GOOGLE_JSON"])
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-    elif "gcp_service_account" in st.secrets:
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(st.secrets["gcp_service_account"], scope)
-    else:
-        st.error("Hata: Google şifreleri bulunamadı!")
-        st.stop()
-
-    client = gspread.authorize(creds)
-    return client
-
-def get_data():
-    client = init_connection()
-    sh = client.open("tenis_db")
-    return sh
-
-# --- YARDIMCI FONKSİYONLAR ---
-def veri_getir_df():
-    sh = get_data()
-    wks = sh.worksheet("uyelikler")
-    data = wks.get_all_records()
-    if not data: return pd.DataFrame()
-    return pd.DataFrame(data)
-
-def yoneticileri_getir():
-    sh = get_data()
-    try:
-        wks = sh.worksheet("yoneticiler")
-        return wks.get_all_records()
-    except:
-        return []
-
-def yeni_yonetici_ekle(kadi, sifre):
-    sh = get_data()
-    wks = sh.worksheet("yoneticiler")
-    wks.append_row([kadi, sifre])
-
-def sifre_guncelle(kadi, yeni_sifre):
-    sh = get_data()
-    wks = sh.worksheet("yoneticiler")
-    cell = wks.find(kadi)
-    if cell:
-        wks.update_cell(cell.row, 2, yeni_sifre)
-
-# --- OTOMATİK KONTROL SİSTEMİ ---
-def sistem_kontrol_sessiz_gs():
-    sh = get_data()
-    wks_uye = sh.worksheet("uyelikler")
-
-    try:
-        wks_gecmis = sh.worksheet("ders_gecmisi")
-    except:
-        wks_gecmis = sh.add_worksheet(title="ders_gecmisi", rows=1000, cols=3)
-        wks_gecmis.append_row(["uye_id", "tarih", "islem_tipi"])
-
-    try:
-        wks_tatil = sh.worksheet("tatiller")
-    except:
-        wks_tatil = sh.add_worksheet(title="tatiller", rows=100, cols=1)
-        wks_tatil.append_row(["tarih"])
-        
-    tatil_kayitlari = wks_tatil.get_all_records()
-    tatiller = set(str(r['tarih']) for r in tatil_kayitlari if r.get('tarih'))
-
-    uyeler = wks_uye.get_all_records()
-    gecmis = wks_gecmis.get_all_records()
-
-    gecmis_set = set()
-    for g in gecmis:
-        gecmis_set.add(f"{g['uye_id']}_{g['tarih']}")
-
-    bugun = datetime.now().date()
-
-    for i, uye in enumerate(uyeler):
-        row_num = i + 2
-        try:
-            kalan = int(uye['kalan_hak'])
-        except:
-            continue
-
-        if kalan <= 0: continue
-
-        try:
-            try:
-                baslangic = datetime.strptime(str(uye['baslangic_tarihi']), "%Y-%m-%d").date()
-            except:
-                baslangic = datetime.strptime(str(uye['baslangic_tarihi']), "%d.%m.%Y").date()
-        except:
-            continue
-
-        gunler = str(uye['gunler'])
-        if not gunler: continue
-        secilen_gunler = gunler.split(',')
-
-        gecen_gun = (bugun - baslangic).days
-        if gecen_gun < 0: continue  
-
-        dusulecek = 0
-
-        for j in range(gecen_gun + 1):
-            tarih = baslangic + timedelta(days=j)
-            if tarih > bugun: continue
-
-            gun_int = tarih.weekday()
-            gun_tr = GUNLER_MAP[gun_int] 
-            t_str = tarih.strftime("%Y-%m-%d")
-
-            if t_str in tatiller:
-                continue
-
-            if gun_tr in secilen_gunler:
-                key = f"{uye['id']}_{t_str}"
-                if key not in gecmis_set:
-                    dusulecek += 1
-                    wks_gecmis.append_row([uye['id'], t_str, 'Otomatik'])
-                    gecmis_set.add(key)
-
-        if dusulecek > 0:
-            yeni_hak = max(0, kalan - dusulecek)
-            wks_uye.update_cell(row_num, 9, yeni_hak)
-
-def yeni_uye_ekle_gs(ad, tel, cins, dt, bas, bitis, ucret, yontem, gunler_list, ders_tipi, hak_sayisi, veli_adi, kategori, saat):
-    sh = get_data()
-    wks = sh.worksheet("uyelikler")
-    yeni_id = int(time.time())
-    g_str = ",".join(gunler_list)
-    hak = int(hak_sayisi)
-
-    row = [
-        yeni_id, ad, tel, cins, str(dt), str(bas), str(bitis),
-        hak, hak, ucret, yontem, g_str, ders_tipi, veli_adi, "Aktif", kategori, str(saat)
-    ]
-    wks.append_row(row)
-
-    try:
-        sistem_kontrol_sessiz_gs()
-    except:
-        pass
-
-def uye_guncelle_gs(uye_id, ad, tel, dt_str, paket_tipi, toplam_hak, kalan_hak, veli_adi, kategori, saat_str):
-    sh = get_data()
-    wks = sh.worksheet("uyelikler")
-    cell = wks.find(str(uye_id))
-    if cell:
-        wks.update_cell(cell.row, 2, ad)
-        wks.update_cell(cell.row, 3, tel)
-        wks.update_cell(cell.row, 5, dt_str) 
-        wks.update_cell(cell.row, 8, toplam_hak)
-        wks.update_cell(cell.row, 9, kalan_hak)
-        wks.update_cell(cell.row, 13, paket_tipi)
-        wks.update_cell(cell.row, 14, veli_adi)
-        wks.update_cell(cell.row, 16, kategori) 
-        wks.update_cell(cell.row, 17, saat_str) 
-
-def uye_sil_gs(uye_id):
-    sh = get_data()
-    wks = sh.worksheet("uyelikler")
-    cell = wks.find(str(uye_id))
-    if cell:
-        wks.delete_rows(cell.row)
-
-def manuel_islem_gs(uye_id, miktar):
-    sh = get_data()
-    wks = sh.worksheet("uyelikler")
-    cell = wks.find(str(uye_id))
-    if cell:
-        kalan_hak_col = 9
-        mevcut = int(wks.cell(cell.row, kalan_hak_col).value)
-        yeni = max(0, mevcut + miktar)
-        wks.update_cell(cell.row, kalan_hak_col, yeni)
-
-def uyelik_yenile_gs(uye_id, eklenecek_hak, manuel_bitis_tarihi=None):
-    sh = get_data()
-    wks = sh.worksheet("uyelikler")
-    cell = wks.find(str(uye_id))
-    if cell:
-        bugun = str(datetime.now().date())
-        if manuel_bitis_tarihi:
-            yeni_bitis = str(manuel_bitis_tarihi)
-        else:
-            yeni_bitis = str((datetime.now() + timedelta(days=30)).date())
-
-        mevcut_kalan = int(wks.cell(cell.row, 9).value)
-        yeni_toplam_bakiye = mevcut_kalan + eklenecek_hak
-
-        wks.update_cell(cell.row, 6, bugun)
-        wks.update_cell(cell.row, 7, yeni_bitis)
-        wks.update_cell(cell.row, 8, eklenecek_hak)
-        wks.update_cell(cell.row, 9, yeni_toplam_bakiye)
-
-def yas_hesapla(dt_str):
-    if not dt_str: return 0
-    try:
-        try:
-            dt = datetime.strptime(str(dt_str), "%Y-%m-%d")
-        except:
-            dt = datetime.strptime(str(dt_str), "%d.%m.%Y")
-        bugun = datetime.now()
-        yas = bugun.year - dt.year - ((bugun.month, bugun.day) < (dt.month, dt.day))
-        return yas
-    except:
-        return 0
-
-# --- GİRİŞ MANTIĞI ---
-def giris_kontrol(kadi_girilen, sifre_girilen):
-    yoneticiler = yoneticileri_getir()
-    for y in yoneticiler:
-        if str(y['kullanici_adi']) == kadi_girilen and str(y['sifre']) == sifre_girilen:
-            return True
-    return False
-
-query_params = st.query_params
-if "durum" in query_params and query_params["durum"] == "giris_ok":
-    st.session_state.giris_yapildi = True
-    st.session_state.aktif_kullanici = query_params.get("user", "Admin")
-elif 'giris_yapildi' not in st.session_state:
-    st.session_state.giris_yapildi = False
-    st.session_state.aktif_kullanici = ""
-
-# --- LOGIN EKRANI ---
-if not st.session_state.giris_yapildi:
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        sub_c1, sub_c2, sub_c3 = st.columns([5, 3, 5])
-        with sub_c2:
-            if os.path.exists("logo.png"):
-                st.image("logo.png", use_container_width=True)
-            else:
-                st.markdown("<h1 style='text-align: center; font-size: 80px;'>🎾</h1>", unsafe_allow_html=True)
-
-        st.markdown("<h3 style='text-align: center;'>AHAL TEKE Yönetim Paneli</h3>", unsafe_allow_html=True)
-        st.write("")
-
-        with st.container(border=True):
-            kadi = st.text_input("Kullanıcı Adı")
-            sifre = st.text_input("Şifre", type="password")
-            if st.button("Giriş Yap", type="primary", use_container_width=True):
-                if giris_kontrol(kadi, sifre):
-                    st.session_state.giris_yapildi = True
-                    st.session_state.aktif_kullanici = kadi
-                    st.query_params["durum"] = "giris_ok"
-                    st.query_params["user"] = kadi
-                    st.success("Giriş başarılı!")
-                    time.sleep(0.5);
-                    st.rerun()
-                else:
-                    st.error("Hatalı bilgiler! (Lütfen Google Sheet 'yoneticiler' sayfasını kontrol edin)")
-    st.stop()
-
-# --- SIDEBAR ---
-with st.sidebar:
-    st.write(f"👤 Yönetici: **{st.session_state.aktif_kullanici}**")
-    st.info("🟢 Bağlantı: Google Sheets (Online)")
-
-    with st.expander("⚙️ Yönetici Ayarları"):
-        tab_admin1, tab_admin2, tab_admin3 = st.tabs(["🔑 Şifre", "➕ Yeni", "🏖️ Tatiller"])
-
-        with tab_admin1:
-            st.caption("Mevcut kullanıcının şifresini değiştir")
-            with st.form("sifre_degis_form", clear_on_submit=True):
-                yeni_pass = st.text_input("Yeni Şifre", type="password")
-                submitted = st.form_submit_button("Şifreyi Güncelle")
-                if submitted:
-                    if yeni_pass:
-                        sifre_guncelle(st.session_state.aktif_kullanici, yeni_pass)
-                        st.success("Şifre değişti!")
-                        time.sleep(1)
-                    else:
-                        st.error("Şifre boş olamaz")
-
-        with tab_admin2:
-            st.caption("Yeni yönetici ekle")
-            with st.form("yeni_yonetici_form", clear_on_submit=True):
-                new_admin_user = st.text_input("Kullanıcı Adı")
-                new_admin_pass = st.text_input("Şifre")
-                submitted_new = st.form_submit_button("Yönetici Ekle")
-                if submitted_new:
-                    if new_admin_user and new_admin_pass:
-                        yeni_yonetici_ekle(new_admin_user, new_admin_pass)
-                        st.success(f"{new_admin_user} eklendi!")
-                        time.sleep(1)
-                    else:
-                        st.error("Bilgileri eksiksiz girin")
-        
-        with tab_admin3:
-            st.caption("Ders düşülmeyecek günleri ekleyin.")
-            try:
-                sh_t = get_data()
-                wks_t = sh_t.worksheet("tatiller")
-                mevcut_tatiller = [str(r['tarih']) for r in wks_t.get_all_records() if r.get('tarih')]
-            except:
-                mevcut_tatiller = []
-            
-            if mevcut_tatiller:
-                st.write("**Mevcut Tatiller:**")
-                for t in mevcut_tatiller:
-                    st.markdown(f"- `{t}`")
-            else:
-                st.info("Kayıtlı tatil yok.")
-
-            yeni_tatil = st.date_input("Tatil Günü Seç", datetime.now(), format="DD/MM/YYYY")
-            if st.button("Tatil Ekle", use_container_width=True):
-                t_str = str(yeni_tatil)
-                if t_str not in mevcut_tatiller:
-                    try:
-                        wks_t = sh_t.worksheet("tatiller")
-                    except:
-                        wks_t = sh_t.add_worksheet(title="tatiller", rows=100, cols=1)
-                        wks_t.append_row(["tarih"])
-                    wks_t.append_row([t_str])
-                    st.success("Eklendi!")
-                    time.sleep(1)
-                    st.cache_resource.clear()
-                    st.rerun()
-                else:
-                    st.warning("Bu tarih zaten listede var.")
-
-    with st.expander("🛠️ Veri İşlemleri"):
-        st.write("Google Sheet'te elle değişiklik yaparsanız buraya basıp güncelleyin.")
-        if st.button("🔄 Verileri Yenile", use_container_width=True):
-            st.cache_resource.clear()
-            st.rerun()
-
-    st.divider()
-    if st.button("🔴 Çıkış Yap", use_container_width=True):
-        st.session_state.giris_yapildi = False
-        st.query_params.clear()
-        st.rerun()
-
-# --- BAŞLIK ---
-col_logo, col_title = st.columns([1, 15])
-with col_logo:
-    if os.path.exists("logo.png"):
-        st.image("logo.png", width=100)
-    else:
-        st.markdown("# 🎾")
-with col_title:
-    st.markdown("## 🎾 AHAL TEKE Tenis Kulübü Yönetim Sistemi")
-
-try:
-    sistem_kontrol_sessiz_gs()
-except Exception as e:
-    print(f"Kontrol Hatası: {e}")
-
-try:
-    df = veri_getir_df()
-except:
-    st.error("Google Sheets bağlantı hatası! 'yoneticiler' sayfası oluşturuldu mu?")
-    st.stop()
-
-bugun = pd.to_datetime(datetime.now().date())
-
-def kategori_belirle(row):
-    kat = str(row.get('kategori', '')).strip()
-    if kat in ['Çocuk', 'Yetişkin']:
-        return kat
-    
-    if str(row.get('veli_adi', '')).strip() not in ['', 'nan', 'None']:
-        return 'Çocuk'
-    return 'Yetişkin'
-
-# --- GLOBAL VERİ İŞLEME ---
-if not df.empty:
-    df['bitis_tarihi'] = pd.to_datetime(df['bitis_tarihi'], errors='coerce')
-    df['baslangic_tarihi'] = pd.to_datetime(df['baslangic_tarihi'], errors='coerce')
-    df['yas'] = df['dogum_tarihi'].apply(yas_hesapla)
-    
-    df['kategori_hesaplanan'] = df.apply(kategori_belirle, axis=1)
-    df['yas_grubu'] = df['kategori_hesaplanan'].apply(lambda x: 'Çocuk (Junior)' if x == 'Çocuk' else 'Yetişkin')
-    
-    df['aktif_mi'] = (df['bitis_tarihi'] >= bugun) & (df['kalan_hak'] > 0)
-
-    tum_bitenler = df[~df['aktif_mi']]
-    bir_hafta_once = bugun - timedelta(days=7)
-
-    bitenler_gosterim = tum_bitenler[
-        (tum_bitenler['bitis_tarihi'] >= bir_hafta_once) |
-        (tum_bitenler['kalan_hak'] <= 0)
-        ]
-    yaklasanlar = df[
-        (df['aktif_mi']) &
-        (((df['bitis_tarihi'] - bugun).dt.days <= 7) | (df['kalan_hak'] <= 2))
-        ]
-else:
-    df = pd.DataFrame(
-        columns=['aktif_mi', 'yas', 'yas_grubu', 'cinsiyet', 'ders_tipi', 'ucret', 'veli_adi', 'ad_soyad'])
-    yaklasanlar = pd.DataFrame()
-    bitenler_gosterim = pd.DataFrame()
-
-tabs = st.tabs(["⚠️ Yaklaşanlar & Bitenler", "➕ Yeni Üye Ekle", "📋 Üye Listesi", "📑 Raporlar", "📊 Grafikler"])
-
-# --- TAB 1: UYARILAR ---
-with tabs[0]:
-    col_yak, col_bit = st.columns(2)
-    with col_yak:
-        st.subheader(f"🟡 Yaklaşanlar ({len(yaklasanlar)})")
-        if not yaklasanlar.empty:
-            for i, row in yaklasanlar.iterrows():
-                with st.container(border=True):
-                    c1, c2 = st.columns([3, 2])
-                    c1.markdown(f"**{row['ad_soyad']}**")
-                    
-                    saat_gosterim = str(row.get('saat', ''))
-                    saat_text = f"⏰ {saat_gosterim}" if saat_gosterim and saat_gosterim not in ['nan', 'None'] else ""
-                    c1.write(f"🎾 **{row['ders_tipi']}** {saat_text}")
-                    
-                    tarih_str = row['baslangic_tarihi'].strftime('%d.%m.%Y') if pd.notnull(
-                        row['baslangic_tarihi']) else "-"
-                    bitis_str = row['bitis_tarihi'].strftime('%d.%m.%Y') if pd.notnull(row['bitis_tarihi']) else "-"
-                    c1.caption(f"📅 {tarih_str} - {bitis_str}")
-
-                    msg = []
-                    if pd.notnull(row['bitis_tarihi']) and (row['bitis_tarihi'] - bugun).days <= 7: msg.append(
-                        "Süre Az")
-                    if row['kalan_hak'] <= 2: msg.append("Hak Az")
-                    c1.warning(" & ".join(msg))
-                    c1.write(f"Kalan: **{row['kalan_hak']}**")
-
-                    y_adet = c2.number_input("Adet", value=int(row['toplam_hak']), key=f"yak_n_{row['id']}")
-                    y_tarih = c2.date_input("Yeni Bitiş", value=bugun + timedelta(days=30), format="DD/MM/YYYY",
-                                            key=f"yak_d_{row['id']}")
-                    if c2.button("➕ Uzat", key=f"yak_b_{row['id']}"):
-                        uyelik_yenile_gs(row['id'], y_adet, y_tarih)
-                        st.success("Yenilendi!");
-                        st.cache_resource.clear();
-                        st.rerun()
-        else:
-            st.success("Riskli üye yok.")
-
-    with col_bit:
-        st.subheader(f"🔴 Son 1 Haftada Bitenler ({len(bitenler_gosterim)})")
-        if not bitenler_gosterim.empty:
-            for i, row in bitenler_gosterim.iterrows():
-                with st.container(border=True):
-                    c1, c2 = st.columns([3, 2])
-                    c1.markdown(f"**{row['ad_soyad']}**")
-                    
-                    saat_gosterim = str(row.get('saat', ''))
-                    saat_text = f"⏰ {saat_gosterim}" if saat_gosterim and saat_gosterim not in ['nan', 'None'] else ""
-                    c1.write(f"🎾 **{row['ders_tipi']}** {saat_text}")
-                    
-                    tarih_str = row['baslangic_tarihi'].strftime('%d.%m.%Y') if pd.notnull(
-                        row['baslangic_tarihi']) else "-"
-                    bitis_str = row['bitis_tarihi'].strftime('%d.%m.%Y') if pd.notnull(row['bitis_tarihi']) else "-"
-                    c1.caption(f"📅 {tarih_str} - {bitis_str}")
-                    c1.error("HAK BİTTİ" if row['kalan_hak'] <= 0 else "SÜRE BİTTİ")
-
-                    y_adet = c2.number_input("Adet", value=int(row['toplam_hak']), key=f"bit_n_{row['id']}")
-                    y_tarih = c2.date_input("Yeni Bitiş", value=bugun + timedelta(days=30), format="DD/MM/YYYY",
-                                            key=f"bit_d_{row['id']}")
-                    if c2.button("♻️ Yenile / Uzat", key=f"bit_b_{row['id']}"):
-                        uyelik_yenile_gs(row['id'], y_adet, y_tarih)
-                        st.success("Yenilendi!");
-                        st.cache_resource.clear();
-                        st.rerun()
-        else:
-            st.success("Temiz")
-
-# --- TAB 2: YENİ ÜYE (GÜNCELLENDİ: TAM SAAT DROPDOWN) ---
-with tabs[1]:
-    st.header("📝 Yeni Üye Kaydı")
-
-    if st.session_state.get('form_hata'):
-        st.error(st.session_state.form_hata)
-        st.session_state.form_hata = None
-    if st.session_state.get('form_basari'):
-        st.balloons()
-        st.success("Kayıt Başarıyla Oluşturuldu!")
-        st.session_state.form_basari = False
-
-    with st.form("yeni_uye_form", clear_on_submit=True):
-        c1, c2 = st.columns(2)
-        yeni_ad = c1.text_input("Ad Soyad")
-        yeni_tel = c2.text_input("Telefon (11 Hane)", placeholder="05321234567", max_chars=11)
-
-        st.divider()
-        c3, c4, c_kat = st.columns(3)
-        yeni_dt = c3.date_input("Doğum Tarihi",
-                                value=datetime(2000, 1, 1),
-                                min_value=datetime(1900, 1, 1),
-                                max_value=datetime.now(),
-                                format="DD/MM/YYYY")
-        yeni_cins = c4.selectbox("Cinsiyet", ["Erkek", "Kadın"])
-        yeni_kategori = c_kat.selectbox("Kategori (Yaş Grubu)", ["Yetişkin", "Çocuk"])
-
-        st.info("ℹ️ Lütfen çocuk üyeler için Veli Adını girmeyi unutmayınız. Yetişkinler boş bırakabilir.")
-        yeni_veli = st.text_input("👨‍👩‍👦 Veli Adı Soyadı")
-
-        st.divider()
-        c5, c6, c7 = st.columns(3)
-        yeni_tip = c5.selectbox("Paket Tipi", ["Grup Dersi", "Özel Ders"])
-        yeni_hak = c6.number_input("Ders Sayısı", min_value=1, value=8)
-        yeni_ucret = c7.number_input("Ücret (TL)", value=3000)
-
-        st.divider()
-        c8, c_bitis, c9 = st.columns(3)
-        yeni_bas = c8.date_input("Başlangıç Tarihi", datetime.now(), format="DD/MM/YYYY")
-        yeni_bitis = c_bitis.date_input("Bitiş Tarihi", datetime.now() + timedelta(days=30), format="DD/MM/YYYY")
-        yeni_odeme = c9.selectbox("Ödeme", ["Nakit", "IBAN", "Kredi Kartı"])
-
-        # YENİ: Saat seçimi artık serbest yazı değil, sadece TAM SAATLER listesinden seçiliyor
-        c10, c11 = st.columns([2, 1])
-        yeni_gunler = c10.multiselect("Günler",
-                                      ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"],
-                                      placeholder="Gün seçiniz!")
-        
-        yeni_saat = c11.selectbox("Ders Saati", TAM_SAATLER, index=TAM_SAATLER.index("18:00"))
-
-        submitted = st.form_submit_button("✅ Üyeyi Kaydet", type="primary")
-
-        if submitted:
-            hata_var = False
-
-            if not yeni_ad:
-                st.session_state.form_hata = "İsim giriniz."
-                hata_var = True
-            elif not yeni_gunler:
-                st.session_state.form_hata = "Gün seçiniz."
-                hata_var = True
-
-            if not hata_var:
-                # Saat parametresi direkt string olarak gönderiliyor
-                yeni_uye_ekle_gs(yeni_ad, yeni_tel, yeni_cins, yeni_dt, yeni_bas, yeni_bitis, yeni_ucret,
-                                 yeni_odeme, yeni_gunler, yeni_tip, yeni_hak, yeni_veli, yeni_kategori, yeni_saat)
-                st.session_state.form_basari = True
-                st.cache_resource.clear()
-                st.rerun()
-
-# --- TAB 3: LİSTE ---
-with tabs[2]:
-    if not df.empty:
-        fc1, fc2, fc3, fc4 = st.columns([2, 1, 1, 1])
-        arama = fc1.text_input("🔍 Kişi Ara", placeholder="Ali...")
-        f_tip = fc2.multiselect("Ders Tipi", df['ders_tipi'].unique(), placeholder="Seçiniz")
-        f_durum = fc3.radio("Durum", ["Aktif", "Pasif", "Hepsi"], horizontal=True, index=0)
-        f_kategori = fc4.radio("Kategori", ["Hepsi", "Yetişkin", "Çocuk"], horizontal=True, index=0)
-
-        view_df = df.copy()
-        if 'bitis_tarihi' in view_df.columns:
-            view_df = view_df.sort_values(by='bitis_tarihi', ascending=True)
-
-        if arama: view_df = view_df[view_df['ad_soyad'].str.contains(arama, case=False)]
-        if f_tip: view_df = view_df[view_df['ders_tipi'].isin(f_tip)]
-        if f_durum == "Aktif": view_df = view_df[view_df['aktif_mi']]
-        if f_durum == "Pasif": view_df = view_df[~view_df['aktif_mi']]
-        if f_kategori == "Yetişkin": view_df = view_df[view_df['yas_grubu'] == 'Yetişkin']
-        if f_kategori == "Çocuk": view_df = view_df[view_df['yas_grubu'] == 'Çocuk (Junior)']
-
-        st.write(f"**Toplam: {len(view_df)} Kişi**")
-
-        for i, row in view_df.iterrows():
-            with st.container(border=True):
-                c1, c2, c3, c4 = st.columns([3, 3, 2, 2])
-                
-                ikon = "🧒" if row['yas_grubu'] == 'Çocuk (Junior)' else ("👨" if row['cinsiyet'] == "Erkek" else "👩")
-                c1.markdown(f"### {ikon} {row['ad_soyad']}")
-                if row['yas_grubu'] == 'Çocuk (Junior)' and str(row.get('veli_adi', '')).strip():
-                    c1.caption(f"Veli: {row['veli_adi']}")
-
-                tarih_str = row['baslangic_tarihi'].strftime('%d.%m.%Y') if pd.notnull(row['baslangic_tarihi']) else "-"
-                bitis_str = row['bitis_tarihi'].strftime('%d.%m.%Y') if pd.notnull(row['bitis_tarihi']) else "-"
-
-                saat_gosterim = str(row.get('saat', ''))
-                saat_text = f" | ⏰ {saat_gosterim}" if saat_gosterim and saat_gosterim not in ['nan', 'None'] else ""
-                
-                c2.caption(f"{row['ders_tipi']} | {row['gunler']}{saat_text}")
-                c2.write(f"📅 {tarih_str} ➡ **{bitis_str}**")
-
-                if row['kalan_hak'] == 0:
-                    c3.error("Hak: 0")
-                else:
-                    c3.metric("Hak", row['kalan_hak'])
-
-                b_art, b_azal = c4.columns(2)
-                if b_art.button("➕", key=f"p_{row['id']}"):
-                    manuel_islem_gs(row['id'], 1);
-                    st.toast("+1");
-                    st.cache_resource.clear();
-                    st.rerun()
-                if b_azal.button("➖", key=f"m_{row['id']}"):
-                    if row['kalan_hak'] > 0:
-                        manuel_islem_gs(row['id'], -1);
-                        st.toast("-1");
-                        st.cache_resource.clear();
-                        st.rerun()
-                    else:
-                        st.error("0!")
-
-                with st.expander("✏️ Düzenle / 🗑️ Sil"):
-                    tab_duzen, tab_sil = st.tabs(["Düzenle", "Sil"])
-                    with tab_duzen:
-                        with st.form(key=f"edit_form_{row['id']}"):
-                            d_ad = st.text_input("Ad Soyad", value=row['ad_soyad'])
-                            
-                            c_edit1, c_edit2 = st.columns(2)
-                            d_tel = c_edit1.text_input("Telefon", value=row['telefon'])
-                            
-                            try:
-                                mevcut_dt = datetime.strptime(str(row['dogum_tarihi']), "%Y-%m-%d").date()
-                            except:
-                                try:
-                                    mevcut_dt = datetime.strptime(str(row['dogum_tarihi']), "%d.%m.%Y").date()
-                                except:
-                                    mevcut_dt = datetime(2000, 1, 1).date()
-                                    
-                            d_dt = c_edit2.date_input("Doğum Tarihi", value=mevcut_dt, format="DD/MM/YYYY")
-
-                            c_kat_edit, c_veli_edit = st.columns(2)
-                            mevcut_kat = "Çocuk" if row['yas_grubu'] == 'Çocuk (Junior)' else "Yetişkin"
-                            d_kategori = c_kat_edit.selectbox("Kategori", ["Yetişkin", "Çocuk"], index=1 if mevcut_kat == "Çocuk" else 0)
-                            d_veli = c_veli_edit.text_input("Veli Adı Soyadı", value=str(row.get('veli_adi', '')).replace('nan',''))
-
-                            d_tip = st.selectbox("Paket", ["Grup Dersi", "Özel Ders"],
-                                                 index=0 if row['ders_tipi'] == "Grup Dersi" else 1)
-                            
-                            # YENİ: Saat Düzenleme için Tam Saat Dropdown'u eklendi
-                            c_d1, c_d2, c_d3 = st.columns(3)
-                            d_top = c_d1.number_input("Toplam Hak", value=int(row['toplam_hak']))
-                            d_kal = c_d2.number_input("Kalan Hak", value=int(row['kalan_hak']))
-                            
-                            m_saat_str = str(row.get('saat', '18:00')).strip()
-                            
-                            # Hatalı/eski veri varsa onu en yakın saate yuvarlama veya default 18:00 yapma kilidi
-                            if m_saat_str not in TAM_SAATLER:
-                                try:
-                                    # "18:30" gibi bir şey geldiyse sadece "18" kısmını alıp ":00" ekler
-                                    m_saat_str = f"{m_saat_str.split(':')[0].zfill(2)}:00"
-                                    if m_saat_str not in TAM_SAATLER: m_saat_str = "18:00"
-                                except:
-                                    m_saat_str = "18:00"
-                                    
-                            d_saat = c_d3.selectbox("Ders Saati", TAM_SAATLER, index=TAM_SAATLER.index(m_saat_str))
-                            
-                            if st.form_submit_button("💾 Değişiklikleri Kaydet"):
-                                uye_guncelle_gs(row['id'], d_ad, d_tel, str(d_dt), d_tip, d_top, d_kal, d_veli, d_kategori, d_saat)
-                                st.success("Güncellendi!");
-                                time.sleep(1);
-                                st.cache_resource.clear();
-                                st.rerun()
-                    with tab_sil:
-                        st.warning("Bu işlem geri alınamaz!")
-                        if st.button("🗑️ Üyeyi Kalıcı Olarak Sil", key=f"del_{row['id']}"):
-                            uye_sil_gs(row['id'])
-                            st.success("Üye Silindi.");
-                            time.sleep(1);
-                            st.cache_resource.clear();
-                            st.rerun()
-
-                with st.expander("♻️ Paket / Süre Uzatma"):
-                    rc1, rc2 = st.columns(2)
-                    y_adet = rc1.number_input("Ders Sayısı", value=int(row['toplam_hak']), key=f"list_n_{row['id']}")
-                    y_tarih = rc1.date_input("Yeni Bitiş", value=bugun + timedelta(days=30), format="DD/MM/YYYY", key=f"list_d_{row['id']}")
-                    if rc2.button("Yenile / Uzat", key=f"list_b_{row['id']}"):
-                        uyelik_yenile_gs(row['id'], y_adet, y_tarih)
-                        st.success("İşlem Tamam!");
-                        st.cache_resource.clear();
-                        st.rerun()
-    else:
-        st.info("Kayıt yok veya veritabanı boş.")
-
-# --- TAB 4: RAPORLAR ---
-with tabs[3]:
-    st.header("📑 Detaylı Rapor Listeleri")
-    if not df.empty:
-        rc1, rc2 = st.columns(2)
-        rapor_turu = rc1.selectbox("Rapor Türü Seçiniz:",
-                                   ["Tüm Üyeler (Detaylı)", "Çocuklar ve Velileri", "Grup Dersi Alanlar",
-                                    "Özel Ders Alanlar", "Kadın Üyeler", "Erkek Üyeler", "Nakit Ödeyenler",
-                                    "Kredi Kartı ile Ödeyenler", "IBAN ile Ödeyenler"])
-        durum_filtresi = rc2.radio("Durum Filtresi:", ["Hepsi", "Sadece Aktifler", "Sadece Pasifler"], horizontal=True)
-
-        temp_df = df.copy()
-        if durum_filtresi == "Sadece Aktifler":
-            temp_df = temp_df[temp_df['aktif_mi']]
-        elif durum_filtresi == "Sadece Pasifler":
-            temp_df = temp_df[~temp_df['aktif_mi']]
-
-        gosterilecek_tablo = pd.DataFrame()
-        if rapor_turu == "Tüm Üyeler (Detaylı)":
-            gosterilecek_tablo = temp_df[['ad_soyad', 'telefon', 'cinsiyet', 'yas', 'ders_tipi', 'gunler', 'saat', 'kalan_hak', 'durum']]
-        elif rapor_turu == "Çocuklar ve Velileri":
-            gosterilecek_tablo = temp_df[temp_df['yas_grubu'] == 'Çocuk (Junior)'][['ad_soyad', 'veli_adi', 'telefon', 'kalan_hak']]
-        elif rapor_turu == "Grup Dersi Alanlar":
-            gosterilecek_tablo = temp_df[temp_df['ders_tipi'] == "Grup Dersi"][
-                ['ad_soyad', 'telefon', 'gunler', 'saat', 'kalan_hak']]
-        elif rapor_turu == "Özel Ders Alanlar":
-            gosterilecek_tablo = temp_df[temp_df['ders_tipi'] == "Özel Ders"][
-                ['ad_soyad', 'telefon', 'gunler', 'saat', 'kalan_hak', 'toplam_hak']]
-        elif rapor_turu == "Kadın Üyeler":
-            gosterilecek_tablo = temp_df[temp_df['cinsiyet'] == "Kadın"][['ad_soyad', 'telefon', 'yas', 'ders_tipi']]
-        elif rapor_turu == "Erkek Üyeler":
-            gosterilecek_tablo = temp_df[temp_df['cinsiyet'] == "Erkek"][['ad_soyad', 'telefon', 'yas', 'ders_tipi']]
-        elif rapor_turu == "Nakit Ödeyenler":
-            gosterilecek_tablo = temp_df[temp_df['odeme_yontemi'] == "Nakit"][['ad_soyad', 'ucret', 'baslangic_tarihi']]
-        elif rapor_turu == "Kredi Kartı ile Ödeyenler":
-            gosterilecek_tablo = temp_df[temp_df['odeme_yontemi'] == "Kredi Kartı"][
-                ['ad_soyad', 'ucret', 'baslangic_tarihi']]
-        elif rapor_turu == "IBAN ile Ödeyenler":
-            gosterilecek_tablo = temp_df[temp_df['odeme_yontemi'] == "IBAN"][['ad_soyad', 'ucret', 'baslangic_tarihi']]
-
-        if not gosterilecek_tablo.empty:
-            gosterilecek_tablo.rename(
-                columns={'ad_soyad': 'Ad Soyad', 'telefon': 'Telefon', 'cinsiyet': 'Cinsiyet', 'yas': 'Yaş',
-                         'ders_tipi': 'Ders Tipi', 'kalan_hak': 'Kalan Hak', 'durum': 'Durum', 'veli_adi': 'Veli Adı',
-                         'gunler': 'Günler', 'saat': 'Saat', 'toplam_hak': 'Paket Büyüklüğü', 'ucret': 'Ücret',
-                         'baslangic_tarihi': 'Kayıt Tarihi'}, inplace=True)
-            st.dataframe(gosterilecek_tablo, use_container_width=True)
-            csv_rapor = gosterilecek_tablo.to_csv(index=False).encode('utf-8-sig')
-            st.download_button("📥 Bu Raporu İndir", csv_rapor, "ozel_rapor.csv", "text/csv")
-        else:
-            st.warning("Kayıt bulunamadı.")
-
-# --- TAB 5: GRAFİKLER ---
-with tabs[4]:
-    st.header("📊 Grafiksel Analiz")
-    if not df.empty:
-        col1, col2 = st.columns(2)
-        with col1:
-            st.subheader("Cinsiyet")
-            cinsiyet_count = df['cinsiyet'].value_counts().reset_index()
-            cinsiyet_count.columns = ['Cinsiyet', 'Adet']
-            fig1 = px.pie(cinsiyet_count, values='Adet', names='Cinsiyet', color='Cinsiyet',
-                          color_discrete_map={'Kadın': 'pink', 'Erkek': 'blue'})
-            st.plotly_chart(fig1, use_container_width=True)
-        with col2:
-            st.subheader("Yetişkin / Çocuk")
-            yas_count = df['yas_grubu'].value_counts().reset_index()
-            yas_count.columns = ['Grup', 'Adet']
-            fig2 = px.pie(yas_count, values='Adet', names='Grup', color_discrete_sequence=px.colors.sequential.RdBu)
-            st.plotly_chart(fig2, use_container_width=True)
-
-        st.divider()
-        st.subheader("Ders Tiplerine Göre")
-        ders_count = df['ders_tipi'].value_counts().reset_index()
-        ders_count.columns = ['Ders Tipi', 'Adet']
-        fig3 = px.pie(ders_count, values='Adet', names='Ders Tipi', hole=0.4)
-        st.plotly_chart(fig3, use_container_width=True)
-    else:
-        st.info("Grafik için veri yok.")
+import streamlit as st
+import random
+import time
+import os
+import json
+import threading
+from functools import partial
+from datetime import datetime, timedelta
+from tenis.olcum import Olcum, olculen_kitap
+# pandas/numpy ve veri modülleri giriş ekranından sonra, plotly grafik sekmeleri açılınca yüklenir (soğuk başlangıç)
+
+# --- AYARLAR ---
+st.set_page_config(page_title="AHAL TEKE Tenis Kulubü", layout="wide")
+
+# YENİ: TAM SAATLER LİSTESİ (07:00 - 23:00 arası)
+TAM_SAATLER = [f"{str(i).zfill(2)}:00" for i in range(7, 24)]
+
+# Haftalık program: kort sayısı ve bir grup dersinin (bir kortun) kontenjanı
+KORT_SAYISI = int(os.environ.get("KORT_SAYISI", 3))
+GRUP_KONTENJANI = int(os.environ.get("GRUP_KONTENJANI", 4))
+
+# Üye Listesi sekmesinde bir sayfada gösterilecek kart sayısı seçenekleri
+SAYFA_BOYUTLARI = [20, 50, 100]
+
+# Otomatik düşüm en fazla bu aralıkta bir çalışır (dakika, varsayılan saatte bir)
+KONTROL_ARALIGI_DK = int(os.environ.get("KONTROL_ARALIGI_DK", 60))
+
+# Sayfa kayıtlarının önbellekte kalma süresi (saniye); değişiklik kontrolü yapılamazsa kullanılır
+VERI_TTL_SN = int(os.environ.get("VERI_TTL_SN", 300))
+
+# Google Sheet'in değişip değişmediğine (Drive değişme zamanı) en fazla bu aralıkta bir bakılır (saniye);
+# sayfalar sadece dosya değiştiyse yeniden okunur
+DEGISIKLIK_KONTROL_SN = int(os.environ.get("DEGISIKLIK_KONTROL_SN", 15))
+
+# Depolama: "sheets" (Google Sheets) veya "sqlite" (yerel dosya)
+DEPO_TURU = os.environ.get("DEPO", "sheets")
+SQLITE_YOLU = os.environ.get("SQLITE_YOLU", "tenis.db")
+
+# Sayfa açılışında tek istekte okunup tüm bileşenlere verilen sayfalar
+ANLIK_SAYFALAR = ["uyelikler", "tatiller", "yoneticiler"]
+
+# Sheets okuma/yazma kotası (istek / dakika / kullanıcı); ölçüm paneli boşluğu buna göre gösterir
+SHEETS_KOTA_DK = int(os.environ.get("SHEETS_KOTA_DK", 60))
+
+# Sheets'e gönderilmeyi bekleyen yazımlar bu dosyada tutulur (yeniden başlatmada kaybolmaz)
+YAZMA_KUYRUGU_YOLU = os.environ.get("YAZMA_KUYRUGU_YOLU", "yazma_kuyrugu.json")
+
+# Verilirse her depolama çağrısı bu dosyaya JSON satırı olarak da yazılır
+OLCUM_DOSYASI = os.environ.get("OLCUM_DOSYASI")
+
+@st.cache_resource
+def olcum_getir():
+    # Süreçteki tüm oturumların depolama çağrıları tek kayıtta toplanır
+    return Olcum(dosya=OLCUM_DOSYASI)
+
+# --- GOOGLE SHEETS BAĞLANTISI ---
+@st.cache_resource
+def init_connection():
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+
+    if "GOOGLE_JSON" in os.environ:
+        creds_dict = json.loads(os.environ["GOOGLE_JSON"])
+        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
+    elif "gcp_service_account" in st.secrets:
+        creds = ServiceAccountCredentials.from_json_keyfile_dict(st.secrets["gcp_service_account"], scope)
+    else:
+        st.error("Hata: Google şifreleri bulunamadı!")
+        st.stop()
+
+    client = gspread.authorize(creds)
+    return client
+
+@st.cache_resource
+def get_data():
+    client = init_connection()
+    with olcum_getir().olc('open', "tenis_db"):
+        sh = client.open("tenis_db")
+    # Sonraki tüm Sheets çağrıları süre/satır sayısıyla kaydedilir
+    return olculen_kitap(sh, olcum_getir())
+
+@st.cache_resource
+def sheets_depo():
+    from tenis.depolama import SheetsDepo
+    return SheetsDepo(get_data(), ttl_sn=VERI_TTL_SN, kontrol_sn=DEGISIKLIK_KONTROL_SN)
+
+@st.cache_resource
+def yazma_kuyrugu():
+    # Sheets yazımları arka planda, birleştirilerek ve kota içinde gönderilir
+    from tenis.kuyruk import YazmaKuyrugu
+    return YazmaKuyrugu(sheets_depo(), YAZMA_KUYRUGU_YOLU, dakikada=SHEETS_KOTA_DK)
+
+@st.cache_resource
+def depo_getir():
+    # Tüm oturumlar aynı depo nesnesini (ve önbelleğini) paylaşır
+    if DEPO_TURU == "sqlite":
+        from tenis.depolama import SqliteDepo
+        return SqliteDepo(SQLITE_YOLU)
+    return yazma_kuyrugu()
+
+@st.cache_resource
+def ozet_deposu():
+    # Grafiklerin okuduğu ön-toplanmış metrikler; tablo boşsa ders geçmişinden bir kez doldurulur
+    with olcum_getir().eylem("ozet_yukleme"):
+        return Ozetler(ozetleri_hazirla(depo_getir()))
+
+@st.cache_resource
+def doluluk_endeksi():
+    # (gün, saat) doluluk endeksi bir kez kurulur, sonra yazımlarla birlikte güncellenir
+    with olcum_getir().eylem("program_yukleme"):
+        uyeler = depo_getir().uyeler()
+    return Doluluk(GUNLER_MAP.values(), TAM_SAATLER, KORT_SAYISI, GRUP_KONTENJANI).yukle(uyeler, datetime.now().date())
+
+@st.cache_resource
+def arama_endeksi():
+    # Üye Listesi araması için ad/veli/telefon endeksi; bir kez kurulur, yazımlarla güncellenir
+    with olcum_getir().eylem("arama_yukleme"):
+        uyeler = depo_getir().uyeler()
+    return AramaEndeksi().yukle(uyeler)
+
+def endeksleri_tazele(*uye_idler):
+    # Yazımdan sonra ilgili üyelerin program ve arama kayıtları depodaki son haliyle yenilenir
+    if not uye_idler: return
+    doluluk, arama = doluluk_endeksi(), arama_endeksi()
+    bugun = datetime.now().date()
+    for uye_id in uye_idler:
+        kayit = depo_getir().uye(uye_id)
+        doluluk.guncelle(uye_id, kayit, bugun)
+        arama.guncelle(uye_id, kayit)
+
+@st.cache_resource
+def dis_surum_durumu():
+    return {'surum': None}
+
+def dis_degisiklikleri_uygula():
+    # Veri depo dışından değiştiyse (Sheet elle düzenlendi, gece işi yazdı) bellekte artımlı tutulan
+    # endeksler ve özetler bir sonraki kullanımda yeniden kurulur
+    durum, surum = dis_surum_durumu(), depo_getir().dis_surum()
+    if durum['surum'] is not None and durum['surum'] != surum:
+        ozet_deposu.clear()
+        doluluk_endeksi.clear()
+        arama_endeksi.clear()
+    durum['surum'] = surum
+
+def ozet_ekle(satirlar):
+    # Artış satırları depoya eklenir ve bellekteki toplamlara işlenir (geçmiş yeniden taranmaz)
+    # Grafik verisi ana işlemi (düşüm, kayıt, yenileme) asla bozmamalı
+    if not satirlar: return
+    try:
+        depo_getir().satirlari_ekle("ozetler", satirlar)
+        ozet_deposu().uygula(satirlar)
+    except Exception as e:
+        print(f"Özet Hatası: {e}")
+
+# --- YARDIMCI FONKSİYONLAR ---
+def veri_getir_df(kayitlar=None):
+    # Sekmeler aynı (değiştirilmemesi gereken) çerçeveyi paylaşır; veri sürümü değişince yeniden kurulur
+    depo = depo_getir()
+    if kayitlar is None:
+        with olcum_getir().eylem("uye_okuma"):
+            kayitlar = depo.uyeler()
+    return uye_tablosu(depo.surum("uyelikler"), datetime.now().date(), kayitlar)
+
+@st.cache_resource(ttl=VERI_TTL_SN)
+def yoneticileri_getir():
+    # Giriş için sadece yoneticiler tablosu okunur (üye verisine dokunulmaz): kullanıcı adı -> şifre
+    with olcum_getir().eylem("yonetici_okuma"):
+        return {str(y['kullanici_adi']): str(y['sifre']) for y in depo_getir().yoneticiler()}
+
+@olcum_getir().eylem("yonetici_ekle")
+def yeni_yonetici_ekle(kadi, sifre):
+    depo_getir().yonetici_ekle(kadi, sifre)
+    yoneticileri_getir.clear()
+
+@olcum_getir().eylem("sifre_guncelle")
+def sifre_guncelle(kadi, yeni_sifre):
+    depo_getir().sifre_guncelle(kadi, yeni_sifre)
+    yoneticileri_getir.clear()
+
+# --- OTOMATİK KONTROL SİSTEMİ ---
+@olcum_getir().eylem("otomatik_dusum")
+def sistem_kontrol_sessiz_gs():
+    # Hesap ve yazımlar tenis/islemler.py'de (gece işi de aynı fonksiyonu çağırır: python -m tenis dusum)
+    # Özetler bu çalıştırmanın yazımlarından önce yüklenir (ilk doldurmada iki kez sayılmasın)
+    ozet_deposu()
+    sonuc = dusum_yap(depo_getir(), datetime.now().date(), ozet_hazir=True)
+    ozet_deposu().uygula(sonuc['ozet_satirlari'])
+    endeksleri_tazele(*sonuc['hakki_biten'])
+    return sonuc
+
+@olcum_getir().eylem("gecmis_arsivi")
+def gecmis_arsivle_gs():
+    return gecmisi_arsivle(depo_getir(), datetime.now().date())
+
+@st.cache_resource
+def kontrol_durumu():
+    # Süreçteki tüm oturumların paylaştığı tek zamanlayıcı durumu
+    return {'kilit': threading.Lock(), 'son_calisma': None, 'sure': None, 'sonuc': None, 'hata': None, 'son_arsiv': None}
+
+def zamanlanmis_kontrol(zorla=False):
+    # Düşüm sadece buradan çalışır. Aynı anda gelen oturumlar kilitte bekler, sonra aralık dolmadığı için
+    # atlar; zorla=True (kayıt/yenileme sonrası) aralığı atlar ama kilidi yine alır, iki düşüm üst üste binmez.
+    durum = kontrol_durumu()
+    with durum['kilit']:
+        if not zorla and durum['son_calisma'] and \
+                datetime.now() - durum['son_calisma'] < timedelta(minutes=KONTROL_ARALIGI_DK):
+            return None
+
+        t0 = time.perf_counter()
+        try:
+            durum['sonuc'] = sistem_kontrol_sessiz_gs()
+            durum['hata'] = None
+            # Başarısız çalışma işaretlenmez: sonraki çizim hemen yeniden dener
+            durum['son_calisma'] = datetime.now()
+        except Exception as e:
+            durum['sonuc'] = None
+            durum['hata'] = str(e)
+            print(f"Kontrol Hatası: {e}")
+        finally:
+            durum['sure'] = time.perf_counter() - t0
+
+        # Geçmiş sayfası günde en fazla bir kez sıkıştırılır
+        if durum['hata'] is None and durum['son_arsiv'] != datetime.now().date():
+            try:
+                tasinan = gecmis_arsivle_gs()
+                # Ertelenen arşiv (kuyruk boşalmadı) bir sonraki kontrolde yeniden denenir
+                if tasinan is not None:
+                    durum['sonuc']['arsivlenen'] = tasinan
+                    durum['son_arsiv'] = datetime.now().date()
+            except Exception as e:
+                print(f"Arşiv Hatası: {e}")
+        return durum['sonuc']
+
+@olcum_getir().eylem("yeni_uye")
+def yeni_uye_ekle_gs(ad, tel, cins, dt, bas, bitis, ucret, yontem, gunler_list, ders_tipi, hak_sayisi, veli_adi, kategori, saat):
+    yeni_id = id_ayir(depo_getir())[0]
+    ozet_deposu()  # özetler yazımdan önce yüklü olsun
+    depo_getir().uye_ekle(yeni_uye_kaydi(yeni_id, ad, tel, cins, dt, bas, bitis, ucret, yontem, gunler_list,
+                                         ders_tipi, hak_sayisi, veli_adi, kategori, saat))
+    ozet_ekle(gelir_satirlari(ucret, yontem, bas))
+    endeksleri_tazele(yeni_id)
+    zamanlanmis_kontrol(zorla=True)
+
+@olcum_getir().eylem("toplu_uye")
+def toplu_uye_ekle_gs(kayitlar):
+    # Dosyadan gelen üyeler tek toplu eklemede yazılır; ardından tek düşüm geçişi
+    ozet_deposu()  # özetler yazımdan önce yüklü olsun
+    kayitlar, satirlar = toplu_uye_ekle(depo_getir(), kayitlar)
+    ozet_ekle(satirlar)
+    # Endeksler eklenen kayıtlardan güncellenir (üye başına okuma yok)
+    doluluk, arama = doluluk_endeksi(), arama_endeksi()
+    bugun = datetime.now().date()
+    for kayit in kayitlar:
+        doluluk.guncelle(kayit['id'], kayit, bugun)
+        arama.guncelle(kayit['id'], kayit)
+
+    zamanlanmis_kontrol(zorla=True)
+    return len(kayitlar)
+
+@olcum_getir().eylem("toplu_yenile")
+def toplu_yenile_gs(yenilemeler):
+    # yenilemeler: {uye_id: (eklenecek hak, yeni bitiş)}; tek toplu güncelleme, ardından tek düşüm geçişi
+    ozet_deposu()  # özetler yazımdan önce yüklü olsun
+    uye_idler, satirlar = toplu_yenile(depo_getir(), yenilemeler, datetime.now().date())
+    ozet_ekle(satirlar)
+    endeksleri_tazele(*uye_idler)
+
+    zamanlanmis_kontrol(zorla=True)
+    return len(uye_idler)
+
+@olcum_getir().eylem("uye_guncelle")
+def uye_guncelle_gs(uye_id, ad, tel, dt_str, paket_tipi, toplam_hak, kalan_hak, veli_adi, kategori, saat_str):
+    uye_satirini_yaz(depo_getir(), uye_id, {
+        'ad_soyad': ad, 'telefon': tel, 'dogum_tarihi': dt_str, 'toplam_hak': toplam_hak,
+        'kalan_hak': kalan_hak, 'ders_tipi': paket_tipi, 'veli_adi': veli_adi,
+        'kategori': kategori, 'saat': saat_str
+    })
+    endeksleri_tazele(uye_id)
+
+@olcum_getir().eylem("uye_sil")
+def uye_sil_gs(uye_id):
+    depo_getir().uye_sil(uye_id)
+    doluluk_endeksi().guncelle(uye_id, None, datetime.now().date())
+    arama_endeksi().guncelle(uye_id, None)
+
+@olcum_getir().eylem("manuel_islem")
+def manuel_islem_gs(uye_id, miktar):
+    hak_ekle(depo_getir(), uye_id, miktar)
+    endeksleri_tazele(uye_id)
+
+@olcum_getir().eylem("uyelik_yenile")
+def uyelik_yenile_gs(uye_id, eklenecek_hak, manuel_bitis_tarihi=None):
+    ozet_deposu()  # özetler yazımdan önce yüklü olsun
+    satirlar = uyelik_yenile(depo_getir(), uye_id, eklenecek_hak, manuel_bitis_tarihi, datetime.now().date())
+    if satirlar is not None:
+        ozet_ekle(satirlar)
+        endeksleri_tazele(uye_id)
+
+@st.cache_resource(max_entries=2)
+def uye_tablosu(surum, bugun, _kayitlar):
+    return uye_tablosu_kur(_kayitlar, bugun)
+
+@st.cache_resource(max_entries=2)
+def liste_maskeleri(surum, bugun, _df):
+    # Üye Listesi filtrelerinin hazır maskeleri, bitiş tarihine göre sıra ve id -> satır konumu
+    return {
+        'sira': np.argsort(_df['bitis_tarihi'].to_numpy(), kind='stable'),
+        'aktif': _df['aktif_mi'].to_numpy(),
+        'yetiskin': (_df['yas_grubu'] == 'Yetişkin').to_numpy(),
+        'ders_tipi': {t: (_df['ders_tipi'] == t).to_numpy() for t in _df['ders_tipi'].unique()},
+        'konum': pd.Index(_df['id']),
+    }
+
+# --- GRAFİKLER: sadece küçük çerçevelerden çizilir, veri sürümü değişmedikçe önbellekten ---
+@st.cache_resource(max_entries=2)
+def dagilim_grafikleri(surum, bugun, _df):
+    import plotly.express as px
+    cinsiyet_count = _df['cinsiyet'].value_counts().reset_index()
+    cinsiyet_count.columns = ['Cinsiyet', 'Adet']
+    fig1 = px.pie(cinsiyet_count, values='Adet', names='Cinsiyet', color='Cinsiyet',
+                  color_discrete_map={'Kadın': 'pink', 'Erkek': 'blue'})
+    yas_count = _df['yas_grubu'].value_counts().reset_index()
+    yas_count.columns = ['Grup', 'Adet']
+    fig2 = px.pie(yas_count, values='Adet', names='Grup', color_discrete_sequence=px.colors.sequential.RdBu)
+    ders_count = _df['ders_tipi'].value_counts().reset_index()
+    ders_count.columns = ['Ders Tipi', 'Adet']
+    fig3 = px.pie(ders_count, values='Adet', names='Ders Tipi', hole=0.4)
+    return fig1, fig2, fig3
+
+@st.cache_resource(max_entries=2)
+def trend_grafikleri(ozet_surum, uye_surum, _ozetler, _df):
+    import plotly.express as px
+    gelir = _ozetler.cerceve('gelir')
+    aktif = _ozetler.cerceve('aktif_uye')
+    ders = _ozetler.cerceve('ders')
+    oran = yenileme_orani(_ozetler.cerceve('yenileme'), _df)
+    return {
+        'gelir': px.bar(gelir, x='donem', y='deger', color='anahtar',
+                        labels={'donem': 'Ay', 'deger': 'Gelir (TL)', 'anahtar': 'Ödeme'}),
+        'aktif': px.line(aktif, x='donem', y='deger', labels={'donem': 'Hafta', 'deger': 'Aktif Üye'}),
+        'ders': px.bar(ders, x='donem', y='deger', labels={'donem': 'Gün', 'deger': 'İşlenen Ders'}),
+        'oran': px.line(oran, x='donem', y='oran', markers=True, hover_data=['yenileyen', 'biten'],
+                        labels={'donem': 'Ay', 'oran': 'Yenileme Oranı (%)'}),
+    }
+
+# --- GİRİŞ MANTIĞI ---
+def giris_kontrol(kadi_girilen, sifre_girilen):
+    try:
+        yoneticiler = yoneticileri_getir()
+    except:
+        return False
+    return kadi_girilen in yoneticiler and yoneticiler[kadi_girilen] == sifre_girilen
+
+query_params = st.query_params
+if "durum" in query_params and query_params["durum"] == "giris_ok":
+    st.session_state.giris_yapildi = True
+    st.session_state.aktif_kullanici = query_params.get("user", "Admin")
+elif 'giris_yapildi' not in st.session_state:
+    st.session_state.giris_yapildi = False
+    st.session_state.aktif_kullanici = ""
+
+# --- LOGIN EKRANI ---
+if not st.session_state.giris_yapildi:
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        sub_c1, sub_c2, sub_c3 = st.columns([5, 3, 5])
+        with sub_c2:
+            if os.path.exists("logo.png"):
+                st.image("logo.png", use_container_width=True)
+            else:
+                st.markdown("<h1 style='text-align: center; font-size: 80px;'>🎾</h1>", unsafe_allow_html=True)
+
+        st.markdown("<h3 style='text-align: center;'>AHAL TEKE Yönetim Paneli</h3>", unsafe_allow_html=True)
+        st.write("")
+
+        with st.container(border=True):
+            kadi = st.text_input("Kullanıcı Adı")
+            sifre = st.text_input("Şifre", type="password")
+            if st.button("Giriş Yap", type="primary", use_container_width=True):
+                if giris_kontrol(kadi, sifre):
+                    st.session_state.giris_yapildi = True
+                    st.session_state.aktif_kullanici = kadi
+                    st.query_params["durum"] = "giris_ok"
+                    st.query_params["user"] = kadi
+                    st.success("Giriş başarılı!")
+                    time.sleep(0.5);
+                    st.rerun()
+                else:
+                    st.error("Hatalı bilgiler! (Lütfen Google Sheet 'yoneticiler' sayfasını kontrol edin)")
+    st.stop()
+
+# --- GİRİŞTEN SONRA YÜKLENENLER ---
+import pandas as pd
+import numpy as np
+from tenis.depolama import aktar
+from tenis.kuyruk import YazmaKuyrugu
+from tenis.analitik import Ozetler, gelir_satirlari, yenileme_orani
+from tenis.islemler import (GUNLER_MAP, uye_tablosu_kur, dusum_yap, gecmisi_arsivle, hak_ekle, ozetleri_hazirla,
+                            uye_satirini_yaz, uyelik_yenile, yeni_uye_kaydi, id_ayir, toplu_uye_ekle, toplu_yenile)
+from tenis.ice_aktarim import dosya_oku, dosya_turleri, dogrula, sablon_csv
+from tenis.program import Doluluk
+from tenis.arama import AramaEndeksi
+from tenis.raporlar import (RAPORLAR, DURUM_FILTRELERI, BICIMLER, rapor_satirlari, rapor_tablosu,
+                            tek_rapor_csv, disa_aktar, kullanilabilir_bicimler)
+
+# Bu çizimin depolama çağrıları bu işaretten sonra, bu iş parçacığında kaydedilenlerdir
+render_isareti = olcum_getir().isaret()
+
+with olcum_getir().eylem("zamanlanmis_kontrol"):
+    sonuc = zamanlanmis_kontrol()
+if sonuc and (sonuc['yazilan_satir'] or sonuc['yazilan_hucre']):
+    print(f"Otomatik düşüm: {sonuc['yazilan_satir']} satır, {sonuc['yazilan_hucre']} hücre yazıldı.")
+
+# Bu çizimin anlık görüntüsü: gereken tüm sayfalar tek seferde okunur
+try:
+    with olcum_getir().eylem("render_yukleme"):
+        anlik = depo_getir().hepsini_yukle(ANLIK_SAYFALAR)
+    dis_degisiklikleri_uygula()
+except Exception as e:
+    print(f"Yükleme Hatası: {e}")
+    anlik = {}
+
+# --- SIDEBAR ---
+with st.sidebar:
+    st.write(f"👤 Yönetici: **{st.session_state.aktif_kullanici}**")
+    st.info(f"🟢 Bağlantı: {depo_getir().ad}")
+
+    k_durum = kontrol_durumu()
+    if k_durum['son_calisma']:
+        st.caption(f"⏱️ Son otomatik kontrol: {k_durum['son_calisma'].strftime('%d.%m.%Y %H:%M')} "
+                   f"({k_durum['sure']:.1f} sn) · her {KONTROL_ARALIGI_DK} dk")
+    if k_durum['hata']:
+        st.caption(f"⚠️ Kontrol hatası: {k_durum['hata']}")
+
+    if isinstance(depo_getir(), YazmaKuyrugu):
+        q_durum = depo_getir().durum()
+        if q_durum['derinlik']:
+            st.caption(f"📤 Gönderilmeyi bekleyen yazım: {q_durum['derinlik']}")
+        if q_durum['son_hata']:
+            st.caption(f"⚠️ Yazım hatası ({q_durum['deneme']}. deneme): {q_durum['son_hata']}")
+        if q_durum['basarisiz']:
+            st.warning(f"{q_durum['basarisiz']} yazım Sheets'e gönderilemedi. Ekranda görünüyorlar ama "
+                       f"tekrar denenene kadar Sheets'te yoklar.")
+            if st.button("🔁 Tekrar Dene", use_container_width=True):
+                depo_getir().basarisizlari_tekrar_dene()
+                st.rerun()
+
+    with st.expander("⚙️ Yönetici Ayarları"):
+        tab_admin1, tab_admin2, tab_admin3 = st.tabs(["🔑 Şifre", "➕ Yeni", "🏖️ Tatiller"])
+
+        with tab_admin1:
+            st.caption("Mevcut kullanıcının şifresini değiştir")
+            with st.form("sifre_degis_form", clear_on_submit=True):
+                yeni_pass = st.text_input("Yeni Şifre", type="password")
+                submitted = st.form_submit_button("Şifreyi Güncelle")
+                if submitted:
+                    if yeni_pass:
+                        sifre_guncelle(st.session_state.aktif_kullanici, yeni_pass)
+                        st.success("Şifre değişti!")
+                        time.sleep(1)
+                    else:
+                        st.error("Şifre boş olamaz")
+
+        with tab_admin2:
+            st.caption("Yeni yönetici ekle")
+            with st.form("yeni_yonetici_form", clear_on_submit=True):
+                new_admin_user = st.text_input("Kullanıcı Adı")
+                new_admin_pass = st.text_input("Şifre")
+                submitted_new = st.form_submit_button("Yönetici Ekle")
+                if submitted_new:
+                    if new_admin_user and new_admin_pass:
+                        yeni_yonetici_ekle(new_admin_user, new_admin_pass)
+                        st.success(f"{new_admin_user} eklendi!")
+                        time.sleep(1)
+                    else:
+                        st.error("Bilgileri eksiksiz girin")
+        
+        with tab_admin3:
+            st.caption("Ders düşülmeyecek günleri ekleyin.")
+            try:
+                mevcut_tatiller = [str(r['tarih']) for r in anlik['tatiller'] if r.get('tarih')]
+            except:
+                mevcut_tatiller = []
+            
+            if mevcut_tatiller:
+                st.write("**Mevcut Tatiller:**")
+                for t in mevcut_tatiller:
+                    st.markdown(f"- `{t}`")
+            else:
+                st.info("Kayıtlı tatil yok.")
+
+            yeni_tatil = st.date_input("Tatil Günü Seç", datetime.now(), format="DD/MM/YYYY")
+            if st.button("Tatil Ekle", use_container_width=True):
+                t_str = str(yeni_tatil)
+                if t_str not in mevcut_tatiller:
+                    with olcum_getir().eylem("tatil_ekle"):
+                        depo_getir().tatil_ekle(t_str)
+                    st.success("Eklendi!")
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.warning("Bu tarih zaten listede var.")
+
+    with st.expander("🛠️ Veri İşlemleri"):
+        st.write(f"Google Sheet'teki elle değişiklikler en geç {DEGISIKLIK_KONTROL_SN} saniye içinde algılanır; "
+                 "hemen görmek için buraya basın.")
+        if st.button("🔄 Verileri Yenile", use_container_width=True):
+            depo_getir().onbellegi_bosalt()
+            ozet_deposu.clear()
+            doluluk_endeksi.clear()
+            arama_endeksi.clear()
+            st.rerun()
+
+        # Yerel SQLite ile çalışırken Google Sheets isteğe bağlı eşitleme hedefidir
+        if DEPO_TURU == "sqlite":
+            st.caption("Google Sheets eşitleme (tüm tablolar üzerine yazılır)")
+            s_c1, s_c2 = st.columns(2)
+            if s_c1.button("⬇️ Sheets'ten Al", use_container_width=True):
+                with olcum_getir().eylem("sheets_aktar"):
+                    ozet = aktar(sheets_depo(), depo_getir())
+                ozet_deposu.clear()
+                doluluk_endeksi.clear()
+                arama_endeksi.clear()
+                st.success(f"Alındı: {ozet}")
+            if s_c2.button("⬆️ Sheets'e Gönder", use_container_width=True):
+                with olcum_getir().eylem("sheets_aktar"):
+                    ozet = aktar(depo_getir(), sheets_depo())
+                st.success(f"Gönderildi: {ozet}")
+
+    # Çizim sonunda doldurulur (bu çizimin tüm çağrıları görünsün diye)
+    olcum_alani = st.expander("📈 API Ölçümleri")
+
+    st.divider()
+    if st.button("🔴 Çıkış Yap", use_container_width=True):
+        st.session_state.giris_yapildi = False
+        st.query_params.clear()
+        st.rerun()
+
+# --- BAŞLIK ---
+col_logo, col_title = st.columns([1, 15])
+with col_logo:
+    if os.path.exists("logo.png"):
+        st.image("logo.png", width=100)
+    else:
+        st.markdown("# 🎾")
+with col_title:
+    st.markdown("## 🎾 AHAL TEKE Tenis Kulübü Yönetim Sistemi")
+
+try:
+    df = veri_getir_df(anlik['uyelikler'])
+except:
+    st.error("Google Sheets bağlantı hatası! 'yoneticiler' sayfası oluşturuldu mu?")
+    st.stop()
+
+bugun = pd.to_datetime(datetime.now().date())
+
+# --- GLOBAL VERİ İŞLEME ---
+# Türetilmiş sütunlar uye_tablosu_kur'da hesaplanır; df paylaşılır, burada sadece süzülür
+if not df.empty:
+    tum_bitenler = df[~df['aktif_mi']]
+    bir_hafta_once = bugun - timedelta(days=7)
+
+    bitenler_gosterim = tum_bitenler[
+        (tum_bitenler['bitis_tarihi'] >= bir_hafta_once) |
+        (tum_bitenler['kalan_hak'] <= 0)
+        ]
+    yaklasanlar = df[
+        (df['aktif_mi']) &
+        (((df['bitis_tarihi'] - bugun).dt.days <= 7) | (df['kalan_hak'] <= 2))
+        ]
+else:
+    df = pd.DataFrame(
+        columns=['aktif_mi', 'yas', 'yas_grubu', 'cinsiyet', 'ders_tipi', 'ucret', 'veli_adi', 'ad_soyad'])
+    yaklasanlar = pd.DataFrame()
+    bitenler_gosterim = pd.DataFrame()
+
+# --- ÜYE KARTLARI ---
+# Her kart bir fragment: kart üzerindeki işlem sadece o kartı yeniden çizer (tüm sayfa değil).
+# Yazımdan sonra üyenin satırı tek başına yeniden kurulur ve bu oturumda paylaşılan çerçevedeki
+# satırın yerine kullanılır; bir sonraki tam çizimde çerçeve zaten güncel gelir.
+st.session_state.kart_satirlari = {}
+
+def kart_satiri(row):
+    return st.session_state.kart_satirlari.get(int(row['id']), row)
+
+def kart_tazele(uye_id):
+    kayit = depo_getir().uye(uye_id)
+    if kayit:
+        st.session_state.kart_satirlari[uye_id] = uye_tablosu_kur([kayit], datetime.now().date()).iloc[0]
+    try:
+        st.rerun(scope="fragment")
+    except st.errors.StreamlitAPIException:
+        # Kart tam çizim sırasında tetiklendiyse (fragment çalışması değil) sayfa yeniden çizilir
+        st.rerun()
+
+@st.fragment
+def uyari_karti(row, tur):
+    # tur: 'yak' (Yaklaşanlar) veya 'bit' (Bitenler)
+    row = kart_satiri(row)
+    with st.container(border=True):
+        c1, c2 = st.columns([3, 2])
+        c1.markdown(f"**{row['ad_soyad']}**")
+
+        saat_gosterim = str(row.get('saat', ''))
+        saat_text = f"⏰ {saat_gosterim}" if saat_gosterim and saat_gosterim not in ['nan', 'None'] else ""
+        c1.write(f"🎾 **{row['ders_tipi']}** {saat_text}")
+
+        tarih_str = row['baslangic_tarihi'].strftime('%d.%m.%Y') if pd.notnull(
+            row['baslangic_tarihi']) else "-"
+        bitis_str = row['bitis_tarihi'].strftime('%d.%m.%Y') if pd.notnull(row['bitis_tarihi']) else "-"
+        c1.caption(f"📅 {tarih_str} - {bitis_str}")
+
+        if tur == 'yak':
+            msg = []
+            if pd.notnull(row['bitis_tarihi']) and (row['bitis_tarihi'] - bugun).days <= 7: msg.append(
+                "Süre Az")
+            if row['kalan_hak'] <= 2: msg.append("Hak Az")
+            if msg: c1.warning(" & ".join(msg))
+            c1.write(f"Kalan: **{row['kalan_hak']}**")
+        elif row['kalan_hak'] <= 0 or not row['aktif_mi']:
+            c1.error("HAK BİTTİ" if row['kalan_hak'] <= 0 else "SÜRE BİTTİ")
+
+        y_adet = c2.number_input("Adet", value=int(row['toplam_hak']), key=f"{tur}_n_{row['id']}")
+        y_tarih = c2.date_input("Yeni Bitiş", value=bugun + timedelta(days=30), format="DD/MM/YYYY",
+                                key=f"{tur}_d_{row['id']}")
+        if c2.button("➕ Uzat" if tur == 'yak' else "♻️ Yenile / Uzat", key=f"{tur}_b_{row['id']}"):
+            uyelik_yenile_gs(row['id'], y_adet, y_tarih)
+            st.success("Yenilendi!");
+            kart_tazele(int(row['id']))
+
+@st.fragment
+def uye_karti(row):
+    row = kart_satiri(row)
+    uye_no = int(row['id'])
+    acik_panel = st.session_state.get('acik_panel')
+    with st.container(border=True):
+        c1, c2, c3, c4 = st.columns([3, 3, 2, 2])
+        
+        ikon = "🧒" if row['yas_grubu'] == 'Çocuk (Junior)' else ("👨" if row['cinsiyet'] == "Erkek" else "👩")
+        c1.markdown(f"### {ikon} {row['ad_soyad']}")
+        if row['yas_grubu'] == 'Çocuk (Junior)' and str(row.get('veli_adi', '')).strip():
+            c1.caption(f"Veli: {row['veli_adi']}")
+
+        tarih_str = row['baslangic_tarihi'].strftime('%d.%m.%Y') if pd.notnull(row['baslangic_tarihi']) else "-"
+        bitis_str = row['bitis_tarihi'].strftime('%d.%m.%Y') if pd.notnull(row['bitis_tarihi']) else "-"
+
+        saat_gosterim = str(row.get('saat', ''))
+        saat_text = f" | ⏰ {saat_gosterim}" if saat_gosterim and saat_gosterim not in ['nan', 'None'] else ""
+        
+        c2.caption(f"{row['ders_tipi']} | {row['gunler']}{saat_text}")
+        c2.write(f"📅 {tarih_str} ➡ **{bitis_str}**")
+
+        if row['kalan_hak'] == 0:
+            c3.error("Hak: 0")
+        else:
+            c3.metric("Hak", row['kalan_hak'])
+
+        b_art, b_azal = c4.columns(2)
+        if b_art.button("➕", key=f"p_{row['id']}"):
+            manuel_islem_gs(row['id'], 1);
+            st.toast("+1");
+            kart_tazele(uye_no)
+        if b_azal.button("➖", key=f"m_{row['id']}"):
+            if row['kalan_hak'] > 0:
+                manuel_islem_gs(row['id'], -1);
+                st.toast("-1");
+                kart_tazele(uye_no)
+            else:
+                st.error("0!")
+
+        a1, a2, _ = st.columns([1, 1, 2])
+        if a1.button("✏️ Düzenle / 🗑️ Sil", key=f"ac_d_{row['id']}"):
+            acik_panel = None if acik_panel == (uye_no, 'duzenle') else (uye_no, 'duzenle')
+            st.session_state.acik_panel = acik_panel
+        if a2.button("♻️ Paket / Süre Uzatma", key=f"ac_u_{row['id']}"):
+            acik_panel = None if acik_panel == (uye_no, 'uzat') else (uye_no, 'uzat')
+            st.session_state.acik_panel = acik_panel
+
+        if acik_panel == (uye_no, 'duzenle'):
+            tab_duzen, tab_sil = st.tabs(["Düzenle", "Sil"])
+            with tab_duzen:
+                with st.form(key=f"edit_form_{row['id']}"):
+                    d_ad = st.text_input("Ad Soyad", value=row['ad_soyad'])
+                    
+                    c_edit1, c_edit2 = st.columns(2)
+                    d_tel = c_edit1.text_input("Telefon", value=row['telefon'])
+                    
+                    mevcut_dt = row['dogum_tarihi'].date() if pd.notnull(row['dogum_tarihi']) else datetime(2000, 1, 1).date()
+                            
+                    d_dt = c_edit2.date_input("Doğum Tarihi", value=mevcut_dt, format="DD/MM/YYYY")
+
+                    c_kat_edit, c_veli_edit = st.columns(2)
+                    mevcut_kat = "Çocuk" if row['yas_grubu'] == 'Çocuk (Junior)' else "Yetişkin"
+                    d_kategori = c_kat_edit.selectbox("Kategori", ["Yetişkin", "Çocuk"], index=1 if mevcut_kat == "Çocuk" else 0)
+                    d_veli = c_veli_edit.text_input("Veli Adı Soyadı", value=str(row.get('veli_adi', '')).replace('nan',''))
+
+                    d_tip = st.selectbox("Paket", ["Grup Dersi", "Özel Ders"],
+                                         index=0 if row['ders_tipi'] == "Grup Dersi" else 1)
+                    
+                    # YENİ: Saat Düzenleme için Tam Saat Dropdown'u eklendi
+                    c_d1, c_d2, c_d3 = st.columns(3)
+                    d_top = c_d1.number_input("Toplam Hak", value=int(row['toplam_hak']))
+                    d_kal = c_d2.number_input("Kalan Hak", value=int(row['kalan_hak']))
+                    
+                    m_saat_str = str(row.get('saat', '18:00')).strip()
+                    
+                    # Hatalı/eski veri varsa onu en yakın saate yuvarlama veya default 18:00 yapma kilidi
+                    if m_saat_str not in TAM_SAATLER:
+                        try:
+                            # "18:30" gibi bir şey geldiyse sadece "18" kısmını alıp ":00" ekler
+                            m_saat_str = f"{m_saat_str.split(':')[0].zfill(2)}:00"
+                            if m_saat_str not in TAM_SAATLER: m_saat_str = "18:00"
+                        except:
+                            m_saat_str = "18:00"
+                            
+                    d_saat = c_d3.selectbox("Ders Saati", TAM_SAATLER, index=TAM_SAATLER.index(m_saat_str))
+                    
+                    if st.form_submit_button("💾 Değişiklikleri Kaydet"):
+                        uye_guncelle_gs(row['id'], d_ad, d_tel, str(d_dt), d_tip, d_top, d_kal, d_veli, d_kategori, d_saat)
+                        st.session_state.acik_panel = None
+                        st.success("Güncellendi!");
+                        time.sleep(1);
+                        kart_tazele(uye_no)
+            with tab_sil:
+                st.warning("Bu işlem geri alınamaz!")
+                if st.button("🗑️ Üyeyi Kalıcı Olarak Sil", key=f"del_{row['id']}"):
+                    uye_sil_gs(row['id'])
+                    st.session_state.acik_panel = None
+                    st.success("Üye Silindi.");
+                    time.sleep(1);
+                    st.rerun()
+
+        if acik_panel == (uye_no, 'uzat'):
+            rc1, rc2 = st.columns(2)
+            y_adet = rc1.number_input("Ders Sayısı", value=int(row['toplam_hak']), key=f"list_n_{row['id']}")
+            y_tarih = rc1.date_input("Yeni Bitiş", value=bugun + timedelta(days=30), format="DD/MM/YYYY", key=f"list_d_{row['id']}")
+            if rc2.button("Yenile / Uzat", key=f"list_b_{row['id']}"):
+                uyelik_yenile_gs(row['id'], y_adet, y_tarih)
+                st.session_state.acik_panel = None
+                st.success("İşlem Tamam!");
+                kart_tazele(uye_no)
+# Sekme değişince yeniden çizilir; Grafikler ve Program sadece açıkken hesaplanır (plotly de o zaman yüklenir)
+tabs = st.tabs(["⚠️ Yaklaşanlar & Bitenler", "➕ Yeni Üye Ekle", "📋 Üye Listesi", "📑 Raporlar", "📊 Grafikler",
+                "🗓️ Haftalık Program"], key="ana_sekme", on_change="rerun")
+
+# --- TAB 1: UYARILAR ---
+with tabs[0]:
+    col_yak, col_bit = st.columns(2)
+    with col_yak:
+        st.subheader(f"🟡 Yaklaşanlar ({len(yaklasanlar)})")
+        if not yaklasanlar.empty:
+            for i, row in yaklasanlar.iterrows():
+                uyari_karti(row, 'yak')
+        else:
+            st.success("Riskli üye yok.")
+
+    with col_bit:
+        st.subheader(f"🔴 Son 1 Haftada Bitenler ({len(bitenler_gosterim)})")
+        if not bitenler_gosterim.empty:
+            for i, row in bitenler_gosterim.iterrows():
+                uyari_karti(row, 'bit')
+        else:
+            st.success("Temiz")
+
+    # Listedeki üyeler tek seferde yenilenir: tek toplu yazım, ardından tek düşüm geçişi
+    adaylar = pd.concat([yaklasanlar, bitenler_gosterim])
+    if st.session_state.get('toplu_yenile_mesaj'):
+        st.success(st.session_state.toplu_yenile_mesaj)
+        st.session_state.toplu_yenile_mesaj = None
+    if not adaylar.empty:
+        with st.expander(f"♻️ Toplu Yenileme ({len(adaylar)} üye)"):
+            etiketler = {}
+            for _, r in adaylar.iterrows():
+                bitis_str = r['bitis_tarihi'].strftime('%d.%m.%Y') if pd.notnull(r['bitis_tarihi']) else "-"
+                etiketler[int(r['id'])] = f"{r['ad_soyad']} — {r['kalan_hak']} hak, bitiş {bitis_str}"
+            with st.form("toplu_yenile_form"):
+                hepsi = st.checkbox(f"Listedeki tüm üyeler ({len(etiketler)})")
+                secilenler = st.multiselect("Yenilenecek üyeler", list(etiketler), format_func=etiketler.get,
+                                            placeholder="Üye seçiniz")
+                ty1, ty2 = st.columns(2)
+                toplu_adet = ty1.number_input("Eklenecek Ders (0 = her üyenin kendi paketi)", min_value=0, value=0)
+                toplu_bitis = ty2.date_input("Yeni Bitiş", datetime.now() + timedelta(days=30), format="DD/MM/YYYY")
+                if st.form_submit_button("♻️ Seçilenleri Yenile", type="primary"):
+                    idler = list(etiketler) if hepsi else secilenler
+                    if not idler:
+                        st.warning("Üye seçiniz.")
+                    else:
+                        paketler = adaylar.set_index('id')['toplam_hak']
+                        adet = toplu_yenile_gs({u: (int(toplu_adet) or int(paketler.get(u, 0) or 0), toplu_bitis)
+                                                for u in idler})
+                        st.session_state.toplu_yenile_mesaj = f"{adet} üyenin paketi yenilendi."
+                        st.rerun()
+
+# --- TAB 2: YENİ ÜYE (GÜNCELLENDİ: TAM SAAT DROPDOWN) ---
+with tabs[1]:
+    st.header("📝 Yeni Üye Kaydı")
+
+    if st.session_state.get('form_hata'):
+        st.error(st.session_state.form_hata)
+        st.session_state.form_hata = None
+    if st.session_state.get('form_basari'):
+        st.balloons()
+        st.success("Kayıt Başarıyla Oluşturuldu!")
+        st.session_state.form_basari = False
+
+    with st.form("yeni_uye_form", clear_on_submit=True):
+        c1, c2 = st.columns(2)
+        yeni_ad = c1.text_input("Ad Soyad")
+        yeni_tel = c2.text_input("Telefon (11 Hane)", placeholder="05321234567", max_chars=11)
+
+        st.divider()
+        c3, c4, c_kat = st.columns(3)
+        yeni_dt = c3.date_input("Doğum Tarihi",
+                                value=datetime(2000, 1, 1),
+                                min_value=datetime(1900, 1, 1),
+                                max_value=datetime.now(),
+                                format="DD/MM/YYYY")
+        yeni_cins = c4.selectbox("Cinsiyet", ["Erkek", "Kadın"])
+        yeni_kategori = c_kat.selectbox("Kategori (Yaş Grubu)", ["Yetişkin", "Çocuk"])
+
+        st.info("ℹ️ Lütfen çocuk üyeler için Veli Adını girmeyi unutmayınız. Yetişkinler boş bırakabilir.")
+        yeni_veli = st.text_input("👨‍👩‍👦 Veli Adı Soyadı")
+
+        st.divider()
+        c5, c6, c7 = st.columns(3)
+        yeni_tip = c5.selectbox("Paket Tipi", ["Grup Dersi", "Özel Ders"])
+        yeni_hak = c6.number_input("Ders Sayısı", min_value=1, value=8)
+        yeni_ucret = c7.number_input("Ücret (TL)", value=3000)
+
+        st.divider()
+        c8, c_bitis, c9 = st.columns(3)
+        yeni_bas = c8.date_input("Başlangıç Tarihi", datetime.now(), format="DD/MM/YYYY")
+        yeni_bitis = c_bitis.date_input("Bitiş Tarihi", datetime.now() + timedelta(days=30), format="DD/MM/YYYY")
+        yeni_odeme = c9.selectbox("Ödeme", ["Nakit", "IBAN", "Kredi Kartı"])
+
+        # YENİ: Saat seçimi artık serbest yazı değil, sadece TAM SAATLER listesinden seçiliyor
+        c10, c11 = st.columns([2, 1])
+        yeni_gunler = c10.multiselect("Günler",
+                                      ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"],
+                                      placeholder="Gün seçiniz!")
+        
+        yeni_saat = c11.selectbox("Ders Saati", TAM_SAATLER, index=TAM_SAATLER.index("18:00"))
+        cakisma_onay = st.checkbox("Seçilen saatte yer yoksa yine de kaydet")
+
+        submitted = st.form_submit_button("✅ Üyeyi Kaydet", type="primary")
+
+        if submitted:
+            hata_var = False
+
+            if not yeni_ad:
+                st.session_state.form_hata = "İsim giriniz."
+                hata_var = True
+            elif not yeni_gunler:
+                st.session_state.form_hata = "Gün seçiniz."
+                hata_var = True
+            elif not cakisma_onay:
+                # Kort çakışması: seçilen gün/saatlerde bu paket tipine yer kalmış mı
+                cakismalar = doluluk_endeksi().cakismalar(yeni_gunler, yeni_saat, yeni_tip == "Özel Ders")
+                if cakismalar:
+                    st.session_state.form_hata = "Yer yok: " + ", ".join(
+                        f"{g} {s} ({b['kort']} kort kullanımda, {KORT_SAYISI} kort var)" for g, s, b in cakismalar
+                    ) + ". Başka saat seçin veya onay kutusunu işaretleyin."
+                    hata_var = True
+
+            if not hata_var:
+                # Saat parametresi direkt string olarak gönderiliyor
+                yeni_uye_ekle_gs(yeni_ad, yeni_tel, yeni_cins, yeni_dt, yeni_bas, yeni_bitis, yeni_ucret,
+                                 yeni_odeme, yeni_gunler, yeni_tip, yeni_hak, yeni_veli, yeni_kategori, yeni_saat)
+                st.session_state.form_basari = True
+                st.rerun()
+
+    # Sezon başı toplu kayıt: dosya doğrulanır, geçerli satırlar tek toplu eklemede yazılır
+    if st.session_state.get('toplu_kayit_mesaj'):
+        st.success(st.session_state.toplu_kayit_mesaj)
+        st.session_state.toplu_kayit_mesaj = None
+    with st.expander("📥 Toplu Kayıt (CSV / Excel)"):
+        turler = dosya_turleri()
+        st.caption("Başlık satırı şablondaki gibi olmalı. Zorunlu sütunlar: Ad Soyad, Ders Sayısı, Günler, Saat. "
+                   "Başlangıç boşsa bugün, bitiş boşsa başlangıçtan 30 gün sonrası alınır."
+                   + ("" if 'xlsx' in turler else " Excel için openpyxl kurulu değil; CSV olarak kaydedin."))
+        st.download_button("📄 Şablonu İndir", sablon_csv(), "uye_sablonu.csv", "text/csv")
+        # Başarılı kayıttan sonra anahtar değişir, yükleyici boşalır
+        dosya = st.file_uploader("Dosya", type=turler, key=f"toplu_dosya_{st.session_state.get('yukleme_no', 0)}")
+        if dosya is not None:
+            try:
+                tablo = dosya_oku(dosya, dosya.name)
+            except Exception as e:
+                st.error(f"Dosya okunamadı: {e}")
+                tablo = None
+            if tablo is not None:
+                kayitlar, hatalar = dogrula(tablo, df[['ad_soyad', 'telefon']].to_dict('records') if not df.empty
+                                            else [], datetime.now().date(), TAM_SAATLER)
+                st.write(f"✅ {len(kayitlar)} geçerli satır, ❌ {len(hatalar)} hatalı satır")
+                if len(hatalar):
+                    st.dataframe(hatalar, hide_index=True, use_container_width=True)
+                if kayitlar:
+                    st.dataframe(pd.DataFrame(kayitlar)[['ad_soyad', 'telefon', 'ders_tipi', 'toplam_hak', 'gunler',
+                                                         'saat', 'baslangic_tarihi', 'bitis_tarihi']],
+                                 hide_index=True, use_container_width=True)
+                    etiket = f"✅ {len(kayitlar)} Üyeyi Kaydet" + (" (hatalı satırlar atlanır)" if len(hatalar) else "")
+                    if st.button(etiket, type="primary"):
+                        adet = toplu_uye_ekle_gs(kayitlar)
+                        st.session_state.toplu_kayit_mesaj = f"{adet} üye kaydedildi."
+                        st.session_state.yukleme_no = st.session_state.get('yukleme_no', 0) + 1
+                        st.rerun()
+
+# --- TAB 3: LİSTE ---
+with tabs[2]:
+    if not df.empty:
+        fc1, fc2, fc3, fc4 = st.columns([2, 1, 1, 1])
+        arama = fc1.text_input("🔍 Kişi Ara", placeholder="Ali...")
+        f_tip = fc2.multiselect("Ders Tipi", df['ders_tipi'].unique().tolist(), placeholder="Seçiniz")
+        f_durum = fc3.radio("Durum", ["Aktif", "Pasif", "Hepsi"], horizontal=True, index=0)
+        f_kategori = fc4.radio("Kategori", ["Hepsi", "Yetişkin", "Çocuk"], horizontal=True, index=0)
+
+        # Filtreler hazır maskelerle birleştirilir; çerçeve kopyalanmaz, sadece satır konumları seçilir
+        maskeler = liste_maskeleri(depo_getir().surum("uyelikler"), bugun, df)
+        secim = np.ones(len(df), dtype=bool)
+        if f_tip: secim &= np.logical_or.reduce([maskeler['ders_tipi'][t] for t in f_tip])
+        if f_durum == "Aktif": secim &= maskeler['aktif']
+        if f_durum == "Pasif": secim &= ~maskeler['aktif']
+        if f_kategori == "Yetişkin": secim &= maskeler['yetiskin']
+        if f_kategori == "Çocuk": secim &= ~maskeler['yetiskin']
+
+        if arama:
+            # Arama sonuçları alaka sırasıyla; endekste olup bu çerçevede olmayanlar (-1) atlanır
+            konumlar = maskeler['konum'].get_indexer_for(arama_endeksi().ara(arama))
+            konumlar = konumlar[konumlar >= 0]
+        else:
+            konumlar = maskeler['sira']
+        konumlar = konumlar[secim[konumlar]]
+
+        # Sayfalama: sadece görünen sayfadaki kartlar çizilir
+        pc1, pc2, pc3 = st.columns([3, 1, 1])
+        pc1.write(f"**Toplam: {len(konumlar)} Kişi**")
+        sayfa_boyutu = pc2.selectbox("Sayfa Başına", SAYFA_BOYUTLARI, index=0)
+        toplam_sayfa = max(1, -(-len(konumlar) // sayfa_boyutu))
+        sayfa_no = pc3.selectbox("Sayfa", range(1, toplam_sayfa + 1), format_func=lambda x: f"{x} / {toplam_sayfa}")
+        sayfa_df = df.iloc[konumlar[(sayfa_no - 1) * sayfa_boyutu: sayfa_no * sayfa_boyutu]]
+
+        for i, row in sayfa_df.iterrows():
+            uye_karti(row)
+    else:
+        st.info("Kayıt yok veya veritabanı boş.")
+
+# --- TAB 4: RAPORLAR ---
+with tabs[3]:
+    st.header("📑 Detaylı Rapor Listeleri")
+    if not df.empty:
+        rc1, rc2 = st.columns(2)
+        rapor_turu = rc1.selectbox("Rapor Türü Seçiniz:", list(RAPORLAR))
+        durum_filtresi = rc2.radio("Durum Filtresi:", list(DURUM_FILTRELERI), horizontal=True)
+
+        # Tüm raporların satırları tek geçişte; ekranda sadece seçilen gösterilir
+        rapor_satir_listesi = rapor_satirlari(df, durum_filtresi)
+        gosterilecek_tablo = rapor_tablosu(df, rapor_satir_listesi[rapor_turu], rapor_turu)
+
+        if not gosterilecek_tablo.empty:
+            st.dataframe(gosterilecek_tablo, use_container_width=True)
+            # Dosya sadece indirme istendiğinde, parça parça üretilir
+            st.download_button("📥 Bu Raporu İndir",
+                               partial(tek_rapor_csv, df, rapor_satir_listesi[rapor_turu], rapor_turu),
+                               "ozel_rapor.csv", "text/csv")
+        else:
+            st.warning("Kayıt bulunamadı.")
+
+        st.divider()
+        st.subheader("📦 Tüm Raporlar")
+        ec1, ec2 = st.columns([2, 1])
+        bicim = ec1.selectbox("Biçim", kullanilabilir_bicimler())
+        dosya_adi, mime, _ = BICIMLER[bicim]
+        ec2.download_button("📥 Hepsini İndir", partial(disa_aktar, df, rapor_satir_listesi, bicim),
+                            dosya_adi, mime, use_container_width=True)
+
+# --- TAB 5: GRAFİKLER ---
+with tabs[4]:
+    if tabs[4].open:
+        st.header("📊 Grafiksel Analiz")
+        if not df.empty:
+            uye_surum = depo_getir().surum("uyelikler")
+            fig1, fig2, fig3 = dagilim_grafikleri(uye_surum, bugun, df)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("Cinsiyet")
+                st.plotly_chart(fig1, use_container_width=True)
+            with col2:
+                st.subheader("Yetişkin / Çocuk")
+                st.plotly_chart(fig2, use_container_width=True)
+
+            st.divider()
+            st.subheader("Ders Tiplerine Göre")
+            st.plotly_chart(fig3, use_container_width=True)
+
+            # Zaman serileri: düşüm/kayıt/yenilemede güncellenen özet tablosundan (geçmiş taranmaz)
+            ozetler = ozet_deposu()
+            trendler = trend_grafikleri(ozetler.surum, uye_surum, ozetler, df)
+            st.divider()
+            st.subheader("Aylık Gelir")
+            st.plotly_chart(trendler['gelir'], use_container_width=True)
+            col3, col4 = st.columns(2)
+            with col3:
+                st.subheader("Haftalık Aktif Üye")
+                st.plotly_chart(trendler['aktif'], use_container_width=True)
+            with col4:
+                st.subheader("Aylık Yenileme Oranı")
+                st.plotly_chart(trendler['oran'], use_container_width=True)
+            st.subheader("Günlük İşlenen Ders")
+            st.plotly_chart(trendler['ders'], use_container_width=True)
+        else:
+            st.info("Grafik için veri yok.")
+
+# --- TAB 6: HAFTALIK PROGRAM ---
+with tabs[5]:
+    if tabs[5].open:
+        st.header("🗓️ Haftalık Kort Programı")
+        endeks = doluluk_endeksi()
+
+        gosterim = st.radio("Gösterim", ["Üye Sayısı", "Kullanılan Kort"], horizontal=True)
+        izgara = endeks.izgara('uye' if gosterim == "Üye Sayısı" else 'kort')
+        izgara = izgara[(izgara.sum(axis=1) > 0)]  # boş saatler gizlenir
+        if not izgara.empty:
+            import plotly.express as px
+            fig_p = px.imshow(izgara, text_auto=True, aspect='auto', color_continuous_scale='Greens',
+                              labels={'x': 'Gün', 'y': 'Saat', 'color': gosterim})
+            st.plotly_chart(fig_p, use_container_width=True)
+        else:
+            st.info("Programda aktif üye yok.")
+
+        for gun, saat, kort in endeks.asiri_dolu():
+            st.warning(f"⚠️ {gun} {saat}: {kort} kort gerekiyor, {KORT_SAYISI} kort var.")
+
+        st.divider()
+        pc1, pc2 = st.columns(2)
+        secilen_gun = pc1.selectbox("Gün", list(GUNLER_MAP.values()))
+        secilen_saat = pc2.selectbox("Saat", TAM_SAATLER, index=TAM_SAATLER.index("18:00"))
+        hucre = endeks.hucre(secilen_gun, secilen_saat)
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Grup", hucre['grup'])
+        m2.metric("Özel", hucre['ozel'])
+        m3.metric("Boş Kort", f"{hucre['bos_kort']} / {KORT_SAYISI}")
+        m4.metric("Grupta Boş Yer", hucre['grup_bos_yer'])
+        if hucre['uyeler'] and not df.empty:
+            kadro = df[df['id'].astype(str).isin(hucre['uyeler'])]
+            st.dataframe(kadro[['ad_soyad', 'telefon', 'ders_tipi', 'kalan_hak']].rename(columns={
+                'ad_soyad': 'Ad Soyad', 'telefon': 'Telefon', 'ders_tipi': 'Ders Tipi', 'kalan_hak': 'Kalan Hak'}),
+                use_container_width=True, hide_index=True)
+        else:
+            st.caption("Bu saatte ders yok.")
+
+# --- API ÖLÇÜM PANELİ (sidebar, çizim sonunda) ---
+with olcum_alani:
+    olcum = olcum_getir()
+    bu_cizim = Olcum.ozet(olcum.kayitlar(isaret=render_isareti, iplik=threading.get_ident()))
+    son_dakika = Olcum.ozet(olcum.kayitlar(saniye=60))
+
+    st.caption(f"Bu çizim: {bu_cizim['cagri']} çağrı · {bu_cizim['sure_ms']:.0f} ms · {bu_cizim['adet']} satır/hücre")
+    m1, m2 = st.columns(2)
+    m1.metric("Okuma / dk", son_dakika['okuma'], f"{SHEETS_KOTA_DK - son_dakika['okuma']} boş", delta_color="off")
+    m2.metric("Yazma / dk", son_dakika['yazma'], f"{SHEETS_KOTA_DK - son_dakika['yazma']} boş", delta_color="off")
+    if son_dakika['hata']:
+        st.warning(f"Son 1 dk'da {son_dakika['hata']} hatalı çağrı")
+
+    en_yavaslar = olcum.en_yavaslar(5, saniye=600)
+    if en_yavaslar:
+        st.caption("En yavaş çağrılar (son 10 dk)")
+        st.dataframe(pd.DataFrame(en_yavaslar)[['eylem', 'tur', 'sayfa', 'sure_ms', 'adet']],
+                     hide_index=True, use_container_width=True)
+    st.download_button("📥 Ölçüm Kaydı (JSONL)", olcum.jsonl(), "api_olcum.jsonl", "application/json",
+                       use_container_width=True)
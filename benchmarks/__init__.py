@@ -0,0 +1 @@
+# Çevrimdışı performans ölçümleri (sahte gspread + sentetik kulüp)
@@ -0,0 +1,116 @@
+# Soğuk başlangıç ölçümü: her ölçüm yeni bir Python sürecinde yapılır (modül önbelleği boş).
+#   ice_aktarma : app.py'deki tüm importlar (streamlit dahil)
+#   giris       : giriş ekranının ilk çizimi (veri okunmamalı, ağır kütüphaneler yüklenmemeli)
+#   panel       : giriş yapılmış ana sayfanın ilk çizimi (sentetik kulüp, SQLite)
+# Kullanım (depo kökünden):
+#   python -m benchmarks.baslangic --uyeler 100,2000 --tekrar 3
+#   python -m benchmarks.baslangic --json baslangic.json
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from functools import partial
+
+from benchmarks.calistir import UYGULAMA
+from benchmarks.sahte_gspread import SahteKitap
+from benchmarks.sentetik import kulup_olustur
+from tenis.depolama import SheetsDepo, SqliteDepo, aktar
+
+KOK = os.path.dirname(UYGULAMA)
+
+# Giriş ekranında yüklenmemesi gerekenler. numpy listede yok: st.image (logo) onu kendisi yükler;
+# plotly'nin kökünü de AppTest yükler, bu yüzden plotly.express'e bakılır.
+AGIR_MODULLER = ('pandas', 'plotly.express', 'gspread', 'oauth2client')
+
+ICE_AKTARMA = """
+import ast, json, time
+agac = ast.parse(open({yol!r}, encoding='utf-8').read())
+govde = [n for n in agac.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+t0 = time.perf_counter()
+exec(compile(ast.Module(body=govde, type_ignores=[]), {yol!r}, 'exec'), {{}})
+print(json.dumps({{'sure': time.perf_counter() - t0}}))
+"""
+
+CIZIM = """
+import json, sys, time
+from streamlit import logger
+from streamlit.testing.v1 import AppTest
+logger.set_log_level('error')
+onceki = set(sys.modules)
+at = AppTest.from_file({yol!r}, default_timeout=300)
+if {giris!r}:
+    at.query_params['durum'] = 'giris_ok'
+    at.query_params['user'] = 'admin'
+t0 = time.perf_counter()
+at.run()
+sure = time.perf_counter() - t0
+print(json.dumps({{'sure': sure, 'hata': [str(e.value) for e in at.exception],
+                  'yuklenen': [m for m in {agir!r} if m in sys.modules and m not in onceki]}}))
+"""
+
+
+def alt_surec(kod, ortam):
+    cikti = subprocess.run([sys.executable, '-c', kod], cwd=KOK, env={**os.environ, **ortam},
+                           capture_output=True, text=True, check=True).stdout
+    return json.loads(cikti.strip().splitlines()[-1])
+
+
+def olc(kod, ortam, tekrar, hazirla=None):
+    sonuclar = []
+    for _ in range(tekrar):
+        if hazirla:
+            hazirla()
+        sonuclar.append(alt_surec(kod, ortam))
+    sonuc = sonuclar[-1]
+    sonuc['sure'] = statistics.median(s['sure'] for s in sonuclar)
+    return sonuc
+
+
+def veritabani_kur(uye_sayisi, yol):
+    # Sentetik kulüp sahte Sheets'ten SQLite'a aktarılır (panel çizimi gerçek bir depo okur)
+    aktar(SheetsDepo(SahteKitap(kulup_olustur(uye_sayisi))), SqliteDepo(yol))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="tenis-yonetim soğuk başlangıç ölçümü")
+    ap.add_argument('--uyeler', default='100,2000', help="panel çizimi için virgülle ayrılmış kulüp büyüklükleri")
+    ap.add_argument('--tekrar', type=int, default=3, help="her ölçümün tekrar sayısı (medyan alınır)")
+    ap.add_argument('--json', help="sonuçların yazılacağı dosya")
+    args = ap.parse_args()
+
+    sonuclar = []
+    with tempfile.TemporaryDirectory() as klasor:
+        ortam = {'DEPO': 'sqlite', 'SQLITE_YOLU': os.path.join(klasor, 'bos.db'),
+                 'YAZMA_KUYRUGU_YOLU': os.path.join(klasor, 'kuyruk.json')}
+        sonuclar.append({'olcum': 'ice_aktarma', **olc(ICE_AKTARMA.format(yol=UYGULAMA), ortam, args.tekrar)})
+        sonuclar.append({'olcum': 'giris', **olc(CIZIM.format(yol=UYGULAMA, giris=False, agir=AGIR_MODULLER),
+                                                 ortam, args.tekrar)})
+        for uye_sayisi in [int(x) for x in args.uyeler.split(',')]:
+            kaynak = os.path.join(klasor, f'kulup_{uye_sayisi}.db')
+            veritabani_kur(uye_sayisi, kaynak)
+            # Her tekrar aynı (düşümü yapılmamış) veritabanının kopyasından başlar
+            panel_ortami = {**ortam, 'SQLITE_YOLU': os.path.join(klasor, 'panel.db')}
+            sonuc = olc(CIZIM.format(yol=UYGULAMA, giris=True, agir=AGIR_MODULLER), panel_ortami, args.tekrar,
+                        hazirla=partial(shutil.copyfile, kaynak, panel_ortami['SQLITE_YOLU']))
+            sonuclar.append({'olcum': 'panel', 'uye': uye_sayisi, **sonuc})
+
+    print(f"{'ölçüm':<12} {'üye':>6} {'süre (sn)':>10}  yüklenen ağır modüller / hata")
+    for s in sonuclar:
+        ek = ", ".join(s.get('yuklenen', [])) or '-'
+        if s.get('hata'):
+            ek += f"  HATA: {s['hata'][0]}"
+        print(f"{s['olcum']:<12} {s.get('uye', ''):>6} {s['sure']:>10.3f}  {ek}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'zaman': datetime.now().isoformat(timespec='seconds'), 'tekrar': args.tekrar,
+                       'sonuclar': sonuclar}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
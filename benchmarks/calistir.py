@@ -0,0 +1,182 @@
+# Çevrimdışı performans ölçümleri: sahte gspread + sentetik kulüp üzerinde app.py fonksiyonları.
+# Kullanım (depo kökünden):
+#   python -m benchmarks.calistir --uyeler 100,1000,5000,20000 --gecikme-ms 0 --yil 2
+#   python -m benchmarks.calistir --uyeler 1000 --senaryo kesinti --json sonuc.json
+import argparse
+import ast
+import json
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+from streamlit import logger
+
+from benchmarks.sahte_gspread import SahteKitap
+from benchmarks.sentetik import kulup_olustur
+from tenis.depolama import SheetsDepo
+from tenis.raporlar import DURUM_FILTRELERI, disa_aktar, rapor_satirlari
+
+UYGULAMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Arama senaryosunun sorguları: tek harf, önek, Türkçe büyük/küçük harf, kelime içi, telefon
+ARAMA_SORGULARI = ['a', 'ay', 'ŞAHİN', 'isik', 'yılmaz 12', 'ahin', '0532', 'veli kaya']
+
+def uygulama_yukle():
+    # app.py bir Streamlit betiği; arayüz kodu çalışmasın diye sadece importlar,
+    # büyük harfli ayarlar ve fonksiyon tanımları alınır
+    agac = ast.parse(open(UYGULAMA, encoding="utf-8").read())
+    govde = [
+        n for n in agac.body
+        if isinstance(n, (ast.Import, ast.ImportFrom, ast.FunctionDef))
+        or (isinstance(n, ast.Assign) and all(isinstance(t, ast.Name) and t.id.isupper() for t in n.targets))
+    ]
+    ad_alani = {'__name__': 'uygulama'}
+    exec(compile(ast.Module(body=govde, type_ignores=[]), UYGULAMA, 'exec'), ad_alani)
+    return ad_alani
+
+
+# --- Senaryolar: her biri taze bir depo ile çalışır ---
+def kesinti(app, depo, rng):
+    return app['sistem_kontrol_sessiz_gs']()
+
+
+def render_verisi(app, depo, rng):
+    # Bir sayfa çiziminin veri tarafı: toplu okuma, tip/türetilmiş sütunlar, uyarı listeleri, grafik sayımları
+    anlik = depo.hepsini_yukle(app['ANLIK_SAYFALAR'])
+    df = app['veri_getir_df'](anlik['uyelikler'])
+    bugun = pd.to_datetime(datetime.now().date())
+    biten = df[~df['aktif_mi']]
+    biten[(biten['bitis_tarihi'] >= bugun - timedelta(days=7)) | (biten['kalan_hak'] <= 0)]
+    df[df['aktif_mi'] & (((df['bitis_tarihi'] - bugun).dt.days <= 7) | (df['kalan_hak'] <= 2))]
+    for sutun in ('cinsiyet', 'yas_grubu', 'ders_tipi'):
+        df[sutun].value_counts()
+    return {'satir': len(df)}
+
+
+def uye_duzenleme(app, depo, rng, adet=20):
+    # Kart üzerindeki işlemler: bilgi düzenleme, manuel düşüm, paket yenileme, silme
+    idler = [u['id'] for u in depo.uyeler()]
+    secilen = rng.sample(idler, min(adet, len(idler)))
+    for uye_id in secilen:
+        u = depo.uye(uye_id)
+        app['uye_guncelle_gs'](uye_id, u['ad_soyad'], f"05{rng.randint(300000000, 599999999)}", u['dogum_tarihi'],
+                               u['ders_tipi'], u['toplam_hak'], u['kalan_hak'], u['veli_adi'], u['kategori'], u['saat'])
+        app['manuel_islem_gs'](uye_id, -1)
+        app['uyelik_yenile_gs'](uye_id, 8)
+    for uye_id in secilen[:max(1, adet // 10)]:
+        app['uye_sil_gs'](uye_id)
+    return {'uye': len(secilen)}
+
+
+def arama(app, depo, rng, tekrar=50):
+    # Üye Listesi araması (endeks hazır): sorgu başına ortalama süre, ms
+    endeks = app['arama_endeksi']()
+    sureler = {}
+    for sorgu in ARAMA_SORGULARI:
+        t0 = time.perf_counter()
+        for _ in range(tekrar):
+            bulunan = endeks.ara(sorgu)
+        sureler[sorgu] = round((time.perf_counter() - t0) / tekrar * 1000, 3)
+    return {'ms': sureler, 'en_yavas_ms': max(sureler.values()), 'son_bulunan': len(bulunan)}
+
+
+def rapor_uretimi(app, depo, rng):
+    # Raporlar sekmesi: her durum filtresiyle tüm raporların satırları + hepsinin CSV (zip) dışa aktarımı
+    df = app['veri_getir_df'](depo.uyeler())
+    bayt = 0
+    for durum in DURUM_FILTRELERI:
+        with disa_aktar(df, rapor_satirlari(df, durum), "CSV (zip)") as f:
+            bayt += len(f.read())
+    return {'zip_bayt': bayt}
+
+
+def degisiklik_takibi(app, depo, rng, cizim=20):
+    # Sheet değişmeden art arda çizimler: her kontrol tek metadata isteği, sayfalar yeniden okunmaz.
+    # Ardından elle bir düzenleme: sonraki kontrol onu görür, sayfalar tek toplu istekle yeniden okunur.
+    depo.kontrol_sn = 0  # her çizimde kontrol (en kötü durum)
+    for _ in range(cizim):
+        depo.hepsini_yukle(app['ANLIK_SAYFALAR'])
+    surum = depo.surum("uyelikler")
+    depo.sh.elle_duzenle("uyelikler", 2, 2, "Elle Düzeltildi")
+    anlik = depo.hepsini_yukle(app['ANLIK_SAYFALAR'])
+    return {'cizim': cizim + 1, 'surum_degisti': depo.surum("uyelikler") != surum,
+            'algilandi': anlik['uyelikler'][0]['ad_soyad'] == "Elle Düzeltildi"}
+
+
+SENARYOLAR = {
+    'kesinti': kesinti,
+    'render': render_verisi,
+    'duzenleme': uye_duzenleme,
+    'rapor': rapor_uretimi,
+    'arama': arama,
+    'degisiklik': degisiklik_takibi,
+}
+
+
+def senaryo_calistir(app, veri, senaryo, gecikme_ms, bellek):
+    kitap = SahteKitap(veri, gecikme_ms=gecikme_ms)
+    depo = SheetsDepo(kitap, ttl_sn=app['VERI_TTL_SN'], kontrol_sn=app['DEGISIKLIK_KONTROL_SN'])
+    app['depo_getir'] = lambda: depo
+    app['uye_tablosu'].clear()
+    # Özet tablosu, program ve arama endeksleri süreç başına bir kez kurulur; ölçüme katılmasın diye önceden kurulur
+    for kaynak in ('ozet_deposu', 'doluluk_endeksi', 'arama_endeksi'):
+        app[kaynak].clear()
+        app[kaynak]()
+    depo.onbellegi_bosalt()
+    kitap.sayac.sifirla()
+    rng = random.Random(7)
+
+    if bellek:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    sonuc = SENARYOLAR[senaryo](app, depo, rng)
+    sure = time.perf_counter() - t0
+    tepe = tracemalloc.get_traced_memory()[1] if bellek else None
+    if bellek:
+        tracemalloc.stop()
+    return {'sure_sn': sure, 'api': kitap.sayac.toplam(), 'api_detay': dict(kitap.sayac.cagrilar),
+            'tepe_bellek_mb': tepe / 2 ** 20 if tepe is not None else None, 'sonuc': sonuc}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="tenis-yonetim çevrimdışı ölçümleri")
+    ap.add_argument('--uyeler', default='100,1000,5000,20000', help="virgülle ayrılmış kulüp büyüklükleri")
+    ap.add_argument('--yil', type=int, default=2, help="ders geçmişinin kaç yıla yayılacağı")
+    ap.add_argument('--eski-orani', type=float, default=0.1, help="işaretçisi olmayan üye oranı")
+    ap.add_argument('--gecikme-ms', type=float, default=0, help="her API çağrısına eklenecek gecikme")
+    ap.add_argument('--senaryo', default=','.join(SENARYOLAR), help="virgülle ayrılmış senaryolar")
+    ap.add_argument('--bellek-yok', action='store_true', help="tepe bellek ölçümünü atla (süre için daha hızlı)")
+    ap.add_argument('--json', help="sonuçların yazılacağı dosya")
+    args = ap.parse_args()
+
+    logger.set_log_level('error')
+    app = uygulama_yukle()
+    senaryolar = [s.strip() for s in args.senaryo.split(',') if s.strip()]
+
+    sonuclar = []
+    print(f"{'üye':>7} {'senaryo':<10} {'süre (sn)':>10} {'API':>6} {'bellek (MB)':>12}  API detayı")
+    for uye_sayisi in [int(x) for x in args.uyeler.split(',')]:
+        veri = kulup_olustur(uye_sayisi, yil=args.yil, eski_orani=args.eski_orani)
+        for senaryo in senaryolar:
+            # Süre tracemalloc olmadan ölçülür; bellek ayrı bir çalıştırmada
+            olcum = senaryo_calistir(app, veri, senaryo, args.gecikme_ms, bellek=False)
+            if not args.bellek_yok:
+                olcum['tepe_bellek_mb'] = senaryo_calistir(app, veri, senaryo, 0, bellek=True)['tepe_bellek_mb']
+            olcum.update({'uye': uye_sayisi, 'gecmis_satiri': len(veri['ders_gecmisi']) - 1, 'senaryo': senaryo})
+            sonuclar.append(olcum)
+
+            bellek_metni = f"{olcum['tepe_bellek_mb']:.1f}" if olcum['tepe_bellek_mb'] is not None else '-'
+            detay = ", ".join(f"{k}={v}" for k, v in sorted(olcum['api_detay'].items()))
+            print(f"{uye_sayisi:>7} {senaryo:<10} {olcum['sure_sn']:>10.3f} {olcum['api']:>6} {bellek_metni:>12}  {detay}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'zaman': datetime.now().isoformat(timespec='seconds'), 'gecikme_ms': args.gecikme_ms,
+                       'yil': args.yil, 'sonuclar': sonuclar}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
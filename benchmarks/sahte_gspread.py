@@ -0,0 +1,231 @@
+# Ölçümler için bellek içi gspread taklidi: canlı Google Sheets'e hiç gidilmez.
+# Sadece uygulamanın kullandığı Spreadsheet/Worksheet yüzeyi taklit edilir; her çağrı
+# sayılır ve istenirse sabit bir gecikme (ms) eklenir.
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import gspread
+
+
+class SahteSayac:
+    def __init__(self, gecikme_ms=0):
+        self.gecikme_ms = gecikme_ms
+        self.cagrilar = Counter()
+        self._kilit = threading.Lock()
+
+    def kaydet(self, ad):
+        with self._kilit:
+            self.cagrilar[ad] += 1
+        if self.gecikme_ms:
+            time.sleep(self.gecikme_ms / 1000)
+
+    def toplam(self):
+        return sum(self.cagrilar.values())
+
+    def sifirla(self):
+        with self._kilit:
+            self.cagrilar.clear()
+
+
+class SahteHucre:
+    def __init__(self, satir, sutun, deger):
+        self.row = satir
+        self.col = sutun
+        self.value = deger
+
+
+class SahteSayfa:
+    def __init__(self, kitap, baslik, satirlar=None):
+        self._kitap = kitap
+        self.title = baslik
+        self.id = zlib.crc32(baslik.encode())
+        self._satirlar = [list(r) for r in (satirlar or [])]
+        self._sutun_sayisi = max((len(r) for r in self._satirlar), default=26)
+
+    def _kaydet(self, ad):
+        self._kitap.sayac.kaydet(ad)
+
+    def _degisti(self, ad):
+        self._kaydet(ad)
+        self._kitap.degistir()
+
+    def _degerler(self):
+        # Sheets her değeri metin olarak döndürür
+        return [['' if v is None else str(v) for v in r] for r in self._satirlar]
+
+    def _yaz(self, satir, sutun, deger):
+        while len(self._satirlar) < satir:
+            self._satirlar.append([])
+        r = self._satirlar[satir - 1]
+        while len(r) < sutun:
+            r.append('')
+        r[sutun - 1] = deger
+        self._sutun_sayisi = max(self._sutun_sayisi, sutun)
+
+    @property
+    def col_count(self):
+        return self._sutun_sayisi
+
+    def add_cols(self, adet):
+        self._degisti('add_cols')
+        self._sutun_sayisi += adet
+
+    # --- Okumalar ---
+    def get_all_values(self):
+        self._kaydet('get_all_values')
+        return self._degerler()
+
+    def get_all_records(self):
+        self._kaydet('get_all_records')
+        degerler = gspread.utils.fill_gaps(self._degerler() or [[]])
+        satirlar = [gspread.utils.numericise_all(r) for r in degerler[1:]]
+        return gspread.utils.to_records(degerler[0], satirlar)
+
+    def batch_get(self, araliklar, **kwargs):
+        # "A5" tek hücre, "A2:A" sütunun sonuna kadar; her aralık satır listesi olarak döner
+        self._kaydet('batch_get')
+        degerler = self._degerler()
+        yanit = []
+        for aralik in araliklar:
+            bas, _, son = aralik.partition(':')
+            satir, sutun = gspread.utils.a1_to_rowcol(bas)
+            bitis = len(degerler) if son and not any(c.isdigit() for c in son) else satir
+            yanit.append([r[sutun - 1:sutun] for r in degerler[satir - 1:bitis]])
+        return yanit
+
+    def row_values(self, satir):
+        self._kaydet('row_values')
+        degerler = self._degerler()
+        return degerler[satir - 1] if satir <= len(degerler) else []
+
+    def cell(self, satir, sutun):
+        self._kaydet('cell')
+        degerler = self._degerler()
+        deger = degerler[satir - 1][sutun - 1] if satir <= len(degerler) and sutun <= len(degerler[satir - 1]) else ''
+        return SahteHucre(satir, sutun, deger)
+
+    def find(self, sorgu, in_column=None):
+        self._kaydet('find')
+        for i, r in enumerate(self._degerler(), start=1):
+            for j, v in enumerate(r, start=1):
+                if (in_column is None or in_column == j) and v == str(sorgu):
+                    return SahteHucre(i, j, v)
+        return None
+
+    # --- Yazımlar ---
+    def append_row(self, satir, **kwargs):
+        self._degisti('append_row')
+        self._satirlar.append(list(satir))
+        return self._ekleme_yaniti(len(self._satirlar), len(self._satirlar))
+
+    def append_rows(self, satirlar, **kwargs):
+        self._degisti('append_rows')
+        ilk = len(self._satirlar) + 1
+        self._satirlar.extend(list(r) for r in satirlar)
+        return self._ekleme_yaniti(ilk, len(self._satirlar))
+
+    def _ekleme_yaniti(self, ilk, son):
+        bitis = gspread.utils.rowcol_to_a1(son, max(self._sutun_sayisi, 1))
+        return {'updates': {'updatedRange': f"{self.title}!A{ilk}:{bitis}"}}
+
+    def update_cell(self, satir, sutun, deger):
+        self._degisti('update_cell')
+        self._yaz(satir, sutun, deger)
+
+    def update(self, degerler, aralik='A1', **kwargs):
+        self._degisti('update')
+        satir0, sutun0 = gspread.utils.a1_to_rowcol(aralik.split(':')[0])
+        for i, r in enumerate(degerler):
+            for j, v in enumerate(r):
+                self._yaz(satir0 + i, sutun0 + j, v)
+
+    def batch_update(self, veri, **kwargs):
+        self._degisti('batch_update')
+        for parca in veri:
+            satir0, sutun0 = gspread.utils.a1_to_rowcol(parca['range'].split(':')[0])
+            for i, r in enumerate(parca['values']):
+                for j, v in enumerate(r):
+                    self._yaz(satir0 + i, sutun0 + j, v)
+
+    def delete_rows(self, baslangic, bitis=None):
+        self._degisti('delete_rows')
+        del self._satirlar[baslangic - 1:(bitis or baslangic)]
+
+    def clear(self):
+        self._degisti('clear')
+        self._satirlar = []
+
+    def batch_clear(self, araliklar):
+        # Sadece "A5:Z" gibi sona kadar giden aralıklar: o satırdan sonrası silinir
+        self._degisti('batch_clear')
+        for aralik in araliklar:
+            satir, _ = gspread.utils.a1_to_rowcol(aralik.split(':')[0])
+            del self._satirlar[satir - 1:]
+
+
+class SahteKitap:
+    def __init__(self, sayfalar=None, gecikme_ms=0):
+        self.sayac = SahteSayac(gecikme_ms)
+        self._sayfalar = {ad: SahteSayfa(self, ad, satirlar) for ad, satirlar in (sayfalar or {}).items()}
+        self._degisme_zamani = datetime.now(timezone.utc)
+
+    def degistir(self):
+        # Her yazım Drive'daki değişme zamanını (modifiedTime) o ana ilerletir; art arda yazımlar da farklı olsun
+        self._degisme_zamani = max(datetime.now(timezone.utc), self._degisme_zamani + timedelta(microseconds=1))
+
+    def get_lastUpdateTime(self):
+        self.sayac.kaydet('get_lastUpdateTime')
+        return self._degisme_zamani.isoformat(timespec='microseconds').replace('+00:00', 'Z')
+
+    def elle_duzenle(self, baslik, satir, sutun, deger):
+        # Kullanıcının Sheets arayüzünden yaptığı düzenleme: API çağrısı sayılmaz
+        self._sayfalar[baslik]._yaz(satir, sutun, deger)
+        self.degistir()
+
+    def batch_update(self, govde):
+        # spreadsheets.batchUpdate: sadece appendCells ve updateCells (değerler). Tek istek sayılır.
+        self.sayac.kaydet('batch_update')
+        sayfalar = {w.id: w for w in self._sayfalar.values()}
+
+        def deger(hucre):
+            return next(iter(hucre.get('userEnteredValue', {'': ''}).values()))
+
+        for istek in govde['requests']:
+            if 'appendCells' in istek:
+                parca = istek['appendCells']
+                sayfalar[parca['sheetId']]._satirlar.extend([deger(h) for h in r['values']] for r in parca['rows'])
+            else:
+                parca = istek['updateCells']
+                wks, bas = sayfalar[parca['start']['sheetId']], parca['start']
+                for i, r in enumerate(parca['rows']):
+                    for j, h in enumerate(r['values']):
+                        wks._yaz(bas['rowIndex'] + i + 1, bas['columnIndex'] + j + 1, deger(h))
+        self.degistir()
+
+    def worksheet(self, baslik):
+        self.sayac.kaydet('worksheet')
+        if baslik not in self._sayfalar:
+            raise gspread.WorksheetNotFound(baslik)
+        return self._sayfalar[baslik]
+
+    def worksheets(self):
+        self.sayac.kaydet('worksheets')
+        return list(self._sayfalar.values())
+
+    def add_worksheet(self, title, rows, cols):
+        self.sayac.kaydet('add_worksheet')
+        self.degistir()
+        self._sayfalar[title] = SahteSayfa(self, title)
+        return self._sayfalar[title]
+
+    def values_batch_get(self, ranges, **kwargs):
+        # Tek istekte birden çok sayfa; aralıklar "'sayfa adı'" biçiminde gelir
+        self.sayac.kaydet('values_batch_get')
+        yanit = []
+        for aralik in ranges:
+            ad = aralik.split('!')[0].strip("'")
+            yanit.append({'range': aralik, 'values': self._sayfalar[ad]._degerler()})
+        return {'valueRanges': yanit}
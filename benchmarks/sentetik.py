@@ -0,0 +1,70 @@
+# Sentetik kulüp verisi: istenen sayıda üye ve yıllara yayılan ders geçmişi.
+# Aynı tohum hep aynı kulübü üretir, böylece ölçümler karşılaştırılabilir.
+import random
+from datetime import date, timedelta
+
+from tenis.depolama import ISLENEN_SUTUNU, SAYFA_SUTUNLARI, UYE_SUTUNLARI
+
+GUNLER = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar']
+ADLAR = ['Ahmet', 'Ayşe', 'Mehmet', 'Zeynep', 'Can', 'Elif', 'Murat', 'Şule', 'İbrahim', 'Gül']
+SOYADLAR = ['Yılmaz', 'Kaya', 'Demir', 'Çelik', 'Şahin', 'Öztürk', 'Aydın', 'Arslan', 'Doğan', 'Işık']
+
+
+def kulup_olustur(uye_sayisi, yil=2, eski_orani=0.1, tohum=42, bugun=None):
+    # Sayfa adı -> [başlık satırı, satırlar...] (Sheets'teki görünümün aynısı)
+    rng = random.Random(tohum)
+    bugun = bugun or date.today()
+    gun_sayisi = 365 * yil
+    tatiller = sorted({str(bugun - timedelta(days=rng.randint(0, gun_sayisi))) for _ in range(8 * yil)})
+
+    uyeler, gecmis = [], []
+    for i in range(uye_sayisi):
+        uye_id = 1_000_000 + i
+        gunler = rng.sample(GUNLER, rng.choice([1, 2, 2, 3]))
+        gun_nolari = {GUNLER.index(g) for g in gunler}
+        cocuk = rng.random() < 0.35
+
+        # Üye geçmişte bir gün katılmış, son paketi bugüne yakın başlamış olabilir
+        katilim = bugun - timedelta(days=rng.randint(0, gun_sayisi))
+        bas = max(katilim, bugun - timedelta(days=rng.randint(0, 60)))
+        bitis = bas + timedelta(days=30)
+        hak = rng.choice([4, 8, 12, 16])
+
+        # Katılımdan bu paketin başına kadar haftalık dersler (geçmiş sayfası)
+        t = katilim
+        while t < bas:
+            if t.weekday() in gun_nolari:
+                gecmis.append([uye_id, str(t), 'Otomatik'])
+            t += timedelta(days=1)
+
+        # Üyelerin bir kısmı işaretçisiz (eski kayıt): düşüm geçmiş sayfasına bakmak zorunda
+        eski = rng.random() < eski_orani
+        uye = {
+            'id': uye_id,
+            'ad_soyad': f"{rng.choice(ADLAR)} {rng.choice(SOYADLAR)} {i}",
+            'telefon': f"05{rng.randint(300000000, 599999999)}",
+            'cinsiyet': rng.choice(['Erkek', 'Kadın']),
+            'dogum_tarihi': str(date(rng.randint(2008, 2018) if cocuk else rng.randint(1955, 2005),
+                                     rng.randint(1, 12), rng.randint(1, 28))),
+            'baslangic_tarihi': str(bas),
+            'bitis_tarihi': str(bitis),
+            'toplam_hak': hak,
+            'kalan_hak': hak,
+            'ucret': rng.choice([1500, 2500, 3000, 4500]),
+            'odeme_yontemi': rng.choice(['Nakit', 'Kredi Kartı', 'IBAN']),
+            'gunler': ",".join(gunler),
+            'ders_tipi': rng.choice(['Grup Dersi', 'Özel Ders']),
+            'veli_adi': f"Veli {rng.choice(SOYADLAR)}" if cocuk else '',
+            'durum': 'Aktif',
+            'kategori': 'Çocuk' if cocuk else 'Yetişkin',
+            'saat': f"{rng.randint(7, 22):02d}:00",
+            ISLENEN_SUTUNU: '' if eski else str(max(bas - timedelta(days=1), bugun - timedelta(days=rng.randint(1, 3)))),
+        }
+        uyeler.append([uye[s] for s in UYE_SUTUNLARI])
+
+    return {
+        'uyelikler': [UYE_SUTUNLARI] + uyeler,
+        'ders_gecmisi': [SAYFA_SUTUNLARI['ders_gecmisi']] + gecmis,
+        'tatiller': [SAYFA_SUTUNLARI['tatiller']] + [[t] for t in tatiller],
+        'yoneticiler': [SAYFA_SUTUNLARI['yoneticiler'], ['admin', '1234']],
+    }
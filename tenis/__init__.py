@@ -0,0 +1 @@
+# AHAL TEKE Tenis Kulübü - Streamlit'ten bağımsız alan ve depolama katmanı
@@ -0,0 +1,90 @@
+# Gece işleri için komut satırı (Streamlit olmadan). Depo, uygulamayla aynı ortam değişkenlerinden seçilir:
+#   DEPO=sqlite SQLITE_YOLU=tenis.db python -m tenis dusum --kuru
+#   GOOGLE_JSON='{...}' python -m tenis dusum --tarih 2025-09-14 --isci 4
+#   python -m tenis arsiv
+# Örnek cron satırı (her gece 23:30):
+#   30 23 * * * cd /srv/tenis-yonetim && python -m tenis dusum --json >> dusum.log
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+from tenis.depolama import SheetsDepo, SqliteDepo
+from tenis.islemler import PARCA_BOYUTU, dusum_yap, gecmisi_arsivle
+
+SHEETS_KAPSAMI = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+
+
+def depo_ac():
+    if os.environ.get("DEPO", "sheets") == "sqlite":
+        return SqliteDepo(os.environ.get("SQLITE_YOLU", "tenis.db"))
+
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    if "GOOGLE_JSON" not in os.environ:
+        sys.exit("Hata: GOOGLE_JSON ortam değişkeni yok (veya DEPO=sqlite verin).")
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(json.loads(os.environ["GOOGLE_JSON"]), SHEETS_KAPSAMI)
+    # Komut satırında önbelleğe gerek yok: her okuma tazedir
+    return SheetsDepo(gspread.authorize(creds).open("tenis_db"), ttl_sn=0)
+
+
+def gecmis_tarih(metin):
+    # İleri tarih, henüz yapılmamış dersleri düşer ve filigranı ileri taşır: o güne kadarki çalışmalar boşa gider
+    tarih = date.fromisoformat(metin)
+    if tarih > date.today():
+        raise argparse.ArgumentTypeError(f"{metin} ileri bir tarih (en fazla bugün: {date.today()})")
+    return tarih
+
+
+def dusum(args):
+    sonuc = dusum_yap(depo_ac(), bugun=args.tarih, kuru=args.kuru, isci=args.isci, parca_boyutu=args.parca)
+    if args.json:
+        sonuc = {k: v for k, v in sonuc.items() if k != 'ozet_satirlari'}
+        print(json.dumps(sonuc, ensure_ascii=False, default=str))
+        return
+
+    fiil = "yazılacak" if sonuc['kuru'] else "yazıldı"
+    print(f"Düşüm {sonuc['tarih']}{' (kuru çalıştırma)' if sonuc['kuru'] else ''}: "
+          f"{sonuc['uye']} üye, {sonuc['islenen_uye']} üye incelendi "
+          f"({sonuc['parca']} parça, {sonuc['isci']} işçi, {sonuc['sure']:.2f} sn)")
+    print(f"  ders geçmişi: {sonuc['yazilan_satir']} satır {fiil}")
+    print(f"  üyeler: {sonuc['guncellenen_uye']} üye, {sonuc['yazilan_hucre']} hücre {fiil}")
+    for tarih, adet in sonuc['dersler'].items():
+        print(f"    {tarih}: {adet} ders")
+    if sonuc['hakki_biten']:
+        print(f"  hakkı biten: {', '.join(str(u) for u in sonuc['hakki_biten'])}")
+    if sonuc.get('ozet_hatasi'):
+        print(f"  Özet Hatası: {sonuc['ozet_hatasi']}")
+
+
+def arsiv(args):
+    adet = gecmisi_arsivle(depo_ac(), bugun=args.tarih)
+    print(json.dumps({'arsivlenen': adet}, default=str) if args.json else f"Arşivlenen geçmiş satırı: {adet}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m tenis", description="tenis-yonetim gece işleri")
+    alt = ap.add_subparsers(dest='komut', required=True)
+
+    p = alt.add_parser('dusum', aliases=['deduct'], help="otomatik ders düşümü")
+    p.add_argument('--tarih', '--date', type=gecmis_tarih, default=None,
+                   help="bu güne kadar düş (YYYY-MM-DD, varsayılan bugün)")
+    p.add_argument('--kuru', '--dry-run', action='store_true', help="hiçbir şey yazma, sadece özeti göster")
+    p.add_argument('--isci', '--workers', type=int, default=os.cpu_count() or 1, help="süreç sayısı")
+    p.add_argument('--parca', '--chunk', type=int, default=PARCA_BOYUTU, help="bir işçiye verilen üye sayısı")
+    p.add_argument('--json', action='store_true', help="özeti tek satır JSON olarak yaz")
+    p.set_defaults(islev=dusum)
+
+    p = alt.add_parser('arsiv', aliases=['archive'], help="önceki ayların ders geçmişini aylık arşive taşı")
+    p.add_argument('--tarih', '--date', type=gecmis_tarih, default=None)
+    p.add_argument('--json', action='store_true')
+    p.set_defaults(islev=arsiv)
+
+    args = ap.parse_args(argv)
+    args.islev(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+import itertools
+import threading
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+import pandas as pd
+
+from tenis.depolama import tarih_anahtari
+
+# Ön-toplanmış metrikler. "ozetler" tablosunda artış satırları (metrik, dönem, anahtar, değer)
+# olarak tutulur; düşüm/yenileme/kayıt anında eklenir, grafikler sadece toplamları okur.
+#   gelir     : ay (YYYY-MM), anahtar = ödeme yöntemi, değer = TL
+#   ders      : gün (YYYY-MM-DD), işlenen ders sayısı
+#   aktif_uye : hafta başı (YYYY-MM-DD, pazartesi), o hafta en az bir dersi olan üye sayısı
+#   yenileme  : ay (YYYY-MM), paket yenileme sayısı
+METRIKLER = ('gelir', 'ders', 'aktif_uye', 'yenileme')
+
+# Tüm Ozetler nesneleri için tek sayaç: yeniden yüklenen bir depo eski grafik önbelleğine denk gelmez
+_surumler = itertools.count(1)
+
+
+def hafta_basi(gun):
+    return gun - timedelta(days=gun.weekday())
+
+
+def ozet_satiri(metrik, donem, deger, anahtar=''):
+    return {'metrik': metrik, 'donem': str(donem), 'anahtar': str(anahtar), 'deger': int(deger)}
+
+
+def gelir_satirlari(ucret, odeme_yontemi, gun):
+    try:
+        tutar = int(float(ucret or 0))
+    except (TypeError, ValueError):
+        tutar = 0
+    return [ozet_satiri('gelir', str(gun)[:7], tutar, odeme_yontemi or '-')] if tutar else []
+
+
+def ders_satirlari(tarihler):
+    # tarihler: işlenen derslerin "YYYY-MM-DD" listesi
+    return [ozet_satiri('ders', t, n) for t, n in sorted(Counter(tarihler).items())]
+
+
+def aktif_hafta_satirlari(haftalar):
+    # haftalar: yeni aktif olan (üye, hafta) çiftlerinin hafta başları
+    return [ozet_satiri('aktif_uye', h, n) for h, n in sorted(Counter(str(h) for h in haftalar).items())]
+
+
+def ozetleri_birlestir(satirlar):
+    # Aynı (metrik, dönem, anahtar) satırları tek satırda toplanır (toplu işlemlerde daha az satır yazılır)
+    toplam = Counter()
+    for s in satirlar:
+        toplam[(s['metrik'], s['donem'], s['anahtar'])] += s['deger']
+    return [ozet_satiri(m, d, v, a) for (m, d, a), v in toplam.items()]
+
+
+def gecmisten_kur(uyeler, gecmis):
+    # Tablo boşken bir kez çalışır: mevcut paketlerden gelir, ders geçmişinden günlük ders ve
+    # haftalık aktif üye. Yenilemeler geçmişte tutulmadığı için bu andan itibaren sayılır.
+    satirlar = []
+    for u in uyeler:
+        satirlar += gelir_satirlari(u.get('ucret'), u.get('odeme_yontemi'), tarih_anahtari(u.get('baslangic_tarihi')))
+
+    tarihler, ders_gunleri = [], set()
+    for g in gecmis:
+        t = tarih_anahtari(g.get('tarih'))
+        if t:
+            tarihler.append(t)
+            ders_gunleri.add((str(g.get('uye_id')), t))
+    hafta = {t: str(hafta_basi(date.fromisoformat(t))) for t in set(tarihler)}
+    satirlar += ders_satirlari(tarihler)
+    satirlar += aktif_hafta_satirlari(h for _, h in {(u, hafta[t]) for u, t in ders_gunleri})
+    return [s for s in satirlar if s['donem']]
+
+
+class Ozetler:
+    # Artış satırlarının bellekteki toplamı; her eklemede surum değişir (grafik önbelleği anahtarı)
+    def __init__(self, satirlar=()):
+        self._toplamlar = defaultdict(Counter)
+        self._kilit = threading.Lock()
+        self.uygula(satirlar)
+
+    def uygula(self, satirlar):
+        with self._kilit:
+            for s in satirlar:
+                try:
+                    deger = int(float(s.get('deger') or 0))
+                except (TypeError, ValueError):
+                    continue
+                self._toplamlar[s.get('metrik')][(str(s.get('donem')), str(s.get('anahtar', '')))] += deger
+            self.surum = next(_surumler)
+
+    def cerceve(self, metrik):
+        with self._kilit:
+            ogeler = list(self._toplamlar[metrik].items())
+        df = pd.DataFrame([(d, a, v) for (d, a), v in ogeler], columns=['donem', 'anahtar', 'deger'])
+        return df.sort_values('donem', ignore_index=True)
+
+
+def yenileme_orani(yenileme, uye_df):
+    # Ay bazında yüzde: yenileyenler / (yenileyenler + o ay süresi bitip hâlâ yenilememiş olanlar)
+    biten = uye_df.loc[~uye_df['aktif_mi'] & (uye_df['bitis_tarihi'] < pd.Timestamp.now().normalize()), 'bitis_tarihi']
+    biten = biten.dt.strftime('%Y-%m').value_counts().rename('biten')
+    yenileyen = yenileme.groupby('donem')['deger'].sum().rename('yenileyen')
+    oran = yenileyen.to_frame().join(biten, how='outer').fillna(0).astype(int)
+    oran['oran'] = (100 * oran['yenileyen'] / (oran['yenileyen'] + oran['biten'])).round(1)
+    oran = oran.rename_axis('donem').reset_index()
+    # Yenilemeler takip edilmeye başlamadan önceki aylar oranı yanlış düşürmesin
+    return oran[oran['donem'] >= yenileme['donem'].min()] if not yenileme.empty else oran.iloc[:0]
@@ -0,0 +1,212 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Türkçe küçük harf: I -> ı, İ -> i (str.lower "İ"yi "i̇" yapar); ardından aksan katlama,
+# böylece "ŞAHİN", "şahin" ve "sahin" aynı anahtara düşer
+_TR_KUCUK = str.maketrans({'I': 'ı', 'İ': 'i'})
+_ASCII = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+def tr_kucuk(metin):
+    return str(metin).translate(_TR_KUCUK).lower()
+
+
+def katla(metin):
+    return tr_kucuk(metin).translate(_ASCII)
+
+
+def rakamlar(metin):
+    # Telefonlar rakam olarak, baştaki sıfırlar atılarak tutulur (Sheets sayıya çevirince 0 düşer)
+    return "".join(c for c in str(metin) if c.isdigit()).lstrip('0')
+
+
+class AramaEndeksi:
+    # Üye araması için ters endeks (ad_soyad, veli_adi, telefon). Anahtarlar:
+    #   "a^" / "v^" / "t^" + önek : ad, veli adı kelimelerinin ve telefonun tüm önekleri
+    #   "T^" + önek               : Türkçe harfli ad kelimeleri (birebir yazılışa puan)
+    #   "3" + üçlü                 : kelime içi eşleşme için 3'lüler (adaylar sonra doğrulanır)
+    # Her üye sabit bir yuvada durur. Toplu yüklemede postalar doğrudan sıralı numpy dizileri olarak
+    # kurulur; bir anahtar ilk değiştiğinde kümeye çevrilir, sorguda yeniden diziye çevrilip önbelleğe
+    # alınır. Üye değişince guncelle() ile tutulur, sorgu tüm üyeleri taramaz.
+    def __init__(self):
+        self._postalar = {}     # anahtar -> yuva kümesi (değişmiş anahtarlar)
+        self._diziler = {}      # anahtar -> sıralı yuva dizisi
+        self._yuvalar = {}      # uye_id -> yuva
+        self._bos_yuvalar = []
+        self._belgeler = []     # yuva -> (ad, veli, telefon, türkçe ad) veya None
+        self._idler = np.zeros(0, dtype=np.int64)
+        self._ad_sirasi = None  # yuva -> ada göre sıra (sonuçlarda eşit puanlıları dizmek için)
+        self._kilit = threading.RLock()
+        self.surum = 0
+
+    @staticmethod
+    def _anahtarlar(belge):
+        # Tekrarlar olabilir; postalar küme olduğu için zararsız
+        ad, veli, tel, ad_tr = belge
+        anahtarlar = ['t^' + tel[:n] for n in range(1, len(tel) + 1)]
+        for onek, metin in (('a^', ad), ('v^', veli), ('T^', ad_tr)):
+            for kelime in metin.split():
+                anahtarlar += [onek + kelime[:n] for n in range(1, len(kelime) + 1)]
+        for metin in (ad, veli, tel):
+            anahtarlar += ['3' + metin[i:i + 3] for i in range(len(metin) - 2)]
+        return anahtarlar
+
+    def _degistir(self, yuva, belge, ekle):
+        for a in set(self._anahtarlar(belge)):
+            posta = self._postalar.get(a)
+            if posta is None:
+                posta = self._postalar[a] = set(self._diziler.get(a, self._BOS).tolist())
+            if ekle:
+                posta.add(yuva)
+            else:
+                posta.discard(yuva)
+            self._diziler.pop(a, None)
+
+    def guncelle(self, uye_id, kayit):
+        # kayit None ise (silinmiş) endeksten çıkarılır
+        try:
+            uye_id = int(float(uye_id))
+        except (TypeError, ValueError):
+            return
+        with self._kilit:
+            yuva = self._yuvalar.pop(uye_id, None)
+            if yuva is not None:
+                self._degistir(yuva, self._belgeler[yuva], ekle=False)
+                self._belgeler[yuva] = None
+                self._bos_yuvalar.append(yuva)
+            if kayit:
+                self._degistir(self._yerlestir(uye_id, kayit), self._belgeler[self._yuvalar[uye_id]], ekle=True)
+            self._ad_sirasi = None
+            self.surum += 1
+
+    @staticmethod
+    def _belge(kayit):
+        ad = str(kayit.get('ad_soyad') or '')
+        return (katla(ad), katla(kayit.get('veli_adi') or ''), rakamlar(kayit.get('telefon') or ''),
+                " ".join(w for w in tr_kucuk(ad).split() if w != katla(w)))
+
+    def _yerlestir(self, uye_id, kayit):
+        belge = self._belge(kayit)
+        if self._bos_yuvalar:
+            yuva = self._bos_yuvalar.pop()
+            self._belgeler[yuva] = belge
+        else:
+            yuva = len(self._belgeler)
+            self._belgeler.append(belge)
+            if yuva >= len(self._idler):
+                self._idler = np.resize(self._idler, max(16, 2 * len(self._idler)))
+        self._idler[yuva] = uye_id
+        self._yuvalar[uye_id] = yuva
+        return yuva
+
+    def yukle(self, uyeler):
+        # Boş endekse toplu yükleme: (anahtar, yuva) çiftleri tek seferde gruplanıp dizilere dönüşür
+        with self._kilit:
+            if self._yuvalar:
+                for kayit in uyeler:
+                    self.guncelle(kayit.get('id'), kayit)
+                return self
+
+            anahtarlar, yuvalar = [], []
+            for kayit in uyeler:
+                try:
+                    uye_id = int(float(kayit.get('id')))
+                except (TypeError, ValueError):
+                    continue
+                if uye_id in self._yuvalar:
+                    continue
+                yuva = self._yerlestir(uye_id, kayit)
+                k = self._anahtarlar(self._belgeler[yuva])
+                anahtarlar += k
+                yuvalar += [yuva] * len(k)
+
+            if anahtarlar:
+                kodlar, essiz = pd.factorize(pd.Series(anahtarlar, dtype=object))
+                ciftler = np.sort(kodlar.astype(np.int64) * len(self._belgeler) + np.array(yuvalar, dtype=np.int64))
+                ciftler = ciftler[np.r_[True, np.diff(ciftler) != 0]]
+                kodlar, yuvalar = np.divmod(ciftler, len(self._belgeler))
+                sinirlar = np.r_[0, np.flatnonzero(np.diff(kodlar)) + 1, len(kodlar)].tolist()
+                essiz = essiz.tolist()
+                for bas, son in zip(sinirlar[:-1], sinirlar[1:]):
+                    self._diziler[essiz[kodlar[bas]]] = yuvalar[bas:son]
+            self._ad_sirasi = None
+            self.surum += 1
+        return self
+
+    # --- Sorgu ---
+    _BOS = np.zeros(0, dtype=np.int64)
+
+    def _dizi(self, anahtar):
+        dizi = self._diziler.get(anahtar)
+        if dizi is None:
+            posta = self._postalar.get(anahtar)
+            if not posta:
+                return self._BOS
+            dizi = self._diziler[anahtar] = np.sort(np.fromiter(posta, dtype=np.int64, count=len(posta)))
+        return dizi
+
+    def _kelime_ici(self, kelime, onek_maskesi):
+        # Kelimenin başında olmayan eşleşmeler: 3'lülerin kesişimi, önek eşleşmeleri hariç, doğrulanmış
+        if len(kelime) < 3:
+            return self._BOS, self._BOS
+        aday = ~onek_maskesi
+        for i in range(len(kelime) - 2):
+            m = np.zeros(len(aday), dtype=bool)
+            m[self._dizi('3' + kelime[i:i + 3])] = True
+            aday &= m
+        belgeler = self._belgeler
+        ad_ici, diger = [], []
+        for y in np.flatnonzero(aday).tolist():
+            ad, veli, tel = belgeler[y][:3]
+            if kelime in ad:
+                ad_ici.append(y)
+            elif kelime in veli or kelime in tel:
+                diger.append(y)
+        return np.array(ad_ici, dtype=np.int64), np.array(diger, dtype=np.int64)
+
+    def ara(self, sorgu):
+        # Sıralı üye idleri; her kelime ad, veli adı veya telefonda geçmeli.
+        # Puan: adda kelime başı 4, adda kelime içi 2, veli/telefon 1, Türkçe harfleriyle birebir +1.
+        kelimeler = []
+        for tr in tr_kucuk(sorgu).split():
+            k = rakamlar(tr) if tr.isdigit() else tr.translate(_ASCII)
+            if k:
+                kelimeler.append((k, tr))
+        if not kelimeler:
+            return self._BOS
+
+        with self._kilit:
+            n = len(self._belgeler)
+            puan = np.zeros(n, dtype=np.int16)
+            bulunan = np.ones(n, dtype=bool)
+            for k, tr in kelimeler:
+                ad_onek = self._dizi('a^' + k)
+                diger = np.zeros(n, dtype=bool)
+                diger[self._dizi('v^' + k)] = True
+                diger[self._dizi('t^' + k)] = True
+                isabet = diger.copy()
+                isabet[ad_onek] = True
+                ad_ici, diger_ici = self._kelime_ici(k, isabet)
+                isabet[ad_ici] = True
+                isabet[diger_ici] = True
+                bulunan &= isabet
+                if not bulunan.any():
+                    return self._BOS
+
+                diger[diger_ici] = True
+                diger[ad_onek] = False
+                puan[ad_onek] += 4
+                puan[ad_ici] += 2
+                puan += diger
+                if tr != k:
+                    puan[self._dizi('T^' + tr)] += 1
+
+            bulunan = np.flatnonzero(bulunan)
+            if self._ad_sirasi is None:
+                adlar = np.array([b[0] if b else '' for b in self._belgeler], dtype=object)
+                self._ad_sirasi = np.empty(n, dtype=np.int64)
+                self._ad_sirasi[np.argsort(adlar, kind='stable')] = np.arange(n)
+            sira = np.lexsort((self._ad_sirasi[bulunan], -puan[bulunan]))
+            return self._idler[bulunan[sira]]
@@ -0,0 +1,881 @@
+import numbers
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+# Otomatik düşümün her üye için en son işlediği gün (uyelikler tablosundaki sütun)
+ISLENEN_SUTUNU = "son_islenen_tarih"
+
+UYE_SUTUNLARI = [
+    'id', 'ad_soyad', 'telefon', 'cinsiyet', 'dogum_tarihi', 'baslangic_tarihi', 'bitis_tarihi',
+    'toplam_hak', 'kalan_hak', 'ucret', 'odeme_yontemi', 'gunler', 'ders_tipi', 'veli_adi',
+    'durum', 'kategori', 'saat', ISLENEN_SUTUNU
+]
+
+# Tablo/sayfa adı -> sütunlar (Sheets'te başlık satırı, SQLite'ta tablo şeması)
+SAYFA_SUTUNLARI = {
+    "uyelikler": UYE_SUTUNLARI,
+    "ders_gecmisi": ['uye_id', 'tarih', 'islem_tipi'],
+    "tatiller": ['tarih'],
+    "yoneticiler": ['kullanici_adi', 'sifre'],
+    # Grafikler için ön-toplanmış metriklerin artış satırları (bkz. tenis/analitik.py)
+    "ozetler": ['metrik', 'donem', 'anahtar', 'deger'],
+}
+
+# Her tablonun satırını tekil belirleyen sütun
+SATIR_ANAHTARLARI = {"uyelikler": "id", "yoneticiler": "kullanici_adi"}
+
+TAM_SAYI_SUTUNLARI = {'id', 'uye_id', 'toplam_hak', 'kalan_hak', 'ucret', 'deger'}
+
+# Aylık ders geçmişi arşivleri: Sheets'te "ders_gecmisi_2025_09" gibi sayfalar,
+# SQLite'ta tek bir ders_gecmisi_arsiv tablosu
+ARSIV_ONEKI = "ders_gecmisi_"
+
+
+def tarih_anahtari(deger):
+    # "2025-09-14" veya "14.09.2025" -> "2025-09-14"; çözülemezse ""
+    deger = str(deger).strip()
+    if len(deger) == 10 and deger[4] == '-' and deger[7] == '-':
+        return deger
+    if len(deger) == 10 and deger[2] == '.' and deger[5] == '.':
+        return f"{deger[6:]}-{deger[3:5]}-{deger[:2]}"
+    return ""
+
+
+def _hucre_degeri(deger, sayisal_metin=False):
+    # spreadsheets.batchUpdate hücre değeri (ExtendedValue). append_rows (RAW) gibi sayılar sayı, metinler
+    # metin yazılır; sayisal_metin=True ise "12" gibi metinler de sayı olur (USER_ENTERED güncellemeleri gibi)
+    import gspread
+
+    if sayisal_metin and isinstance(deger, str):
+        deger = gspread.utils.numericise(deger)
+    if deger is None or deger == '':
+        return {}
+    if isinstance(deger, bool):
+        return {'userEnteredValue': {'boolValue': deger}}
+    if isinstance(deger, numbers.Number):
+        return {'userEnteredValue': {'numberValue': int(deger) if float(deger).is_integer() else float(deger)}}
+    return {'userEnteredValue': {'stringValue': str(deger)}}
+
+
+class Depo(ABC):
+    # Üyeler, ders geçmişi, tatiller ve yöneticiler için ortak arayüz. Soyut metotların hepsini
+    # gerçeklemeyen bir arka uç, yazımın ortasında değil oluşturulurken hata verir.
+    # Kayıtlar Sheets'teki get_all_records() biçimindedir: sütun adı -> değer sözlükleri.
+    ad = ""
+
+    def __init__(self):
+        self._surumler = {}
+
+    def surum(self, sayfa_adi):
+        # Tablo içeriği değiştikçe artar; türetilmiş çerçeveler için önbellek anahtarı
+        return self._surumler.get(sayfa_adi, 0)
+
+    def _surum_artir(self, sayfa_adi):
+        self._surumler[sayfa_adi] = self._surumler.get(sayfa_adi, 0) + 1
+
+    def dis_surum(self):
+        # Depo dışından (elle veya başka süreçten) yapılan değişiklikler algılandıkça değişir;
+        # bellekte artımlı tutulan yapılar (endeksler, özetler) bu değişince yeniden kurulur
+        return 0
+
+    @abstractmethod
+    def kayitlar(self, sayfa_adi, taze=False):
+        raise NotImplementedError
+
+    @abstractmethod
+    def satirlari_ekle(self, sayfa_adi, kayitlar):
+        raise NotImplementedError
+
+    @abstractmethod
+    def uyeleri_guncelle(self, degisiklikler):
+        # degisiklikler: {uye_id: {sütun adı: yeni değer}}; tek istekte yazılır, hücre sayısı döner
+        raise NotImplementedError
+
+    @abstractmethod
+    def uye_sil(self, uye_id):
+        raise NotImplementedError
+
+    @abstractmethod
+    def sifre_guncelle(self, kadi, yeni_sifre):
+        raise NotImplementedError
+
+    @abstractmethod
+    def sayfayi_degistir(self, sayfa_adi, kayitlar):
+        # Tablonun tüm içeriğini verilen kayıtlarla değiştirir (eşitleme için)
+        raise NotImplementedError
+
+    def toplu_yaz(self, eklemeler, degisiklikler):
+        # Eklemeler ({sayfa adı: kayıtlar}) ve üye güncellemeleri birlikte yazılır; güncellenen hücre sayısı
+        # döner. Arka uçlar bunu tek işlem/istek olarak yapar: ya hepsi yazılır ya hiçbiri (ör. düşümde
+        # ders geçmişi yazılıp işaretçi yazılamazsa sonraki çalıştırma aynı dersleri tekrar düşerdi).
+        for sayfa_adi, kayitlar in eklemeler.items():
+            self.satirlari_ekle(sayfa_adi, kayitlar)
+        return self.uyeleri_guncelle(degisiklikler) if degisiklikler else 0
+
+    def onbellegi_bosalt(self, *sayfa_adlari):
+        pass
+
+    def hepsini_yukle(self, sayfa_adlari, taze=False):
+        # Bir sayfa çizimi boyunca tüm tüketicilere verilecek anlık görüntü: {sayfa adı: kayıtlar}
+        return {ad: self.kayitlar(ad, taze=taze) for ad in sayfa_adlari}
+
+    # --- Alan bazlı kısayollar ---
+    def uyeler(self, taze=False):
+        return self.kayitlar("uyelikler", taze=taze)
+
+    def uye(self, uye_id):
+        for kayit in self.uyeler():
+            if str(kayit.get('id')) == str(uye_id):
+                return kayit
+        return None
+
+    def uye_ekle(self, kayit):
+        self.satirlari_ekle("uyelikler", [kayit])
+
+    def ders_gecmisi(self, taze=False, baslangic=None):
+        # baslangic verilmezse sadece sıcak bölüm (arşivlenmemiş satırlar) döner;
+        # verilirse o günden itibaren sıcak bölüm + çakışan aylık arşivler
+        kayitlar = self.kayitlar("ders_gecmisi", taze=taze)
+        if baslangic is None:
+            return kayitlar
+        return [k for k in kayitlar if tarih_anahtari(k.get('tarih')) >= str(baslangic)]
+
+    @abstractmethod
+    def gecmisi_arsivle(self, sinir):
+        # sinir tarihinden (YYYY-MM-DD) önceki tüm satırları sıcak bölümden aylık arşivlere taşır;
+        # taşınan satır sayısı döner
+        raise NotImplementedError
+
+    @abstractmethod
+    def arsivler(self):
+        # Tüm arşivlenmiş ders geçmişi: {arşiv adı ("ders_gecmisi_2025_09"): kayıtlar}
+        raise NotImplementedError
+
+    @abstractmethod
+    def arsivleri_degistir(self, aylar):
+        # Arşivlerin tamamını verilenlerle değiştirir (eşitleme için); verilmeyen aylar boşalır
+        raise NotImplementedError
+
+    def ders_gecmisi_ekle(self, kayitlar):
+        if kayitlar:
+            self.satirlari_ekle("ders_gecmisi", kayitlar)
+
+    def tatiller(self):
+        return [str(r['tarih']) for r in self.kayitlar("tatiller") if r.get('tarih')]
+
+    def tatil_ekle(self, tarih):
+        self.satirlari_ekle("tatiller", [{'tarih': str(tarih)}])
+
+    def yoneticiler(self):
+        return self.kayitlar("yoneticiler")
+
+    def yonetici_ekle(self, kadi, sifre):
+        self.satirlari_ekle("yoneticiler", [{'kullanici_adi': kadi, 'sifre': sifre}])
+
+
+class SheetsDepo(Depo):
+    # Google Sheets arka ucu: okuma önbelleği, anahtar -> satır indeksi ve toplu yazımlar.
+    # kontrol_sn verilirse önbellek süreyle değil dosyanın Drive'daki değişme zamanıyla (modifiedTime)
+    # geçerlidir: en fazla kontrol_sn saniyede bir tek metadata isteği atılır, sayfalar sadece dosya
+    # değiştiyse yeniden okunur. Değişme zamanı okunamazsa (ör. Drive kapsamı yok) TTL'e dönülür.
+    # gspread metotların içinde yüklenir: giriş ekranı ve SQLite arka ucu onu hiç yüklemez.
+    ad = "Google Sheets (Online)"
+
+    # Okunurken yoksa başlığıyla oluşturulan sayfalar ve boyutları
+    OLUSTURULACAK_SAYFALAR = {"ders_gecmisi": (1000, 3), "tatiller": (100, 1), "ozetler": (1000, 4)}
+
+    # Yazımdan önce bundan fazla satır doğrulanacaksa hücreler tek tek değil, anahtar sütunu bütün okunur
+    DOGRULAMA_SUTUN_ESIGI = 200
+
+    def __init__(self, sh, ttl_sn=300, kontrol_sn=None):
+        super().__init__()
+        self.sh = sh
+        self.ttl_sn = ttl_sn
+        self.kontrol_sn = kontrol_sn
+        self._kontrol_kilidi = threading.Lock()
+        self._kitap_surumu = None   # son görülen değişme zamanı; None ise TTL geçerli
+        self._son_kontrol = None
+        self._son_yazim = None      # kendi son yazımımızın bittiği an (UTC)
+        self._dis_surum = 0
+        self._kilit = threading.RLock()
+        self._wks = {}          # sayfa adı -> Worksheet (metadata isteği bir kez)
+        self._onbellek = {}     # sayfa adı -> (okunma zamanı, kayıtlar)
+        self._basliklar = {}    # sayfa adı -> başlık satırı
+        self._indeksler = {}    # sayfa adı -> {anahtar: satır no}; kayıtlar düşürülse de güncel tutulur
+        self._arsivler = None   # ders_gecmisi_YYYY_MM sayfa adları (sıralı)
+
+    def _sayfa(self, sayfa_adi):
+        import gspread
+
+        with self._kilit:
+            wks = self._wks.get(sayfa_adi)
+        if wks is not None:
+            return wks
+        try:
+            wks = self.sh.worksheet(sayfa_adi)
+        except gspread.WorksheetNotFound:
+            if sayfa_adi not in self.OLUSTURULACAK_SAYFALAR:
+                raise
+            satir, sutun = self.OLUSTURULACAK_SAYFALAR[sayfa_adi]
+            wks = self.sh.add_worksheet(title=sayfa_adi, rows=satir, cols=sutun)
+            wks.append_row(SAYFA_SUTUNLARI[sayfa_adi])
+        with self._kilit:
+            self._wks[sayfa_adi] = wks
+        return wks
+
+    # --- Değişiklik takibi ---
+    def kitap_surumu(self):
+        import gspread
+
+        # Dosyanın son değişme zamanı; türetilmiş veriler için önbellek anahtarı olarak da kullanılabilir.
+        # Önceki kontrolden bu yana değiştiyse (bizim yazımlarımız dışında) tüm önbellek düşürülür.
+        if self.kontrol_sn is None:
+            return None
+        with self._kontrol_kilidi:
+            simdi = time.monotonic()
+            if self._son_kontrol is not None and simdi - self._son_kontrol < self.kontrol_sn:
+                return self._kitap_surumu
+            try:
+                surum = self.sh.get_lastUpdateTime()
+            except gspread.exceptions.APIError as e:
+                if self._son_kontrol is None or self._kitap_surumu is not None:
+                    print(f"Değişiklik kontrolü yapılamadı, TTL kullanılıyor: {e}")
+                surum = None
+            self._son_kontrol = simdi
+            if surum is not None and self._kitap_surumu is not None and surum != self._kitap_surumu \
+                    and not self._kendi_yazimimiz(surum):
+                self.onbellegi_bosalt()
+                with self._kilit:
+                    self._arsivler = None
+                    self._dis_surum += 1
+            self._kitap_surumu = surum
+            return surum
+
+    def _yazildi(self):
+        # Kendi yazımımız da değişme zamanını ilerletir. Yeni zaman ayrıca okunmaz (yazım başına bir Drive
+        # isteği olurdu): yazımın bittiği an not edilir, sonraki zamanlanmış kontrol karşılaştırır.
+        if self.kontrol_sn is not None:
+            self._son_yazim = datetime.now(timezone.utc)
+
+    def _kendi_yazimimiz(self, surum):
+        # Değişme zamanı son yazımımızdan sonra değilse değişiklik bizimdir, önbellek korunur. Son kontrolle
+        # yazımımız arasındaki elle düzenleme sonraki değişikliğe kadar görünmez. Saatler farklıysa en kötü
+        # ihtimalle önbellek gereksiz yere düşer.
+        if self._son_yazim is None:
+            return False
+        try:
+            return datetime.fromisoformat(surum) <= self._son_yazim
+        except (TypeError, ValueError):
+            return False
+
+    def dis_surum(self):
+        return self._dis_surum
+
+    def _gecerli(self, sayfa_adi, simdi):
+        # Kilit altında çağrılır
+        kayit = self._onbellek.get(sayfa_adi)
+        return kayit is not None and (self._kitap_surumu is not None or simdi - kayit[0] < self.ttl_sn)
+
+    def kayitlar(self, sayfa_adi, taze=False):
+        # Dönen liste paylaşılır, üzerinde değişiklik yapılmamalı
+        if not taze:
+            self.kitap_surumu()
+        with self._kilit:
+            if not taze and self._gecerli(sayfa_adi, time.monotonic()):
+                return self._onbellek[sayfa_adi][1]
+
+        kayitlar = self._sayfa(sayfa_adi).get_all_records()
+        with self._kilit:
+            self._onbellege_yaz(sayfa_adi, kayitlar)
+        return kayitlar
+
+    @staticmethod
+    def _kayitlara_cevir(degerler):
+        import gspread
+
+        # get_all_records() ile aynı dönüşüm: başlık satırı anahtar, sayısal metinler sayı
+        degerler = gspread.utils.fill_gaps(degerler or [[]])
+        if degerler == [[]]:
+            return [], []
+        basliklar = degerler[0]
+        satirlar = [gspread.utils.numericise_all(r) for r in degerler[1:]]
+        return basliklar, gspread.utils.to_records(basliklar, satirlar)
+
+    def hepsini_yukle(self, sayfa_adlari, taze=False):
+        import gspread
+
+        # Önbellekte olmayan sayfalar tek values_batch_get isteğiyle çekilir
+        # (worksheet() metadata istekleri de atlanır). Toplu istek başarısız olursa
+        # (ör. sayfa henüz yok) sayfalar thread havuzunda paralel okunur.
+        if not taze:
+            self.kitap_surumu()
+        simdi = time.monotonic()
+        with self._kilit:
+            eksik = [ad for ad in sayfa_adlari if taze or not self._gecerli(ad, simdi)]
+        if eksik:
+            try:
+                yanit = self.sh.values_batch_get([f"'{ad}'" for ad in eksik])
+                with self._kilit:
+                    for ad, aralik in zip(eksik, yanit.get('valueRanges', [])):
+                        basliklar, kayitlar = self._kayitlara_cevir(aralik.get('values'))
+                        self._onbellege_yaz(ad, kayitlar, basliklar)
+            except gspread.exceptions.APIError:
+                with ThreadPoolExecutor(max_workers=len(eksik)) as havuz:
+                    list(havuz.map(lambda ad: self.kayitlar(ad, taze=True), eksik))
+
+        with self._kilit:
+            return {ad: self._onbellek[ad][1] for ad in sayfa_adlari}
+
+    def _onbellege_yaz(self, sayfa_adi, kayitlar, basliklar=None):
+        # Kilit altında çağrılır
+        self._onbellek[sayfa_adi] = (time.monotonic(), kayitlar)
+        self._surum_artir(sayfa_adi)
+        if basliklar or kayitlar:
+            self._basliklar[sayfa_adi] = list(basliklar or kayitlar[0].keys())
+        # Her tam okumada indeks sayfaya göre yeniden kurulur (ücretsiz doğrulama)
+        anahtar = SATIR_ANAHTARLARI.get(sayfa_adi)
+        if anahtar:
+            self._indeksler[sayfa_adi] = {str(k.get(anahtar)): i + 2 for i, k in enumerate(kayitlar)}
+
+    def onbellegi_bosalt(self, *sayfa_adlari):
+        # Sadece yazılan sayfalar düşürülür; isim verilmezse hepsi. Bağlantı korunur.
+        with self._kilit:
+            if not sayfa_adlari:
+                sayfa_adlari = list(self._onbellek)
+                self._onbellek.clear()
+                self._indeksler.clear()
+                self._basliklar.clear()
+            for ad in sayfa_adlari:
+                self._onbellek.pop(ad, None)
+                self._surum_artir(ad)
+
+    # --- Başlıklar ve satır indeksi ---
+    def _baslik_getir(self, sayfa_adi):
+        with self._kilit:
+            basliklar = self._basliklar.get(sayfa_adi)
+        if basliklar is None:
+            basliklar = self._sayfa(sayfa_adi).row_values(1)
+            with self._kilit:
+                self._basliklar[sayfa_adi] = basliklar
+        return basliklar
+
+    def _sutun_no(self, sayfa_adi, sutun):
+        # Başlıkta olmayan sütun sona eklenir (ör. son_islenen_tarih geçişi)
+        basliklar = self._baslik_getir(sayfa_adi)
+        if sutun not in basliklar:
+            wks = self._sayfa(sayfa_adi)
+            if wks.col_count < len(basliklar) + 1:
+                wks.add_cols(1)
+            wks.update_cell(1, len(basliklar) + 1, sutun)
+            with self._kilit:
+                self._basliklar[sayfa_adi] = basliklar = basliklar + [sutun]
+        return basliklar.index(sutun) + 1
+
+    def _satir_bul(self, sayfa_adi, anahtar):
+        with self._kilit:
+            indeks = self._indeksler.get(sayfa_adi)
+        if indeks is None:
+            self.kayitlar(sayfa_adi, taze=True)
+            with self._kilit:
+                indeks = self._indeksler.get(sayfa_adi, {})
+        return indeks.get(str(anahtar))
+
+    def _satir_dogrula(self, sayfa_adi, satir, anahtar):
+        # Tek hücre okuması: indeksteki satırda gerçekten bu anahtar mı var?
+        if satir and str(self._sayfa(sayfa_adi).cell(satir, 1).value) == str(anahtar):
+            return satir
+        # Sayfa elle değiştirilmiş; indeks tazelenip tekrar bakılır
+        self.kayitlar(sayfa_adi, taze=True)
+        return self._satir_bul(sayfa_adi, anahtar)
+
+    def _satirlari_dogrula(self, sayfa_adi, anahtarlar, zorla=False):
+        # Yazmadan önce anahtar -> satır no. Değişiklik takibi çalışıyorsa indekse güvenilir: dışarıdan
+        # yapılan yazım kitap_surumu()'nde indeksi düşürür, sayfa yeniden okunurken indeks yeniden kurulur.
+        # Takip yoksa (veya zorla) anahtar hücreleri tek batch_get ile okunur (çok satırda anahtar sütununun
+        # tamamı); sayfa elle sıralanmış/değiştirilmişse indeks yeniden kurulur, yanlış satıra yazılmaz.
+        self.kitap_surumu()
+        for yeniden_kuruldu in (False, True):
+            satirlar = {}
+            for anahtar in anahtarlar:
+                satir = self._satir_bul(sayfa_adi, anahtar)
+                if satir:
+                    satirlar[str(anahtar)] = satir
+            if yeniden_kuruldu or not satirlar or (self._kitap_surumu is not None and not zorla):
+                return satirlar
+
+            wks = self._sayfa(sayfa_adi)
+            if len(satirlar) > self.DOGRULAMA_SUTUN_ESIGI:
+                sutun = wks.batch_get(["A2:A"])[0]
+                okunan = {i + 2: satir[0] if satir else '' for i, satir in enumerate(sutun)}
+            else:
+                sirali = sorted(set(satirlar.values()))
+                yanit = wks.batch_get([f"A{r}" for r in sirali])
+                okunan = {r: h[0][0] if h and h[0] else '' for r, h in zip(sirali, yanit)}
+            if all(str(okunan.get(r, '')) == a for a, r in satirlar.items()):
+                return satirlar
+            with self._kilit:
+                self._indeksler.pop(sayfa_adi, None)
+
+    def _satirlar_eklendi(self, sayfa_adi, anahtarlar, yanit):
+        import gspread
+
+        # append yanıtındaki aralıktan ("uyelikler!A12:R13") yeni satır numaraları alınır
+        try:
+            aralik = yanit['updates']['updatedRange'].split('!')[-1].split(':')[0]
+            ilk_satir = gspread.utils.a1_to_rowcol(aralik)[0]
+        except Exception:
+            # Satır bilinmiyorsa indeks düşürülür, ilk aramada yeniden kurulur
+            with self._kilit:
+                self._indeksler.pop(sayfa_adi, None)
+            return
+        with self._kilit:
+            indeks = self._indeksler.get(sayfa_adi)
+            if indeks is not None:
+                for i, anahtar in enumerate(anahtarlar):
+                    indeks[str(anahtar)] = ilk_satir + i
+
+    def _satir_silindi(self, sayfa_adi, satir):
+        # Silinen satırın altındaki tüm satırlar bir yukarı kayar
+        with self._kilit:
+            indeks = self._indeksler.get(sayfa_adi)
+            if indeks is not None:
+                self._indeksler[sayfa_adi] = {
+                    k: (r - 1 if r > satir else r) for k, r in indeks.items() if r != satir
+                }
+
+    # --- Yazımlar ---
+    def uye(self, uye_id):
+        # İndeksteki satır ile önbellekteki kayıt eşleşmezse sayfa bir kez tazelenir
+        for taze in (False, True):
+            kayitlar = self.kayitlar("uyelikler", taze=taze)
+            satir = self._satir_bul("uyelikler", uye_id)
+            if satir and 0 <= satir - 2 < len(kayitlar) and str(kayitlar[satir - 2].get('id')) == str(uye_id):
+                return kayitlar[satir - 2]
+        return None
+
+    def satirlari_ekle(self, sayfa_adi, kayitlar):
+        if not kayitlar:
+            return
+        for sutun in {s for k in kayitlar for s in k}:
+            self._sutun_no(sayfa_adi, sutun)
+        basliklar = self._baslik_getir(sayfa_adi)
+        satirlar = [[k.get(b, '') for b in basliklar] for k in kayitlar]
+
+        yanit = self._sayfa(sayfa_adi).append_rows(satirlar)
+        anahtar = SATIR_ANAHTARLARI.get(sayfa_adi)
+        if anahtar:
+            self._satirlar_eklendi(sayfa_adi, [k.get(anahtar) for k in kayitlar], yanit)
+        self.onbellegi_bosalt(sayfa_adi)
+        self._yazildi()
+
+    def _guncellenecek_hucreler(self, degisiklikler, zorla=False):
+        # [(satır, sütun, değer)]
+        satirlar = self._satirlari_dogrula("uyelikler", [u for u, alanlar in degisiklikler.items() if alanlar],
+                                           zorla)
+        veri = []
+        for uye_id, alanlar in degisiklikler.items():
+            satir = satirlar.get(str(uye_id))
+            if not satir:
+                continue
+            for alan, deger in alanlar.items():
+                veri.append((satir, self._sutun_no("uyelikler", alan), deger))
+        return veri
+
+    def uyeleri_guncelle(self, degisiklikler):
+        import gspread
+
+        def gonder(hucreler):
+            self._sayfa("uyelikler").batch_update(
+                [{'range': gspread.utils.rowcol_to_a1(r, c), 'values': [[d]]} for r, c, d in hucreler],
+                value_input_option='USER_ENTERED')
+
+        veri = self._guncellenecek_hucreler(degisiklikler)
+        if veri:
+            try:
+                gonder(veri)
+            except gspread.exceptions.APIError:
+                # İndeks bayat olabilir (ör. satırlar dışarıdan silindi): satırlar okunarak doğrulanır, bir kez
+                # daha denenir
+                veri = self._guncellenecek_hucreler(degisiklikler, zorla=True)
+                gonder(veri)
+            self._onbellegi_yamala("uyelikler", degisiklikler)
+            self._yazildi()
+        return len(veri)
+
+    def toplu_yaz(self, eklemeler, degisiklikler):
+        import gspread
+
+        # Eklemeler (appendCells) ve hücre güncellemeleri (updateCells) tek spreadsheets.batchUpdate isteğinde
+        # gider; istek ya tamamen uygulanır ya hiç. Anahtarlı sayfalara (üyelikler) ekleme, satır indeksi
+        # append yanıtından kurulduğu için ayrı yazılır.
+        eklemeler = {ad: kayitlar for ad, kayitlar in eklemeler.items() if kayitlar}
+        for ad in [ad for ad in eklemeler if ad in SATIR_ANAHTARLARI]:
+            self.satirlari_ekle(ad, eklemeler.pop(ad))
+        if not eklemeler:
+            return self.uyeleri_guncelle(degisiklikler) if degisiklikler else 0
+
+        ekleme_istekleri = []
+        for ad, kayitlar in eklemeler.items():
+            for sutun in {s for k in kayitlar for s in k}:
+                self._sutun_no(ad, sutun)
+            basliklar = self._baslik_getir(ad)
+            ekleme_istekleri.append({'appendCells': {
+                'sheetId': self._sayfa(ad).id, 'fields': 'userEnteredValue',
+                'rows': [{'values': [_hucre_degeri(k.get(b, '')) for b in basliklar]} for k in kayitlar],
+            }})
+
+        def gonder(hucreler):
+            sayfa_no = self._sayfa("uyelikler").id
+            self.sh.batch_update({'requests': ekleme_istekleri + [{'updateCells': {
+                'start': {'sheetId': sayfa_no, 'rowIndex': r - 1, 'columnIndex': c - 1},
+                'rows': [{'values': [_hucre_degeri(d, sayisal_metin=True)]}], 'fields': 'userEnteredValue',
+            }} for r, c, d in hucreler]})
+
+        veri = self._guncellenecek_hucreler(degisiklikler) if degisiklikler else []
+        try:
+            gonder(veri)
+        except gspread.exceptions.APIError:
+            if not veri:
+                raise
+            veri = self._guncellenecek_hucreler(degisiklikler, zorla=True)
+            gonder(veri)
+        self.onbellegi_bosalt(*eklemeler)
+        if veri:
+            self._onbellegi_yamala("uyelikler", degisiklikler)
+        self._yazildi()
+        return len(veri)
+
+    def _onbellegi_yamala(self, sayfa_adi, degisiklikler):
+        import gspread
+
+        # Yazılan hücreler önbellekteki kayıtlara da işlenir; sayfa yeniden indirilmez.
+        # Liste paylaşıldığı için değiştirilmez, değişen satırların kopyasıyla yenisi kurulur.
+        anahtar = SATIR_ANAHTARLARI[sayfa_adi]
+        with self._kilit:
+            kayit = self._onbellek.get(sayfa_adi)
+            indeks = self._indeksler.get(sayfa_adi)
+            if kayit and indeks is not None:
+                zaman, kayitlar = kayit
+                yeni = list(kayitlar)
+                for k, alanlar in degisiklikler.items():
+                    satir = indeks.get(str(k))
+                    if not satir or not 0 <= satir - 2 < len(yeni) or str(yeni[satir - 2].get(anahtar)) != str(k):
+                        break
+                    yeni[satir - 2] = dict(yeni[satir - 2], **{
+                        a: gspread.utils.numericise(d) if isinstance(d, str) else d for a, d in alanlar.items()
+                    })
+                else:
+                    self._onbellek[sayfa_adi] = (zaman, yeni)
+                    self._surum_artir(sayfa_adi)
+                    return
+        self.onbellegi_bosalt(sayfa_adi)
+
+    def uye_sil(self, uye_id):
+        # Silme geri alınamaz: satır önce tek hücre okumasıyla doğrulanır
+        satir = self._satir_dogrula("uyelikler", self._satir_bul("uyelikler", uye_id), uye_id)
+        if not satir:
+            return False
+        self._sayfa("uyelikler").delete_rows(satir)
+        self._satir_silindi("uyelikler", satir)
+        self.onbellegi_bosalt("uyelikler")
+        self._yazildi()
+        return True
+
+    def sifre_guncelle(self, kadi, yeni_sifre):
+        satir = self._satirlari_dogrula("yoneticiler", [kadi]).get(str(kadi))
+        if satir:
+            self._sayfa("yoneticiler").update_cell(satir, self._sutun_no("yoneticiler", 'sifre'), yeni_sifre)
+            self.onbellegi_bosalt("yoneticiler")
+            self._yazildi()
+
+    @staticmethod
+    def _uzerine_yaz(wks, basliklar, satirlar):
+        import gspread
+
+        # Önce yeni içerik yazılır, sonra artan kuyruk silinir: yazım başarısız olursa eski veri yerinde kalır
+        wks.update([basliklar] + satirlar, 'A1')
+        son_sutun = gspread.utils.rowcol_to_a1(1, max(wks.col_count, len(basliklar)))[:-1]
+        wks.batch_clear([f"A{len(satirlar) + 2}:{son_sutun}"])
+
+    def sayfayi_degistir(self, sayfa_adi, kayitlar):
+        basliklar = list(SAYFA_SUTUNLARI[sayfa_adi])
+        for sutun in {s for k in kayitlar for s in k}:
+            if sutun not in basliklar:
+                basliklar.append(sutun)
+        self._uzerine_yaz(self._sayfa(sayfa_adi), basliklar, [[k.get(b, '') for b in basliklar] for k in kayitlar])
+        with self._kilit:
+            self._basliklar[sayfa_adi] = basliklar
+            self._indeksler.pop(sayfa_adi, None)
+        self.onbellegi_bosalt(sayfa_adi)
+        self._yazildi()
+
+    # --- Ders geçmişi arşivleri ---
+    def _arsiv_sayfalari(self):
+        # Arşiv sayfası adları bir kez listelenir, sonra yeni açılanlarla güncel tutulur
+        if self._arsivler is None:
+            arsivler = sorted(w.title for w in self.sh.worksheets() if w.title.startswith(ARSIV_ONEKI))
+            with self._kilit:
+                self._arsivler = arsivler
+        return self._arsivler
+
+    def ders_gecmisi(self, taze=False, baslangic=None):
+        sicak = self.kayitlar("ders_gecmisi", taze=taze)
+        if baslangic is None:
+            return sicak
+
+        # Sadece pencereyle çakışan ay sayfaları tek values_batch_get ile okunur
+        ilk_ay = ARSIV_ONEKI + str(baslangic)[:7].replace('-', '_')
+        arsivler = [ad for ad in self._arsiv_sayfalari() if ad >= ilk_ay]
+        kayitlar = list(sicak)
+        if arsivler:
+            yanit = self.sh.values_batch_get([f"'{ad}'" for ad in arsivler])
+            for aralik in yanit.get('valueRanges', []):
+                kayitlar.extend(self._kayitlara_cevir(aralik.get('values'))[1])
+        return [k for k in kayitlar if tarih_anahtari(k.get('tarih')) >= str(baslangic)]
+
+    def gecmisi_arsivle(self, sinir):
+        sicak, aylar = [], {}
+        for k in self.kayitlar("ders_gecmisi", taze=True):
+            tarih = tarih_anahtari(k.get('tarih'))
+            if tarih and tarih < str(sinir):
+                aylar.setdefault(ARSIV_ONEKI + tarih[:7].replace('-', '_'), []).append(k)
+            else:
+                sicak.append(k)
+        if not aylar:
+            return 0
+
+        # Önce arşive yazılır, sonra sıcak sayfa küçültülür: yarıda kalırsa satır kaybolmaz
+        basliklar = SAYFA_SUTUNLARI["ders_gecmisi"]
+        arsivler = self._arsiv_sayfalari()
+        for ad, kayitlar in sorted(aylar.items()):
+            satirlar = [[k.get(b, '') for b in basliklar] for k in kayitlar]
+            if ad in arsivler:
+                self.sh.worksheet(ad).append_rows(satirlar)
+            else:
+                self._arsiv_ac(ad, satirlar)
+        self.sayfayi_degistir("ders_gecmisi", sicak)
+        return sum(len(k) for k in aylar.values())
+
+    def _arsiv_ac(self, ad, satirlar):
+        basliklar = SAYFA_SUTUNLARI["ders_gecmisi"]
+        wks = self.sh.add_worksheet(title=ad, rows=len(satirlar) + 100, cols=len(basliklar))
+        wks.update([basliklar] + satirlar, 'A1')
+        with self._kilit:
+            self._arsivler = sorted(self._arsiv_sayfalari() + [ad])
+
+    def arsivler(self):
+        # Tüm arşiv sayfaları tek values_batch_get ile
+        adlar = self._arsiv_sayfalari()
+        if not adlar:
+            return {}
+        yanit = self.sh.values_batch_get([f"'{ad}'" for ad in adlar])
+        return {ad: self._kayitlara_cevir(aralik.get('values'))[1]
+                for ad, aralik in zip(adlar, yanit.get('valueRanges', []))}
+
+    def arsivleri_degistir(self, aylar):
+        # Olan sayfaların üzerine yazılır (verilmeyenler başlığa kadar boşalır), olmayanlar açılır
+        basliklar = SAYFA_SUTUNLARI["ders_gecmisi"]
+        mevcut = self._arsiv_sayfalari()
+        for ad in sorted(set(mevcut) | set(aylar)):
+            satirlar = [[k.get(b, '') for b in basliklar] for k in aylar.get(ad, [])]
+            if ad in mevcut:
+                self._uzerine_yaz(self.sh.worksheet(ad), basliklar, satirlar)
+            else:
+                self._arsiv_ac(ad, satirlar)
+        self._yazildi()
+
+
+class SqliteDepo(Depo):
+    # Yerel SQLite arka ucu: çevrimdışı çalışma ve yük testi için
+    ad = "SQLite (Yerel)"
+
+    def __init__(self, yol="tenis.db"):
+        super().__init__()
+        self.yol = yol
+        self._kilit = threading.RLock()
+        # Streamlit oturumları farklı thread'lerde çalışır; bağlantı kilitle paylaşılır
+        self._baglanti = sqlite3.connect(yol, check_same_thread=False)
+        self._baglanti.row_factory = sqlite3.Row
+        self._sema_kur()
+
+    def _sema_kur(self):
+        with self._kilit, self._baglanti:
+            for sayfa_adi, sutunlar in SAYFA_SUTUNLARI.items():
+                tanimlar = []
+                for s in sutunlar:
+                    tip = "INTEGER" if s in TAM_SAYI_SUTUNLARI else "TEXT"
+                    if s == SATIR_ANAHTARLARI.get(sayfa_adi):
+                        tip += " PRIMARY KEY"
+                    tanimlar.append(f'"{s}" {tip}')
+                self._baglanti.execute(f'CREATE TABLE IF NOT EXISTS {sayfa_adi} ({", ".join(tanimlar)})')
+            self._baglanti.execute('CREATE INDEX IF NOT EXISTS ix_gecmis_uye_tarih ON ders_gecmisi (uye_id, tarih)')
+            self._baglanti.execute('CREATE INDEX IF NOT EXISTS ix_gecmis_tarih ON ders_gecmisi (tarih)')
+            self._baglanti.execute('CREATE INDEX IF NOT EXISTS ix_tatiller_tarih ON tatiller (tarih)')
+            # Aylık bölümleme: arşivlenen satırlar ay sütunuyla ayrı tabloda tutulur
+            self._baglanti.execute('CREATE TABLE IF NOT EXISTS ders_gecmisi_arsiv '
+                                   '("uye_id" INTEGER, "tarih" TEXT, "islem_tipi" TEXT, "ay" TEXT)')
+            self._baglanti.execute('CREATE INDEX IF NOT EXISTS ix_arsiv_ay ON ders_gecmisi_arsiv (ay)')
+            self._baglanti.execute('CREATE INDEX IF NOT EXISTS ix_arsiv_uye_tarih ON ders_gecmisi_arsiv (uye_id, tarih)')
+
+    def _sutunlar(self, sayfa_adi):
+        return [r['name'] for r in self._baglanti.execute(f'PRAGMA table_info({sayfa_adi})')]
+
+    def _sutunlari_sagla(self, sayfa_adi, sutunlar):
+        mevcut = self._sutunlar(sayfa_adi)
+        for s in sutunlar:
+            if s not in mevcut:
+                self._baglanti.execute(f'ALTER TABLE {sayfa_adi} ADD COLUMN "{s}" TEXT')
+                mevcut.append(s)
+        return mevcut
+
+    def dis_surum(self):
+        # data_version başka bağlantıların (ör. gece çalışan CLI) yazımlarında değişir, bizimkilerde değil
+        with self._kilit:
+            return self._baglanti.execute('PRAGMA data_version').fetchone()[0]
+
+    def surum(self, sayfa_adi):
+        return (super().surum(sayfa_adi), self.dis_surum())
+
+    def kayitlar(self, sayfa_adi, taze=False):
+        # Boş hücreler Sheets'teki gibi '' döner
+        with self._kilit:
+            satirlar = self._baglanti.execute(f'SELECT * FROM {sayfa_adi} ORDER BY rowid').fetchall()
+        return [{k: ('' if r[k] is None else r[k]) for k in r.keys()} for r in satirlar]
+
+    def uye(self, uye_id):
+        with self._kilit:
+            r = self._baglanti.execute('SELECT * FROM uyelikler WHERE id = ?', (uye_id,)).fetchone()
+        return None if r is None else {k: ('' if r[k] is None else r[k]) for k in r.keys()}
+
+    # _ekle/_guncelle kilit ve açık işlem içinde çağrılır (commit çağıranın with bloğunda)
+    def _ekle(self, sayfa_adi, kayitlar):
+        sutunlar = self._sutunlari_sagla(sayfa_adi, {s for k in kayitlar for s in k})
+        yer = ", ".join("?" * len(sutunlar))
+        ad_listesi = ", ".join(f'"{s}"' for s in sutunlar)
+        self._baglanti.executemany(
+            f'INSERT INTO {sayfa_adi} ({ad_listesi}) VALUES ({yer})',
+            [[None if k.get(s, '') == '' else k.get(s) for s in sutunlar] for k in kayitlar]
+        )
+        self._surum_artir(sayfa_adi)
+
+    def _guncelle(self, degisiklikler):
+        hucre = 0
+        self._sutunlari_sagla("uyelikler", {s for a in degisiklikler.values() for s in a})
+        for uye_id, alanlar in degisiklikler.items():
+            if not alanlar:
+                continue
+            atama = ", ".join(f'"{s}" = ?' for s in alanlar)
+            imlec = self._baglanti.execute(f'UPDATE uyelikler SET {atama} WHERE id = ?',
+                                           [*alanlar.values(), uye_id])
+            if imlec.rowcount:
+                hucre += len(alanlar)
+        self._surum_artir("uyelikler")
+        return hucre
+
+    def satirlari_ekle(self, sayfa_adi, kayitlar):
+        if not kayitlar:
+            return
+        with self._kilit, self._baglanti:
+            self._ekle(sayfa_adi, kayitlar)
+
+    def uyeleri_guncelle(self, degisiklikler):
+        with self._kilit, self._baglanti:
+            return self._guncelle(degisiklikler)
+
+    def toplu_yaz(self, eklemeler, degisiklikler):
+        # Tek işlem: hata olursa hiçbiri yazılmaz
+        with self._kilit, self._baglanti:
+            for sayfa_adi, kayitlar in eklemeler.items():
+                if kayitlar:
+                    self._ekle(sayfa_adi, kayitlar)
+            return self._guncelle(degisiklikler) if degisiklikler else 0
+
+    def uye_sil(self, uye_id):
+        with self._kilit, self._baglanti:
+            self._surum_artir("uyelikler")
+            return self._baglanti.execute('DELETE FROM uyelikler WHERE id = ?', (uye_id,)).rowcount > 0
+
+    def sifre_guncelle(self, kadi, yeni_sifre):
+        with self._kilit, self._baglanti:
+            self._baglanti.execute('UPDATE yoneticiler SET sifre = ? WHERE kullanici_adi = ?', (yeni_sifre, kadi))
+            self._surum_artir("yoneticiler")
+
+    def sayfayi_degistir(self, sayfa_adi, kayitlar):
+        with self._kilit, self._baglanti:
+            # Silme ve ekleme tek işlemde: ekleme başarısız olursa eski içerik geri gelir
+            self._baglanti.execute(f'DELETE FROM {sayfa_adi}')
+            if kayitlar:
+                self._ekle(sayfa_adi, kayitlar)
+            self._surum_artir(sayfa_adi)
+
+    def ders_gecmisi(self, taze=False, baslangic=None):
+        if baslangic is None:
+            return self.kayitlar("ders_gecmisi")
+        # (ay) indeksi sayesinde arşivden sadece pencere okunur. Tarihler Sheets'teki gibi tarih_anahtari ile
+        # süzülür: "14.09.2025" biçimli (Sheets'ten aktarılmış) satırlar da aynı sonucu verir
+        with self._kilit:
+            satirlar = self._baglanti.execute(
+                'SELECT uye_id, tarih, islem_tipi FROM ders_gecmisi '
+                "WHERE tarih >= ? OR substr(tarih, 5, 1) != '-' "
+                'UNION ALL SELECT uye_id, tarih, islem_tipi FROM ders_gecmisi_arsiv WHERE ay >= ?',
+                (str(baslangic), str(baslangic)[:7])
+            ).fetchall()
+        return [dict(r) for r in satirlar if tarih_anahtari(r['tarih']) >= str(baslangic)]
+
+    def gecmisi_arsivle(self, sinir):
+        # SheetsDepo ile aynı kural: tarih anahtarı sınırdan önce olan satırlar, o tarihin ayına taşınır
+        with self._kilit, self._baglanti:
+            satirlar = self._baglanti.execute(
+                'SELECT rowid, uye_id, tarih, islem_tipi FROM ders_gecmisi '
+                "WHERE tarih < ? OR substr(tarih, 5, 1) != '-'",
+                (str(sinir),)
+            ).fetchall()
+            tasinacak = [(r, tarih_anahtari(r['tarih'])) for r in satirlar]
+            tasinacak = [(r, t) for r, t in tasinacak if t and t < str(sinir)]
+            self._baglanti.executemany('INSERT INTO ders_gecmisi_arsiv VALUES (?, ?, ?, ?)',
+                                       [(r['uye_id'], r['tarih'], r['islem_tipi'], t[:7]) for r, t in tasinacak])
+            self._baglanti.executemany('DELETE FROM ders_gecmisi WHERE rowid = ?',
+                                       [(r['rowid'],) for r, _ in tasinacak])
+            self._surum_artir("ders_gecmisi")
+        return len(tasinacak)
+
+    def arsivler(self):
+        with self._kilit:
+            satirlar = self._baglanti.execute(
+                'SELECT uye_id, tarih, islem_tipi, ay FROM ders_gecmisi_arsiv ORDER BY ay, rowid').fetchall()
+        aylar = {}
+        for r in satirlar:
+            aylar.setdefault(ARSIV_ONEKI + r['ay'].replace('-', '_'), []).append(
+                {'uye_id': r['uye_id'], 'tarih': r['tarih'], 'islem_tipi': r['islem_tipi'] or ''})
+        return aylar
+
+    def arsivleri_degistir(self, aylar):
+        with self._kilit, self._baglanti:
+            self._baglanti.execute('DELETE FROM ders_gecmisi_arsiv')
+            self._baglanti.executemany('INSERT INTO ders_gecmisi_arsiv VALUES (?, ?, ?, ?)', [
+                (k.get('uye_id'), k.get('tarih'), k.get('islem_tipi') or None, ad[len(ARSIV_ONEKI):].replace('_', '-'))
+                for ad, kayitlar in aylar.items() for k in kayitlar
+            ])
+            self._surum_artir("ders_gecmisi")
+
+def aktar(kaynak, hedef):
+    import gspread
+
+    # Tüm tabloları kaynaktan hedefe kopyalar (ör. Sheets -> SQLite içe aktarma veya tersi)
+    ozet = {}
+    for sayfa_adi in SAYFA_SUTUNLARI:
+        try:
+            kayitlar = kaynak.kayitlar(sayfa_adi, taze=True)
+        except gspread.WorksheetNotFound:
+            continue
+        hedef.sayfayi_degistir(sayfa_adi, kayitlar)
+        ozet[sayfa_adi] = len(kayitlar)
+    # Aylık ders geçmişi arşivleri de taşınır (yoksa arşivlenmiş geçmiş kaybolur)
+    arsivler = kaynak.arsivler()
+    hedef.arsivleri_degistir(arsivler)
+    ozet['arsiv'] = sum(len(k) for k in arsivler.values())
+    return ozet
@@ -0,0 +1,157 @@
+import codecs
+import importlib.util
+import io
+
+import pandas as pd
+
+from tenis.arama import katla
+from tenis.islemler import GUNLER_MAP, kategori_serisi, tarih_serisi
+from tenis.program import saat_anahtari
+
+# Toplu üye kaydı (sezon başı): CSV/Excel dosyası -> doğrulanmış üye kayıtları. Doğrulama sütun
+# bazında yapılır; hatalı satırlar dosyadaki satır numarasıyla listelenir, geçerliler tek seferde eklenir.
+
+# Dosya başlığı -> üye alanı. Başlıklar büyük/küçük harf ve Türkçe karakter farkı gözetmeden
+# eşleşir; alan adlarının kendisi (ad_soyad, telefon, ...) de kabul edilir.
+BASLIKLAR = {
+    'Ad Soyad': 'ad_soyad', 'Telefon': 'telefon', 'Cinsiyet': 'cinsiyet', 'Doğum Tarihi': 'dogum_tarihi',
+    'Kategori': 'kategori', 'Veli Adı': 'veli_adi', 'Paket Tipi': 'ders_tipi', 'Ders Sayısı': 'toplam_hak',
+    'Ücret': 'ucret', 'Ödeme': 'odeme_yontemi', 'Başlangıç Tarihi': 'baslangic_tarihi',
+    'Bitiş Tarihi': 'bitis_tarihi', 'Günler': 'gunler', 'Saat': 'saat',
+}
+ETIKETLER = {alan: etiket for etiket, alan in BASLIKLAR.items()}
+ZORUNLU = ['ad_soyad', 'toplam_hak', 'gunler', 'saat']
+
+# Seçmeli alanların izin verilen değerleri; boş hücre listedeki ilk değeri alır
+SECENEKLER = {
+    'ders_tipi': ['Grup Dersi', 'Özel Ders'],
+    'odeme_yontemi': ['Nakit', 'IBAN', 'Kredi Kartı'],
+    'cinsiyet': ['', 'Erkek', 'Kadın'],
+    'kategori': ['', 'Yetişkin', 'Çocuk'],
+}
+
+ORNEK_SATIR = ['Ayşe Yılmaz', '05321234567', 'Kadın', '14.03.2015', 'Çocuk', 'Fatma Yılmaz', 'Grup Dersi', '8',
+               '3000', 'Nakit', '', '', 'Salı,Perşembe', '17:00']
+
+_GUNLER = {katla(g): g for g in GUNLER_MAP.values()}
+_GUN_SIRASI = {g: i for i, g in GUNLER_MAP.items()}
+
+
+def dosya_turleri():
+    # Excel okumak için openpyxl gerekir (isteğe bağlı)
+    return ['csv'] + (['xlsx'] if importlib.util.find_spec('openpyxl') else [])
+
+
+def sablon_csv():
+    # Excel'in Türkçe karakterleri doğru açması için UTF-8 BOM ile
+    tablo = pd.DataFrame([ORNEK_SATIR], columns=list(BASLIKLAR))
+    return codecs.BOM_UTF8 + tablo.to_csv(index=False).encode('utf-8')
+
+
+def dosya_oku(dosya, ad):
+    # Tüm hücreler metin olarak okunur (telefonların baştaki sıfırı düşmesin)
+    if ad.lower().endswith('.xlsx'):
+        return pd.read_excel(dosya, dtype=str)
+    ham = dosya.read()
+    try:
+        metin = ham.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        metin = ham.decode('cp1254')  # Türkçe Windows Excel'in CSV'si
+    # Ayırıcı (virgül / noktalı virgül) dosyadan sezilir
+    return pd.read_csv(io.StringIO(metin), dtype=str, sep=None, engine='python', keep_default_na=False)
+
+
+def telefon_serisi(seri):
+    # Rakamlar; sayıya çevrilmiş ("5321234567.0") ve sıfırı düşmüş numaralar düzeltilir
+    tel = seri.astype(str).str.strip().str.replace(r'\.0$', '', regex=True).str.replace(r'\D', '', regex=True)
+    return tel.mask((tel.str.len() == 10) & tel.str.startswith('5'), '0' + tel)
+
+
+def _tarihler(seri):
+    # Excel tarihleri metin olarak "2025-09-01 00:00:00" gelir
+    return tarih_serisi(seri.str[:10])
+
+
+def _gunler(seri):
+    # "pazartesi; carsamba" -> "Pazartesi,Çarşamba"; tanınmayan gün varsa None
+    parcalar = seri.str.split(r'[,;/]').explode().str.strip()
+    parcalar = parcalar[parcalar != '']
+    gunler = parcalar.map(katla).map(_GUNLER)
+    gecersiz = gunler.isna().groupby(level=0).any()
+    birlesik = gunler.dropna().groupby(level=0).agg(lambda g: ",".join(sorted(set(g), key=_GUN_SIRASI.get)))
+    return birlesik.reindex(seri.index).mask(gecersiz.reindex(seri.index, fill_value=False))
+
+
+def dogrula(tablo, mevcut_uyeler, bugun, saatler):
+    # (geçerli kayıtlar, hatalar). Hatalar: 'Satır' (dosyadaki satır no) ve 'Hata' sütunlu tablo.
+    # saatler: programdaki ders saatleri ("07:00", ...); bunların dışındaki saat hata sayılır.
+    # Aynı ad + telefonla zaten kayıtlı olanlar hata sayılır: aynı dosya iki kez yüklenirse tekrar eklenmez.
+    eslesme = {katla(etiket): alan for etiket, alan in BASLIKLAR.items()} | {alan: alan for alan in ETIKETLER}
+    tablo = tablo.rename(columns=lambda s: eslesme.get(katla(str(s).strip()), s))
+    eksik = [ETIKETLER[a] for a in ZORUNLU if a not in tablo.columns]
+    if eksik:
+        return [], pd.DataFrame({'Satır': ['-'], 'Hata': [f"Eksik sütun: {', '.join(eksik)}"]})
+
+    df = pd.DataFrame({alan: tablo[alan].fillna('').astype(str).str.strip() if alan in tablo.columns else ''
+                       for alan in ETIKETLER}, index=tablo.index)
+    df = df[(df != '').any(axis=1)]  # tamamen boş satırlar atlanır
+    hatalar = []
+
+    def hata(maske, mesaj):
+        hatalar.append(pd.Series(mesaj, index=df.index[maske.to_numpy()]))
+
+    hata(df['ad_soyad'] == '', "Ad Soyad boş")
+
+    tel = telefon_serisi(df['telefon'])
+    hata((df['telefon'] != '') & ~tel.str.fullmatch(r'0\d{10}'), "Telefon 11 hane olmalı (05xxxxxxxxx)")
+
+    hak = pd.to_numeric(df['toplam_hak'], errors='coerce')
+    hata(~(hak >= 1) | (hak % 1 != 0), "Ders Sayısı pozitif tam sayı olmalı")
+    ucret = pd.to_numeric(df['ucret'].replace('', '0'), errors='coerce')
+    hata(~(ucret >= 0), "Ücret sayı olmalı")
+
+    secim = {}
+    for alan, degerler in SECENEKLER.items():
+        secim[alan] = df[alan].replace('', degerler[0]).map(katla).map({katla(d): d for d in degerler})
+        hata(secim[alan].isna(), f"{ETIKETLER[alan]} şunlardan biri olmalı: {', '.join(d for d in degerler if d)}")
+
+    bas = _tarihler(df['baslangic_tarihi'].replace('', str(bugun)))
+    hata(bas.isna(), "Başlangıç Tarihi okunamadı (GG.AA.YYYY)")
+    bitis = _tarihler(df['bitis_tarihi'])
+    hata((df['bitis_tarihi'] != '') & bitis.isna(), "Bitiş Tarihi okunamadı (GG.AA.YYYY)")
+    bitis = bitis.fillna(bas + pd.Timedelta(days=30))
+    hata(bitis < bas, "Bitiş Tarihi başlangıçtan önce")
+    dogum = _tarihler(df['dogum_tarihi'])
+    hata((df['dogum_tarihi'] != '') & dogum.isna(), "Doğum Tarihi okunamadı (GG.AA.YYYY)")
+
+    gunler = _gunler(df['gunler'])
+    hata(gunler.isna(), f"Günler geçersiz (ör. {ORNEK_SATIR[12]})")
+    saat = df['saat'].map(saat_anahtari)
+    hata(~saat.isin(saatler), f"Saat geçersiz ({saatler[0]}-{saatler[-1]} arası tam saat olmalı)")
+
+    anahtar = df['ad_soyad'].map(katla) + '|' + tel
+    if mevcut_uyeler:
+        mevcut = pd.DataFrame(mevcut_uyeler, columns=['ad_soyad', 'telefon']).fillna('').astype(str)
+        hata(anahtar.isin(mevcut['ad_soyad'].map(katla) + '|' + telefon_serisi(mevcut['telefon'])),
+             "Zaten kayıtlı (aynı ad ve telefon)")
+    hata(anahtar.duplicated() & (df['ad_soyad'] != ''), "Dosyada tekrar ediyor")
+
+    hatalar = pd.concat(hatalar) if hatalar else pd.Series(dtype=str)
+    gecerli = ~df.index.isin(hatalar.index)
+    hata_tablosu = hatalar.groupby(level=0).agg('; '.join).rename('Hata').rename_axis('Satır').reset_index()
+    hata_tablosu['Satır'] = hata_tablosu['Satır'] + 2  # başlık satırı 1
+
+    kayitlar = pd.DataFrame({
+        'ad_soyad': df['ad_soyad'], 'telefon': tel, 'cinsiyet': secim['cinsiyet'],
+        'dogum_tarihi': dogum.dt.strftime('%Y-%m-%d').fillna(''),
+        'baslangic_tarihi': bas.dt.strftime('%Y-%m-%d'), 'bitis_tarihi': bitis.dt.strftime('%Y-%m-%d'),
+        'toplam_hak': hak, 'kalan_hak': hak, 'ucret': ucret, 'odeme_yontemi': secim['odeme_yontemi'],
+        'gunler': gunler, 'ders_tipi': secim['ders_tipi'], 'veli_adi': df['veli_adi'], 'durum': "Aktif",
+        'kategori': secim['kategori'], 'saat': saat,
+    })[gecerli]
+    if kayitlar.empty:
+        return [], hata_tablosu
+    # Kategori boşsa veli adından türetilir (çocuk/yetişkin)
+    kayitlar['kategori'] = kategori_serisi(kayitlar)
+    kayitlar[['toplam_hak', 'kalan_hak', 'ucret']] = kayitlar[['toplam_hak', 'kalan_hak', 'ucret']].astype(int)
+    return kayitlar.to_dict('records'), hata_tablosu
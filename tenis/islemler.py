@@ -0,0 +1,374 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from tenis.analitik import (aktif_hafta_satirlari, ders_satirlari, gecmisten_kur, gelir_satirlari,
+                            hafta_basi, ozet_satiri, ozetleri_birlestir)
+from tenis.depolama import ISLENEN_SUTUNU
+
+# Üyelik işlemleri (otomatik düşüm, yenileme, kayıt, arşiv) ve üye tablosunun türetilmesi.
+# Streamlit'e bağlı değildir: arayüz de gece çalışan komut satırı da (python -m tenis) bunları çağırır.
+
+GUNLER_MAP = {
+    0: 'Pazartesi', 1: 'Salı', 2: 'Çarşamba',
+    3: 'Perşembe', 4: 'Cuma', 5: 'Cumartesi', 6: 'Pazar'
+}
+
+# Düşümde bir işçiye verilen üye sayısı
+PARCA_BOYUTU = 5000
+
+# Üye id ayırıcısı: süreçteki tüm oturumlar için son verilen id
+_id_kilidi = threading.Lock()
+_son_id = 0
+
+
+# --- Tarih ve gün yardımcıları ---
+def tarih_coz(deger):
+    if not deger: return None
+    for bicim in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(str(deger), bicim).date()
+        except ValueError:
+            pass
+    return None
+
+
+def tarih_serisi(seri):
+    # tarih_coz'un vektörel hali: iki biçim de tek geçişte çözülür
+    seri = seri.astype(str)
+    iso = pd.to_datetime(seri, format="%Y-%m-%d", errors='coerce')
+    return iso.fillna(pd.to_datetime(seri, format="%d.%m.%Y", errors='coerce'))
+
+
+def gun_maskesi(gunler):
+    # "Pazartesi,Çarşamba" -> "1010000" (numpy busday weekmask)
+    secilen_gunler = str(gunler).split(',')
+    return "".join('1' if GUNLER_MAP[g] in secilen_gunler else '0' for g in range(7))
+
+
+# --- Üye tablosu ---
+def yas_serisi(dogum_tarihleri, bugun):
+    # Yaş, yıl/ay/gün farkından vektörel hesaplanır; çözülemeyen tarihler 0
+    dt = dogum_tarihleri
+    if not pd.api.types.is_datetime64_any_dtype(dt):
+        dt = tarih_serisi(dt)
+    dogum_gunu_gelmedi = (dt.dt.month > bugun.month) | ((dt.dt.month == bugun.month) & (dt.dt.day > bugun.day))
+    yas = bugun.year - dt.dt.year - dogum_gunu_gelmedi.astype(int)
+    return yas.fillna(0).astype(int)
+
+
+def kategori_serisi(df):
+    # Kayıtlı kategori geçerliyse o, değilse veli adı girilmişse Çocuk, yoksa Yetişkin
+    bos = pd.Series('', index=df.index)
+    kat = df.get('kategori', bos).fillna('').astype(str).str.strip()
+    veli = df.get('veli_adi', bos).fillna('').astype(str).str.strip()
+    return pd.Series(np.select(
+        [kat.isin(['Çocuk', 'Yetişkin']), ~veli.isin(['', 'nan', 'None'])],
+        [kat, 'Çocuk'],
+        'Yetişkin'
+    ), index=df.index)
+
+
+# Düşük kardinaliteli metin sütunları kategori olarak tutulur
+KATEGORIK_SUTUNLAR = ['cinsiyet', 'ders_tipi', 'odeme_yontemi', 'durum', 'kategori', 'saat',
+                      'kategori_hesaplanan', 'yas_grubu']
+
+
+def uye_tablosu_kur(kayitlar, bugun):
+    # Üye tablosu açık bir şemayla kurulur: tarihler datetime, haklar int16, tekrarlı metinler category
+    if not kayitlar: return pd.DataFrame()
+    df = pd.DataFrame(kayitlar)
+    bugun = pd.Timestamp(bugun)
+
+    df['id'] = pd.to_numeric(df['id'], errors='coerce').fillna(0).astype('int64')
+    for s in ('toplam_hak', 'kalan_hak'):
+        df[s] = pd.to_numeric(df[s], errors='coerce').fillna(0).astype('int16')
+    df['ucret'] = pd.to_numeric(df['ucret'], errors='coerce')
+    for s in ('dogum_tarihi', 'baslangic_tarihi', 'bitis_tarihi'):
+        df[s] = tarih_serisi(df[s])
+
+    df['yas'] = yas_serisi(df['dogum_tarihi'], bugun).astype('int16')
+    df['kategori_hesaplanan'] = kategori_serisi(df)
+    df['yas_grubu'] = np.where(df['kategori_hesaplanan'] == 'Çocuk', 'Çocuk (Junior)', 'Yetişkin')
+    df['aktif_mi'] = (df['bitis_tarihi'] >= bugun) & (df['kalan_hak'] > 0)
+
+    for s in KATEGORIK_SUTUNLAR:
+        if s in df.columns:
+            df[s] = df[s].fillna('').astype(str).astype('category')
+    return df
+
+
+# --- Satır bazlı yazım ---
+def degisti_mi(alan, eski, yeni):
+    if alan.endswith('_tarihi') and tarih_coz(eski) and tarih_coz(eski) == tarih_coz(yeni):
+        return False
+    return str(eski) != str(yeni)
+
+
+def uye_satirini_yaz(depo, uye_id, alanlar, mevcut=None):
+    # alanlar: {sütun adı: yeni değer}. Sadece değişen alanlar depoya tek istekte gönderilir.
+    # Yazılan hücre sayısı döner.
+    if mevcut is None:
+        mevcut = depo.uye(uye_id)
+    if not mevcut:
+        return 0
+
+    degisenler = {alan: deger for alan, deger in alanlar.items()
+                  if alan in mevcut and degisti_mi(alan, mevcut.get(alan, ''), deger)}
+    if not degisenler:
+        return 0
+    return depo.uyeleri_guncelle({uye_id: degisenler})
+
+
+# --- Üyelik işlemleri ---
+def id_ayir(depo, adet=1):
+    # Çakışmasız üye idleri (aynı saniyede veya toplu kayıtta da tekrar etmez): zaman damgasından
+    # başlar, bu süreçte verilen son idden ve depodaki en büyük idden büyüktür
+    global _son_id
+    with _id_kilidi:
+        en_buyuk = pd.to_numeric(pd.Series([u.get('id') for u in depo.uyeler()], dtype=object), errors='coerce').max()
+        bas = max(int(time.time()), _son_id + 1, 0 if pd.isna(en_buyuk) else int(en_buyuk) + 1)
+        _son_id = bas + adet - 1
+    return list(range(bas, bas + adet))
+
+
+def yeni_uye_kaydi(uye_id, ad, tel, cins, dt, bas, bitis, ucret, yontem, gunler_list, ders_tipi, hak_sayisi,
+                   veli_adi, kategori, saat):
+    hak = int(hak_sayisi)
+    # son_islenen_tarih: otomatik düşüm işaretçisi, başlangıçtan bir gün öncesine kurulur
+    return {
+        'id': uye_id, 'ad_soyad': ad, 'telefon': tel, 'cinsiyet': cins, 'dogum_tarihi': str(dt),
+        'baslangic_tarihi': str(bas), 'bitis_tarihi': str(bitis), 'toplam_hak': hak, 'kalan_hak': hak,
+        'ucret': ucret, 'odeme_yontemi': yontem, 'gunler': ",".join(gunler_list), 'ders_tipi': ders_tipi,
+        'veli_adi': veli_adi, 'durum': "Aktif", 'kategori': kategori, 'saat': str(saat),
+        ISLENEN_SUTUNU: str(bas - timedelta(days=1))
+    }
+
+
+def toplu_uye_ekle(depo, kayitlar):
+    # Doğrulanmış kayıtlar (bkz. tenis/ice_aktarim.py) id ve düşüm işaretçisiyle tek toplu eklemede yazılır.
+    # Eklenen kayıtlar ve gelir özet satırları döner.
+    if not kayitlar:
+        return [], []
+    kayitlar = [
+        {'id': uye_id, **k, ISLENEN_SUTUNU: str(date.fromisoformat(k['baslangic_tarihi']) - timedelta(days=1))}
+        for uye_id, k in zip(id_ayir(depo, len(kayitlar)), kayitlar)
+    ]
+    depo.satirlari_ekle("uyelikler", kayitlar)
+    return kayitlar, ozetleri_birlestir(
+        s for k in kayitlar for s in gelir_satirlari(k.get('ucret'), k.get('odeme_yontemi'), k['baslangic_tarihi']))
+
+
+def hak_ekle(depo, uye_id, miktar):
+    # Manuel düşüm/iade; hak sıfırın altına inmez
+    mevcut = depo.uye(uye_id)
+    if not mevcut:
+        return 0
+    return uye_satirini_yaz(depo, uye_id, {'kalan_hak': max(0, int(mevcut['kalan_hak']) + miktar)}, mevcut)
+
+
+def _yenileme_alanlari(mevcut, eklenecek_hak, bitis, bugun):
+    return {
+        'baslangic_tarihi': str(bugun), 'bitis_tarihi': str(bitis or bugun + timedelta(days=30)),
+        'toplam_hak': eklenecek_hak, 'kalan_hak': int(mevcut['kalan_hak']) + eklenecek_hak
+    }
+
+
+def _yenileme_ozeti(mevcut, bugun):
+    # Yenileme ücreti üyenin kayıtlı paket ücreti ve ödeme yöntemiyle sayılır
+    return ([ozet_satiri('yenileme', str(bugun)[:7], 1)]
+            + gelir_satirlari(mevcut.get('ucret'), mevcut.get('odeme_yontemi'), bugun))
+
+
+def uyelik_yenile(depo, uye_id, eklenecek_hak, bitis=None, bugun=None):
+    # Paket yenilenir; üye yoksa None, varsa grafiklere işlenecek özet satırları döner
+    mevcut = depo.uye(uye_id)
+    if not mevcut:
+        return None
+    bugun = bugun or date.today()
+    uye_satirini_yaz(depo, uye_id, _yenileme_alanlari(mevcut, eklenecek_hak, bitis, bugun), mevcut)
+    return _yenileme_ozeti(mevcut, bugun)
+
+
+def toplu_yenile(depo, yenilemeler, bugun=None):
+    # yenilemeler: {uye_id: (eklenecek hak, yeni bitiş veya None)}. Tüm üyeler tek toplu güncellemeyle
+    # yazılır; yenilenen idler ve birleştirilmiş özet satırları döner.
+    bugun = bugun or date.today()
+    uyeler = {str(u.get('id')): u for u in depo.uyeler()}
+    degisiklikler, satirlar = {}, []
+    for uye_id, (eklenecek_hak, bitis) in yenilemeler.items():
+        mevcut = uyeler.get(str(uye_id))
+        if not mevcut:
+            continue
+        alanlar = _yenileme_alanlari(mevcut, eklenecek_hak, bitis, bugun)
+        degisiklikler[uye_id] = {a: d for a, d in alanlar.items()
+                                 if a in mevcut and degisti_mi(a, mevcut.get(a, ''), d)}
+        satirlar += _yenileme_ozeti(mevcut, bugun)
+    if any(degisiklikler.values()):
+        depo.uyeleri_guncelle({u: a for u, a in degisiklikler.items() if a})
+    return list(degisiklikler), ozetleri_birlestir(satirlar)
+
+
+def gecmisi_arsivle(depo, bugun=None):
+    # Bu aydan önceki tüm ders geçmişi, üyenin durumuna bakılmadan aylık arşive taşınır; sıcak bölümde
+    # sadece bu ayın satırları kalır. Düşüm ve özetler geçmişi arşivler dahil okuduğu için etkilenmez.
+    bugun = bugun or date.today()
+    return depo.gecmisi_arsivle(bugun.replace(day=1))
+
+
+def ozetleri_hazirla(depo):
+    # Özet tablosunun satırları; tablo boşsa ders geçmişinden bir kez doldurulur.
+    # Yeni özetler eklenmeden önce çağrılmalı (yoksa ilk doldurmada aynı dersler iki kez sayılır).
+    satirlar = depo.kayitlar("ozetler")
+    if not satirlar:
+        satirlar = gecmisten_kur(depo.uyeler(), depo.ders_gecmisi(baslangic="0000-00-00"))
+        depo.satirlari_ekle("ozetler", satirlar)
+    return satirlar
+
+
+# --- Otomatik düşüm ---
+def _parca_dusumu(is_paketi):
+    # Bir parça üyenin yazılacak ders tarihleri. Süreç havuzunda çalışır; depoya dokunmaz.
+    # uyeler: (uye_id, kalan, ilk_gun, islenen, maske, beklenen) demetleri
+    # gecmis: işaretçisi olmayan üyeler için uye_id -> zaten işlenmiş tarihler
+    uyeler, tatil_gunleri, bugun_np, gecmis = is_paketi
+    bugun_str = str(bugun_np)
+    gecmis_satirlari, guncellemeler, aktif_haftalar = [], {}, []
+
+    for uye_id, kalan, ilk_gun, islenen, maske, beklenen in uyeler:
+        alanlar = {}
+
+        if beklenen > 0:
+            # Gün gün döngü sadece yazılacak kesin tarihleri üretmek için
+            gunler_np = np.arange(ilk_gun, bugun_np + 1)
+            tarihler = gunler_np[np.is_busday(gunler_np, weekmask=maske, holidays=tatil_gunleri)]
+            t_strler = [str(t) for t in tarihler]
+            onceki = gecmis.get(str(uye_id), ()) if np.isnat(islenen) else ()
+            t_strler = [t for t in t_strler if t not in onceki]
+
+            if t_strler:
+                gecmis_satirlari.extend({'uye_id': uye_id, 'tarih': t, 'islem_tipi': 'Otomatik'} for t in t_strler)
+                alanlar['kalan_hak'] = max(0, int(kalan) - len(t_strler))
+
+                # Haftalık aktif üye: sadece ilk hafta önceki çalıştırmalarda işlenmiş bir dersle örtüşebilir
+                yeni_gunler = np.array(t_strler, dtype='datetime64[D]')
+                haftalar = np.unique(yeni_gunler - (yeni_gunler.astype('int64') + 3) % 7)  # pazartesiler
+                h0, t0 = haftalar[0], yeni_gunler[0]
+                if np.isnat(islenen):
+                    onceden = any(str(g) in onceki for g in np.arange(h0, t0))
+                else:
+                    onceden = np.busday_count(h0, min(t0, islenen + 1), weekmask=maske, holidays=tatil_gunleri) > 0
+                aktif_haftalar.extend(haftalar[1:] if onceden else haftalar)
+
+        if str(islenen) != bugun_str:
+            alanlar[ISLENEN_SUTUNU] = bugun_str
+        if alanlar:
+            guncellemeler[uye_id] = alanlar
+
+    return gecmis_satirlari, guncellemeler, aktif_haftalar
+
+
+def dusum_yap(depo, bugun=None, kuru=False, isci=1, parca_boyutu=PARCA_BOYUTU, ozet_hazir=False):
+    # Son çalıştırmadan bu yana geçen ders günlerini düşer. Üyeler parçalara bölünür; isci > 1 ise
+    # parçalar süreç havuzunda hesaplanır. Yazımlar yine tek seferde yapılır (geçmiş + üye güncellemeleri
+    # tek toplu yazım, ardından özetler). kuru=True ise hiçbir şey yazılmaz, sadece özet döner.
+    t_bas = time.perf_counter()
+    bugun = bugun or date.today()
+    bugun_np = np.datetime64(bugun)
+    sonuc = {'tarih': str(bugun), 'kuru': kuru, 'uye': 0, 'islenen_uye': 0, 'guncellenen_uye': 0,
+             'yazilan_satir': 0, 'yazilan_hucre': 0, 'dersler': {}, 'hakki_biten': [], 'ozet_satirlari': [],
+             'parca': 0, 'isci': 1, 'sure': 0.0}
+
+    tatil_gunleri = np.array(sorted(set(d for d in (tarih_coz(t) for t in depo.tatiller()) if d)),
+                             dtype='datetime64[D]')
+
+    # Düşüm hesabı her zaman güncel üye verisiyle yapılır (okuma önbelleği de tazelenir)
+    uyeler = depo.uyeler(taze=True)
+    sonuc['uye'] = len(uyeler)
+    if not uyeler:
+        sonuc['sure'] = time.perf_counter() - t_bas
+        return sonuc
+
+    # Tüm üye tablosu tek seferde çözülür
+    uye_df = pd.DataFrame(uyeler)
+    kalan = pd.to_numeric(uye_df['kalan_hak'], errors='coerce').to_numpy()
+    baslangic = tarih_serisi(uye_df['baslangic_tarihi']).to_numpy().astype('datetime64[D]')
+    if ISLENEN_SUTUNU in uye_df.columns:
+        islenen = tarih_serisi(uye_df[ISLENEN_SUTUNU]).to_numpy().astype('datetime64[D]')
+    else:
+        islenen = np.full(len(uye_df), np.datetime64('NaT'), dtype='datetime64[D]')
+    maskeler = uye_df['gunler'].astype(str).map(gun_maskesi).to_numpy()
+
+    # Sadece son çalıştırmadan bu yana geçen günlere bakılır
+    ilk_gun = np.where(np.isnat(islenen), baslangic, np.maximum(baslangic, islenen + 1))
+    uygun = (kalan > 0) & ~np.isnat(baslangic) & (maskeler != '0000000') & (ilk_gun <= bugun_np)
+    uygun_idx = np.flatnonzero(uygun)
+
+    # Beklenen ders sayısı: aynı gün maskesine sahip üyeler için tek busday_count çağrısı
+    beklenen = np.zeros(len(uye_df), dtype=np.int64)
+    for maske in np.unique(maskeler[uygun_idx]):
+        idx = uygun_idx[maskeler[uygun_idx] == maske]
+        beklenen[idx] = np.busday_count(ilk_gun[idx], bugun_np + 1, weekmask=maske, holidays=tatil_gunleri)
+
+    # Geçmiş sayfası sadece işaretçisi olmayan (eski) üyeler için okunur
+    # ve sadece onların en erken başlangıcından itibaren (pencereli okuma, arşivler dahil)
+    gecmis = defaultdict(set)
+    eski = (beklenen > 0) & np.isnat(islenen)
+    if np.any(eski):
+        pencere = np.datetime64(hafta_basi(ilk_gun[eski].min().item()))
+        for g in depo.ders_gecmisi(baslangic=pencere):
+            gecmis[str(g['uye_id'])].add(str(g['tarih']))
+
+    # Parçalar: her biri kendi üyeleri ve (eski üyeler için) onların geçmişiyle birlikte gönderilir
+    parcalar = []
+    for bas in range(0, len(uygun_idx), parca_boyutu):
+        idx = uygun_idx[bas:bas + parca_boyutu]
+        parca = [(uyeler[i]['id'], kalan[i], ilk_gun[i], islenen[i], maskeler[i], beklenen[i]) for i in idx.tolist()]
+        parca_gecmisi = {str(p[0]): gecmis[str(p[0])] for p in parca if np.isnat(p[3]) and str(p[0]) in gecmis}
+        parcalar.append((parca, tatil_gunleri, bugun_np, parca_gecmisi))
+
+    isci = max(1, min(isci, len(parcalar)))
+    if isci > 1:
+        with ProcessPoolExecutor(max_workers=isci) as havuz:
+            sonuclar = list(havuz.map(_parca_dusumu, parcalar))
+    else:
+        sonuclar = [_parca_dusumu(p) for p in parcalar]
+
+    # Tüm yazımlar önce toplanır, sonra tek seferde gönderilir (kota dostu)
+    yeni_gecmis_satirlari, uye_guncellemeleri, yeni_aktif_haftalar = [], {}, []
+    for satirlar, guncellemeler, haftalar in sonuclar:
+        yeni_gecmis_satirlari += satirlar
+        uye_guncellemeleri.update(guncellemeler)
+        yeni_aktif_haftalar += haftalar
+    ozet_satirlari = ders_satirlari(s['tarih'] for s in yeni_gecmis_satirlari) + aktif_hafta_satirlari(yeni_aktif_haftalar)
+
+    if kuru:
+        yazilan_hucre = sum(len(a) for a in uye_guncellemeleri.values())
+    else:
+        # Ders geçmişi ve işaretçi/hak güncellemeleri tek yazımda: biri yazılıp diğeri kalamaz, yoksa
+        # sonraki çalıştırma aynı dersleri tekrar düşer
+        yazilan_hucre = depo.toplu_yaz({"ders_gecmisi": yeni_gecmis_satirlari}, uye_guncellemeleri)
+        # Grafik verisi düşümü asla bozmamalı: hata özete yazılır
+        try:
+            if ozet_satirlari and not ozet_hazir:
+                ozetleri_hazirla(depo)
+            if ozet_satirlari:
+                depo.satirlari_ekle("ozetler", ozet_satirlari)
+        except Exception as e:
+            sonuc['ozet_hatasi'] = str(e)
+            ozet_satirlari = []
+
+    sonuc.update({
+        'islenen_uye': len(uygun_idx), 'guncellenen_uye': len(uye_guncellemeleri),
+        'yazilan_satir': len(yeni_gecmis_satirlari), 'yazilan_hucre': yazilan_hucre,
+        'dersler': dict(sorted(Counter(s['tarih'] for s in yeni_gecmis_satirlari).items())),
+        'hakki_biten': [u for u, a in uye_guncellemeleri.items() if a.get('kalan_hak') == 0],
+        'ozet_satirlari': ozet_satirlari, 'parca': len(parcalar), 'isci': isci,
+        'sure': time.perf_counter() - t_bas,
+    })
+    return sonuc
@@ -0,0 +1,446 @@
+import copy
+import json
+import os
+import random
+import threading
+import time
+
+from tenis.depolama import Depo, SATIR_ANAHTARLARI, tarih_anahtari
+
+
+def _bos_durum():
+    # Bekleyen yazımlar; JSON'a olduğu gibi yazılabilir
+    return {
+        'eklemeler': {},        # sayfa adı -> [kayıt, ...]
+        'guncellemeler': {},    # str(uye_id) -> {'id': uye_id, 'alanlar': {sütun: değer}}
+        'silmeler': [],         # [uye_id, ...]
+        'sifreler': {},         # kullanıcı adı -> yeni şifre
+    }
+
+
+def _bos_mu(durum):
+    return not (any(durum['eklemeler'].values()) or durum['guncellemeler'] or durum['silmeler'] or durum['sifreler'])
+
+
+def _derinlik(durum):
+    return (sum(len(k) for k in durum['eklemeler'].values()) + len(durum['guncellemeler'])
+            + len(durum['silmeler']) + len(durum['sifreler']))
+
+
+# --- Birleştirme kuralları (aynı üyeye/hücreye gelen yazımlar tek yazıma iner) ---
+def _ekle(durum, sayfa_adi, kayitlar):
+    durum['eklemeler'].setdefault(sayfa_adi, []).extend(dict(k) for k in kayitlar)
+
+
+def _bekleyen_kayit(durum, sayfa_adi, anahtar):
+    alan = SATIR_ANAHTARLARI[sayfa_adi]
+    for kayit in durum['eklemeler'].get(sayfa_adi, []):
+        if str(kayit.get(alan)) == str(anahtar):
+            return kayit
+    return None
+
+
+def _guncelle(durum, degisiklikler):
+    for uye_id, alanlar in degisiklikler.items():
+        # Henüz eklenmemiş üyenin güncellemesi doğrudan ekleme kaydına işlenir
+        kayit = _bekleyen_kayit(durum, "uyelikler", uye_id)
+        if kayit is not None:
+            kayit.update(alanlar)
+        elif str(uye_id) not in {str(i) for i in durum['silmeler']}:
+            durum['guncellemeler'].setdefault(str(uye_id), {'id': uye_id, 'alanlar': {}})['alanlar'].update(alanlar)
+
+
+def _sil(durum, uye_id):
+    kayit = _bekleyen_kayit(durum, "uyelikler", uye_id)
+    if kayit is not None:
+        durum['eklemeler']["uyelikler"].remove(kayit)
+        return
+    durum['guncellemeler'].pop(str(uye_id), None)
+    if str(uye_id) not in {str(i) for i in durum['silmeler']}:
+        durum['silmeler'].append(uye_id)
+
+
+def _sifre(durum, kadi, yeni_sifre):
+    kayit = _bekleyen_kayit(durum, "yoneticiler", kadi)
+    if kayit is not None:
+        kayit['sifre'] = yeni_sifre
+    else:
+        durum['sifreler'][str(kadi)] = yeni_sifre
+
+
+def _birlestir(eski, yeni):
+    # eski (daha önce kuyruğa girmiş) üzerine yeni yazımlar sırayla uygulanır
+    durum = copy.deepcopy(eski)
+    for sayfa_adi, kayitlar in yeni['eklemeler'].items():
+        _ekle(durum, sayfa_adi, kayitlar)
+    _guncelle(durum, {g['id']: g['alanlar'] for g in yeni['guncellemeler'].values()})
+    for uye_id in yeni['silmeler']:
+        _sil(durum, uye_id)
+    for kadi, sifre in yeni['sifreler'].items():
+        _sifre(durum, kadi, sifre)
+    return durum
+
+
+def _eskileri_ayikla(parkta, gonderilen, kalan):
+    # Park edilmiş (gönderilemeyen) partilerden, daha yeni değeri az önce gönderilmiş alanlar çıkarılır:
+    # tekrar denemede eski kalan_hak/işaretçi yenisinin üzerine yazılmasın. gonderilen: gönderime çıkan parti,
+    # kalan: gönderimden sonra partide kalanlar (hata olduysa gönderilemeyenler)
+    guncellenen = {} if kalan['guncellemeler'] else gonderilen['guncellemeler']
+    silinen = {str(i) for i in gonderilen['silmeler']} - {str(i) for i in kalan['silmeler']}
+    sifreler = set(gonderilen['sifreler']) - set(kalan['sifreler'])
+    for parti in parkta:
+        for anahtar in list(parti['guncellemeler']):
+            alanlar = parti['guncellemeler'][anahtar]['alanlar']
+            for alan in guncellenen.get(anahtar, {}).get('alanlar', ()):
+                alanlar.pop(alan, None)
+            if not alanlar or anahtar in silinen:
+                del parti['guncellemeler'][anahtar]
+        for kadi in sifreler:
+            parti['sifreler'].pop(kadi, None)
+    parkta[:] = [p for p in parkta if not _bos_mu(p)]
+
+
+def tekrar_denenebilir(hata):
+    # 429 (kota) ve 5xx geçicidir; bağlantı/zaman aşımı hataları da tekrar denenir
+    kod = getattr(hata, 'code', None)
+    if not isinstance(kod, int):
+        kod = getattr(getattr(hata, 'response', None), 'status_code', None)
+    if isinstance(kod, int):
+        return kod == 429 or kod >= 500
+    return isinstance(hata, (ConnectionError, TimeoutError, OSError))
+
+
+def _hata_metni(hata):
+    try:
+        return f"{type(hata).__name__}: {hata}"
+    except Exception:
+        return type(hata).__name__
+
+
+class JetonKovasi:
+    # Dakikada `dakikada` istek: kova dolu başlar, saniyede dakikada/60 jeton dolar
+    def __init__(self, dakikada):
+        self.kapasite = max(1, dakikada)
+        self.hiz = self.kapasite / 60
+        self._jeton = float(self.kapasite)
+        self._zaman = time.monotonic()
+        self._kilit = threading.Lock()
+
+    def al(self, adet=1):
+        # Jeton yoksa yeterince dolana kadar bekler
+        while True:
+            with self._kilit:
+                simdi = time.monotonic()
+                self._jeton = min(self.kapasite, self._jeton + (simdi - self._zaman) * self.hiz)
+                self._zaman = simdi
+                if self._jeton >= adet:
+                    self._jeton -= adet
+                    return
+                bekleme = (adet - self._jeton) / self.hiz
+            time.sleep(bekleme)
+
+
+class YazmaKuyrugu(Depo):
+    # Depo önünde arkadan yazma kuyruğu: yazımlar hemen döner, arka plandaki işçi onları
+    # birleştirerek, kota içinde ve geçici hatalarda üstel bekleme ile depoya gönderir.
+    # Okumalar alttaki depodan gelir; henüz gönderilmemiş yazımlar üzerine işlenir.
+    # Bekleyenler `yol` dosyasında tutulur, süreç yeniden başlasa da kaybolmaz.
+    def __init__(self, depo, yol=None, dakikada=60, azami_deneme=6, birlestirme_sn=1.0, bosaltma_sn=30):
+        super().__init__()
+        self.depo = depo
+        self.ad = depo.ad
+        self.yol = yol
+        self.azami_deneme = azami_deneme
+        self.birlestirme_sn = birlestirme_sn    # ilk yazımdan sonra gelenlerin aynı partiye katılma süresi
+        self.bosaltma_sn = bosaltma_sn          # sayfa yeniden yazımlarının kuyruğu en fazla bekleme süresi
+        self._kova = JetonKovasi(dakikada)
+        self._kosul = threading.Condition(threading.RLock())
+        self._bekleyen = _bos_durum()
+        self._islenen = None            # işçinin o an gönderdiği parti
+        self.basarisiz = []             # tekrar denenemeyen / denemesi biten partiler
+        self.son_hata = None
+        self._deneme = 0
+        self._sonraki_deneme = 0
+        self._ilk_bekleyen = 0
+        self._yukle()
+        threading.Thread(target=self._calis, name="yazma-kuyrugu", daemon=True).start()
+
+    # --- Kalıcılık ---
+    def _yukle(self):
+        if not self.yol or not os.path.exists(self.yol):
+            return
+        try:
+            with open(self.yol, encoding='utf-8') as f:
+                veri = json.load(f)
+            self._bekleyen = veri.get('bekleyen') or _bos_durum()
+            self.basarisiz = veri.get('basarisiz') or []
+        except (OSError, ValueError) as e:
+            self.son_hata = f"Kuyruk dosyası okunamadı: {e}"
+
+    def _kaydet(self):
+        # Kilit altında çağrılır; yarım yazılmış dosya kalmasın diye önce geçici dosyaya
+        if not self.yol:
+            return
+        bekleyen = _birlestir(self._islenen, self._bekleyen) if self._islenen else self._bekleyen
+        gecici = self.yol + ".tmp"
+        try:
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump({'bekleyen': bekleyen, 'basarisiz': self.basarisiz}, f, ensure_ascii=False, default=str)
+            os.replace(gecici, self.yol)
+        except OSError as e:
+            self.son_hata = f"Kuyruk dosyası yazılamadı: {e}"
+
+    def _kuyruga_al(self, islem, *args):
+        with self._kosul:
+            if _bos_mu(self._bekleyen):
+                self._ilk_bekleyen = time.monotonic()
+            islem(self._bekleyen, *args)
+            self._kaydet()
+            self._kosul.notify_all()
+
+    # --- İşçi ---
+    def _calis(self):
+        while True:
+            with self._kosul:
+                while True:
+                    bekleme = max(self._sonraki_deneme, self._ilk_bekleyen + self.birlestirme_sn) - time.monotonic()
+                    if _bos_mu(self._bekleyen):
+                        self._kosul.wait()
+                    elif bekleme > 0:
+                        self._kosul.wait(timeout=bekleme)
+                    else:
+                        break
+                self._islenen, self._bekleyen = self._bekleyen, _bos_durum()
+                parti = self._islenen
+                gonderilen = copy.deepcopy(parti) if self.basarisiz else None
+
+            try:
+                self._gonder(parti)
+                hata = None
+            except Exception as e:
+                hata = e
+
+            with self._kosul:
+                if gonderilen is not None:
+                    _eskileri_ayikla(self.basarisiz, gonderilen, self._islenen)
+                if hata is None:
+                    self._deneme = 0
+                    self.son_hata = None
+                    kalan = None
+                else:
+                    self.son_hata = _hata_metni(hata)
+                    self._deneme += 1
+                    if tekrar_denenebilir(hata) and self._deneme <= self.azami_deneme:
+                        # Gönderilemeyenler yeni gelenlerin önüne geri konur
+                        kalan = self._islenen
+                        self._sonraki_deneme = time.monotonic() + min(60, 2 ** self._deneme) + random.random()
+                    else:
+                        self.basarisiz.append(self._islenen)
+                        self._deneme = 0
+                        kalan = None
+                if kalan is not None:
+                    self._bekleyen = _birlestir(kalan, self._bekleyen)
+                self._islenen = None
+                self._surumleri_artir()
+                self._kaydet()
+                self._kosul.notify_all()
+
+    def _gonder(self, parti):
+        # Biten her parça partiden hemen çıkarılır; hata olursa sadece kalanlar tekrar denenir.
+        # Anahtarlı sayfalara (üyelikler) eklemeler ayrı gider, geri kalan eklemeler ve üye güncellemeleri
+        # tek toplu_yaz ile: ör. üyelik yenileme (üye satırı + özet) tek istektir
+        for sayfa_adi in [ad for ad in parti['eklemeler'] if ad in SATIR_ANAHTARLARI]:
+            if parti['eklemeler'][sayfa_adi]:
+                self._kova.al()
+                self.depo.satirlari_ekle(sayfa_adi, parti['eklemeler'][sayfa_adi])
+            with self._kosul:
+                del parti['eklemeler'][sayfa_adi]
+
+        if any(parti['eklemeler'].values()) or parti['guncellemeler']:
+            self._kova.al()
+            self.depo.toplu_yaz({ad: k for ad, k in parti['eklemeler'].items() if k},
+                                {g['id']: g['alanlar'] for g in parti['guncellemeler'].values()})
+        with self._kosul:
+            parti['eklemeler'] = {}
+            parti['guncellemeler'] = {}
+
+        for uye_id in list(parti['silmeler']):
+            self._kova.al(2)    # doğrulama okuması + silme
+            self.depo.uye_sil(uye_id)
+            with self._kosul:
+                parti['silmeler'].remove(uye_id)
+
+        for kadi in list(parti['sifreler']):
+            self._kova.al()
+            self.depo.sifre_guncelle(kadi, parti['sifreler'][kadi])
+            with self._kosul:
+                del parti['sifreler'][kadi]
+
+    def _surumleri_artir(self):
+        for sayfa_adi in ("uyelikler", "ders_gecmisi", "tatiller", "yoneticiler"):
+            self._surum_artir(sayfa_adi)
+
+    # --- Durum ---
+    def derinlik(self):
+        with self._kosul:
+            return _derinlik(self._bekleyen) + (_derinlik(self._islenen) if self._islenen else 0)
+
+    def durum(self):
+        with self._kosul:
+            return {'derinlik': self.derinlik(), 'basarisiz': sum(_derinlik(p) for p in self.basarisiz),
+                    'son_hata': self.son_hata, 'deneme': self._deneme}
+
+    def bosalt_bekle(self, zaman_asimi=None):
+        # Bekleyen yazımlar gönderilene kadar bekler; kuyruk boşaldıysa True
+        bitis = time.monotonic() + zaman_asimi if zaman_asimi is not None else None
+        with self._kosul:
+            while not _bos_mu(self._bekleyen) or self._islenen is not None:
+                kalan = bitis - time.monotonic() if bitis is not None else None
+                if kalan is not None and kalan <= 0:
+                    return False
+                self._kosul.wait(timeout=kalan)
+            return True
+
+    def basarisizlari_tekrar_dene(self):
+        # Partiler eskiden yeniye birleştirilir, bekleyen yazımlar en üste gelir
+        with self._kosul:
+            parkta = _bos_durum()
+            for parti in self.basarisiz:
+                parkta = _birlestir(parkta, parti)
+            self._bekleyen = _birlestir(parkta, self._bekleyen)
+            self.basarisiz = []
+            self._sonraki_deneme = 0
+            self._ilk_bekleyen = time.monotonic()
+            self._kaydet()
+            self._kosul.notify_all()
+
+    # --- Okumalar: alttaki depo + bekleyen yazımlar ---
+    def _bindirme(self):
+        # Gönderilemeyip park edilen partiler de görünür kalır: ekran yazılmamış değeri göstermeye devam eder
+        # (kenar çubuğunda uyarıyla), sonraki hesaplar (ör. düşüm) da onun üzerine yapılır
+        with self._kosul:
+            partiler = [p for p in (*self.basarisiz, self._islenen) if p is not None]
+            if not partiler:
+                return copy.deepcopy(self._bekleyen)
+            bindirme = partiler[0]
+            for parti in partiler[1:] + [self._bekleyen]:
+                bindirme = _birlestir(bindirme, parti)
+            return bindirme
+
+    def _uygula(self, sayfa_adi, kayitlar, bindirme):
+        eklenen = bindirme['eklemeler'].get(sayfa_adi, [])
+        if sayfa_adi == "uyelikler":
+            guncel, silinen = bindirme['guncellemeler'], {str(i) for i in bindirme['silmeler']}
+        elif sayfa_adi == "yoneticiler":
+            guncel = {k: {'alanlar': {'sifre': s}} for k, s in bindirme['sifreler'].items()}
+            silinen = set()
+        else:
+            guncel, silinen = {}, set()
+        if not (eklenen or guncel or silinen):
+            return kayitlar
+
+        anahtar = SATIR_ANAHTARLARI.get(sayfa_adi)
+        sonuc = []
+        for kayit in kayitlar:
+            k = str(kayit.get(anahtar)) if anahtar else None
+            if k in silinen:
+                continue
+            sonuc.append(dict(kayit, **guncel[k]['alanlar']) if k in guncel else kayit)
+        # Alttaki depoya az önce yazılmış olanlar iki kez görünmesin
+        mevcut = {str(k.get(anahtar)) for k in sonuc} if anahtar else set()
+        sonuc.extend(k for k in eklenen if not anahtar or str(k.get(anahtar)) not in mevcut)
+        return sonuc
+
+    def surum(self, sayfa_adi):
+        return (self.depo.surum(sayfa_adi), self._surumler.get(sayfa_adi, 0))
+
+    def dis_surum(self):
+        return self.depo.dis_surum()
+
+    def kayitlar(self, sayfa_adi, taze=False):
+        return self._uygula(sayfa_adi, self.depo.kayitlar(sayfa_adi, taze=taze), self._bindirme())
+
+    def hepsini_yukle(self, sayfa_adlari, taze=False):
+        anlik = self.depo.hepsini_yukle(sayfa_adlari, taze=taze)
+        bindirme = self._bindirme()
+        return {ad: self._uygula(ad, kayitlar, bindirme) for ad, kayitlar in anlik.items()}
+
+    def uye(self, uye_id):
+        bindirme = self._bindirme()
+        if str(uye_id) in {str(i) for i in bindirme['silmeler']}:
+            return None
+        kayit = _bekleyen_kayit(bindirme, "uyelikler", uye_id)
+        if kayit is not None:
+            return kayit
+        kayit = self.depo.uye(uye_id)
+        guncelleme = bindirme['guncellemeler'].get(str(uye_id))
+        return dict(kayit, **guncelleme['alanlar']) if kayit and guncelleme else kayit
+
+    def ders_gecmisi(self, taze=False, baslangic=None):
+        eklenen = self._bindirme()['eklemeler'].get("ders_gecmisi", [])
+        if baslangic is not None:
+            eklenen = [k for k in eklenen if tarih_anahtari(k.get('tarih')) >= str(baslangic)]
+        kayitlar = self.depo.ders_gecmisi(taze=taze, baslangic=baslangic)
+        return kayitlar + eklenen if eklenen else kayitlar
+
+    def onbellegi_bosalt(self, *sayfa_adlari):
+        self.depo.onbellegi_bosalt(*sayfa_adlari)
+        for ad in sayfa_adlari or ("uyelikler", "ders_gecmisi", "tatiller", "yoneticiler"):
+            self._surum_artir(ad)
+
+    # --- Yazımlar: kuyruğa alınır, hemen döner ---
+    def satirlari_ekle(self, sayfa_adi, kayitlar):
+        if kayitlar:
+            self._kuyruga_al(_ekle, sayfa_adi, kayitlar)
+            self._surum_artir(sayfa_adi)
+
+    def uyeleri_guncelle(self, degisiklikler):
+        self._kuyruga_al(_guncelle, degisiklikler)
+        self._surum_artir("uyelikler")
+        return sum(len(a) for a in degisiklikler.values())
+
+    def toplu_yaz(self, eklemeler, degisiklikler):
+        # İkisi aynı partiye girer (araya işçi giremez)
+        def islem(durum):
+            for sayfa_adi, kayitlar in eklemeler.items():
+                if kayitlar:
+                    _ekle(durum, sayfa_adi, kayitlar)
+            _guncelle(durum, degisiklikler)
+        self._kuyruga_al(islem)
+        for sayfa_adi in [*eklemeler, "uyelikler"]:
+            self._surum_artir(sayfa_adi)
+        return sum(len(a) for a in degisiklikler.values())
+
+    def uye_sil(self, uye_id):
+        self._kuyruga_al(_sil, uye_id)
+        self._surum_artir("uyelikler")
+        return True
+
+    def sifre_guncelle(self, kadi, yeni_sifre):
+        self._kuyruga_al(_sifre, kadi, yeni_sifre)
+        self._surum_artir("yoneticiler")
+
+    # Tüm sayfayı yeniden yazan işlemler sıraya girmez: önce kuyruk boşaltılır. Bekleme sınırlıdır
+    # (zamanlanmış kontrolün kilidi altında çalışırlar); kuyruk boşalmazsa yazılmaz.
+    def sayfayi_degistir(self, sayfa_adi, kayitlar):
+        if not self.bosalt_bekle(self.bosaltma_sn):
+            raise TimeoutError(f"Yazma kuyruğu {self.bosaltma_sn} sn içinde boşalmadı, {sayfa_adi} yazılmadı")
+        self.depo.sayfayi_degistir(sayfa_adi, kayitlar)
+        self._surum_artir(sayfa_adi)
+
+    def gecmisi_arsivle(self, sinir):
+        # Kuyruk boşalmadıysa arşiv ertelenir (None)
+        if not self.bosalt_bekle(self.bosaltma_sn):
+            return None
+        tasinan = self.depo.gecmisi_arsivle(sinir)
+        self._surum_artir("ders_gecmisi")
+        return tasinan
+
+    def arsivler(self):
+        return self.depo.arsivler()
+
+    def arsivleri_degistir(self, aylar):
+        if not self.bosalt_bekle(self.bosaltma_sn):
+            raise TimeoutError(f"Yazma kuyruğu {self.bosaltma_sn} sn içinde boşalmadı, arşivler yazılmadı")
+        self.depo.arsivleri_degistir(aylar)
+        self._surum_artir("ders_gecmisi")
@@ -0,0 +1,176 @@
+import json
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Kota hesabında okuma sayılan gspread çağrıları (geri kalanlar yazma)
+OKUMA_CAGRILARI = {
+    'open', 'worksheet', 'worksheets', 'get_all_values', 'get_all_records', 'values_batch_get',
+    'row_values', 'col_values', 'cell', 'find', 'findall', 'get',
+}
+
+
+class Olcum:
+    # Depolama çağrılarının hafif kaydı: tür, sayfa, süre, satır/hücre sayısı ve hangi eylemden geldiği.
+    # Son `kapasite` kayıt bellekte tutulur; dosya verilirse her kayıt JSON satırı olarak eklenir.
+    def __init__(self, kapasite=5000, dosya=None):
+        self._kayitlar = deque(maxlen=kapasite)
+        self._kilit = threading.Lock()
+        self._yerel = threading.local()
+        self._sira = 0
+        self.dosya = dosya
+
+    # --- Eylem etiketi: çağrıyı tetikleyen işlem (iş parçacığına özel yığın) ---
+    @contextmanager
+    def eylem(self, ad):
+        yigin = self._yerel.__dict__.setdefault('yigin', [])
+        yigin.append(ad)
+        try:
+            yield
+        finally:
+            yigin.pop()
+
+    def simdiki_eylem(self):
+        # Etiket yoksa (ör. arka plan yazma kuyruğu) iş parçacığının adı kullanılır
+        return " > ".join(getattr(self._yerel, 'yigin', [])) or threading.current_thread().name
+
+    # --- Kayıt ---
+    def kaydet(self, tur, sayfa, sure, adet=0, hata=None):
+        with self._kilit:
+            self._sira += 1
+            kayit = {
+                'sira': self._sira, 'zaman': time.time(), 'iplik': threading.get_ident(),
+                'eylem': self.simdiki_eylem(), 'tur': tur, 'sayfa': sayfa,
+                'sure_ms': round(sure * 1000, 2), 'adet': adet, 'hata': hata,
+            }
+            self._kayitlar.append(kayit)
+            if self.dosya:
+                try:
+                    with open(self.dosya, 'a', encoding='utf-8') as f:
+                        f.write(self._json_satiri(kayit) + "\n")
+                except OSError:
+                    pass
+        return kayit
+
+    @contextmanager
+    def olc(self, tur, sayfa=''):
+        # with olcum.olc('open', 'tenis_db') as o: ...; o['adet'] = n
+        bilgi = {'adet': 0}
+        t0 = time.perf_counter()
+        hata = None
+        try:
+            yield bilgi
+        except Exception as e:
+            hata = str(getattr(e, 'code', '') or type(e).__name__)
+            raise
+        finally:
+            self.kaydet(tur, sayfa, time.perf_counter() - t0, bilgi['adet'], hata)
+
+    # --- Sorgular ---
+    def isaret(self):
+        # Bir çizimin başı; sonra kayitlar(isaret=...) o çizimin çağrılarını döndürür
+        return self._sira
+
+    def kayitlar(self, isaret=None, saniye=None, iplik=None):
+        sinir = time.time() - saniye if saniye else None
+        with self._kilit:
+            return [
+                k for k in self._kayitlar
+                if (isaret is None or k['sira'] > isaret)
+                and (sinir is None or k['zaman'] >= sinir)
+                and (iplik is None or k['iplik'] == iplik)
+            ]
+
+    @staticmethod
+    def ozet(kayitlar):
+        okuma = sum(1 for k in kayitlar if k['tur'] in OKUMA_CAGRILARI)
+        return {
+            'cagri': len(kayitlar),
+            'okuma': okuma,
+            'yazma': len(kayitlar) - okuma,
+            'sure_ms': round(sum(k['sure_ms'] for k in kayitlar), 1),
+            'adet': sum(k['adet'] for k in kayitlar),
+            'hata': sum(1 for k in kayitlar if k['hata']),
+            'turler': dict(Counter(k['tur'] for k in kayitlar)),
+        }
+
+    def en_yavaslar(self, n=5, saniye=None):
+        return sorted(self.kayitlar(saniye=saniye), key=lambda k: k['sure_ms'], reverse=True)[:n]
+
+    @staticmethod
+    def _json_satiri(kayit):
+        satir = dict(kayit, zaman=datetime.fromtimestamp(kayit['zaman']).isoformat(timespec='milliseconds'))
+        satir.pop('iplik', None)
+        return json.dumps(satir, ensure_ascii=False)
+
+    def jsonl(self, saniye=None):
+        return "\n".join(self._json_satiri(k) for k in self.kayitlar(saniye=saniye))
+
+
+def _adet(tur, args, kwargs, sonuc):
+    # Çağrının taşıdığı satır/hücre sayısı (kota ve yük takibi için)
+    try:
+        if tur in ('get_all_values', 'get_all_records'):
+            return len(sonuc)
+        if tur == 'batch_get':
+            return sum(len(a) for a in sonuc)
+        if tur == 'values_batch_get':
+            return sum(len(a.get('values', [])) for a in sonuc.get('valueRanges', []))
+        if tur == 'append_rows':
+            return len(args[0] if args else kwargs.get('values', []))
+        if tur == 'batch_update':
+            veri = args[0] if args else kwargs.get('data', [])
+            if isinstance(veri, dict):  # spreadsheets.batchUpdate: eklenen + güncellenen satırlar
+                return sum(len(p.get('rows', [])) for i in veri.get('requests', []) for p in i.values())
+            return sum(len(v) for parca in veri for v in parca.get('values', []))
+        if tur == 'update':
+            return sum(len(r) for r in (args[0] if args else kwargs.get('values', [])))
+        if tur == 'delete_rows':
+            return (args[1] - args[0] + 1) if len(args) > 1 else 1
+        if tur in ('append_row', 'update_cell', 'cell', 'row_values'):
+            return 1
+    except Exception:
+        pass
+    return 0
+
+
+class _Olculen:
+    # gspread nesnesi sarmalayıcısı: metotlar süre/adet ile kaydedilir, özellikler aynen geçer
+    _SAYFA_DONDURENLER = {'worksheet', 'add_worksheet', 'get_worksheet'}
+
+    def __init__(self, nesne, olcum, sayfa=''):
+        self._nesne = nesne
+        self._olcum = olcum
+        self._sayfa_adi = sayfa
+
+    def __getattr__(self, ad):
+        deger = getattr(self._nesne, ad)
+        if not callable(deger):
+            return deger
+
+        def sarmalanmis(*args, **kwargs):
+            sayfa = self._sayfa_adi or self._hedef(ad, args, kwargs)
+            with self._olcum.olc(ad, sayfa) as bilgi:
+                sonuc = deger(*args, **kwargs)
+                bilgi['adet'] = _adet(ad, args, kwargs, sonuc)
+            if ad in self._SAYFA_DONDURENLER:
+                return _Olculen(sonuc, self._olcum, sonuc.title)
+            if ad == 'worksheets':
+                return [_Olculen(w, self._olcum, w.title) for w in sonuc]
+            return sonuc
+        return sarmalanmis
+
+    @staticmethod
+    def _hedef(ad, args, kwargs):
+        if ad == 'values_batch_get':
+            return ",".join(a.split('!')[0].strip("'") for a in (args[0] if args else kwargs.get('ranges', [])))
+        if ad in ('worksheet', 'add_worksheet'):
+            return str(args[0] if args else kwargs.get('title', ''))
+        return ''
+
+
+def olculen_kitap(sh, olcum):
+    # SheetsDepo'ya verilecek Spreadsheet'i ölçülen hale getirir
+    return _Olculen(sh, olcum)
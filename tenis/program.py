@@ -0,0 +1,137 @@
+import heapq
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from tenis.depolama import tarih_anahtari
+
+
+def saat_anahtari(saat):
+    # "18:00", "18.00", "18:30" -> "18:00" (program tam saatlerle tutulur); çözülemezse ""
+    try:
+        return f"{int(str(saat).strip().replace('.', ':').split(':')[0]):02d}:00"
+    except ValueError:
+        return ""
+
+
+class Doluluk:
+    # Haftalık program endeksi: (gün, saat) hücresi başına aktif üye idleri ve grup/özel sayıları.
+    # Üye eklenince/düzenlenince/yenilenince guncelle() ile tutulur; süresi dolanlar her sorgudan önce
+    # sona_erenleri_cikar() ile düşülür (yığının başına bakmak kadar ucuz). Sorgular tüm üyeleri taramaz.
+    def __init__(self, gunler, saatler, kort_sayisi, grup_kontenjani):
+        self.gunler = list(gunler)
+        self.saatler = list(saatler)
+        self.kort_sayisi = kort_sayisi
+        self.grup_kontenjani = grup_kontenjani
+        self._gun_no = {g: i for i, g in enumerate(self.gunler)}
+        self._saat_no = {s: i for i, s in enumerate(self.saatler)}
+
+        self.grup = np.zeros((len(self.gunler), len(self.saatler)), dtype=np.int32)
+        self.ozel = np.zeros_like(self.grup)
+        self._hucreler = {}   # (gün no, saat no) -> {uye_id}
+        self._uyeler = {}     # uye_id -> (hücreler, özel mi, bitiş)
+        self._bitisler = []   # (bitiş, uye_id) yığını
+        self._kilit = threading.RLock()
+        self.surum = 0
+
+    # --- Bakım ---
+    def _hucreleri(self, kayit):
+        saat_no = self._saat_no.get(saat_anahtari(kayit.get('saat')))
+        if saat_no is None:
+            return ()
+        gunler = {self._gun_no[g.strip()] for g in str(kayit.get('gunler', '')).split(',') if g.strip() in self._gun_no}
+        return tuple((g, saat_no) for g in sorted(gunler))
+
+    def _cikar(self, uye_id):
+        eski = self._uyeler.pop(uye_id, None)
+        if eski is None:
+            return
+        hucreler, ozel_mi, _ = eski
+        sayac = self.ozel if ozel_mi else self.grup
+        for h in hucreler:
+            sayac[h] -= 1
+            self._hucreler[h].discard(uye_id)
+
+    def guncelle(self, uye_id, kayit, bugun):
+        # kayit None ise (silinmiş) veya üye aktif değilse programdan çıkarılır
+        uye_id = str(uye_id)
+        with self._kilit:
+            self._cikar(uye_id)
+            if kayit:
+                bitis = tarih_anahtari(kayit.get('bitis_tarihi'))
+                try:
+                    kalan = int(float(kayit.get('kalan_hak') or 0))
+                except (TypeError, ValueError):
+                    kalan = 0
+                hucreler = self._hucreleri(kayit)
+                if kalan > 0 and bitis >= str(bugun) and hucreler:
+                    ozel_mi = kayit.get('ders_tipi') == 'Özel Ders'
+                    sayac = self.ozel if ozel_mi else self.grup
+                    for h in hucreler:
+                        sayac[h] += 1
+                        self._hucreler.setdefault(h, set()).add(uye_id)
+                    self._uyeler[uye_id] = (hucreler, ozel_mi, bitis)
+                    heapq.heappush(self._bitisler, (bitis, uye_id))
+            self.surum += 1
+
+    def yukle(self, uyeler, bugun):
+        for kayit in uyeler:
+            self.guncelle(kayit.get('id'), kayit, bugun)
+        return self
+
+    def sona_erenleri_cikar(self, bugun):
+        # Bitiş tarihi geçenler çıkarılır; yığındaki eski (yenilenmiş) kayıtlar atlanır
+        bugun, adet = str(bugun), 0
+        with self._kilit:
+            while self._bitisler and self._bitisler[0][0] < bugun:
+                bitis, uye_id = heapq.heappop(self._bitisler)
+                if uye_id in self._uyeler and self._uyeler[uye_id][2] == bitis:
+                    self._cikar(uye_id)
+                    adet += 1
+            if adet:
+                self.surum += 1
+        return adet
+
+    # --- Sorgular ---
+    def _kort(self, grup, ozel):
+        # Özel ders bir kort, grup dersi kontenjan başına bir kort kullanır
+        return ozel + -(-grup // self.grup_kontenjani)
+
+    def hucre(self, gun, saat, bugun=None):
+        h = (self._gun_no[gun], self._saat_no[saat_anahtari(saat)])
+        self.sona_erenleri_cikar(bugun or date.today())
+        with self._kilit:
+            grup, ozel = int(self.grup[h]), int(self.ozel[h])
+            uyeler = sorted(self._hucreler.get(h, ()))
+        kort = self._kort(grup, ozel)
+        bos_kort = max(0, self.kort_sayisi - kort)
+        return {
+            'uyeler': uyeler, 'grup': grup, 'ozel': ozel, 'kort': kort, 'bos_kort': bos_kort,
+            # Açık grup kortlarındaki boş yer (kort yetiyorsa) + boş kortlara açılabilecek yeni gruplar
+            'grup_bos_yer': (-grup % self.grup_kontenjani if kort <= self.kort_sayisi else 0)
+                            + bos_kort * self.grup_kontenjani,
+        }
+
+    def cakismalar(self, gunler, saat, ozel_mi, bugun=None):
+        # Yeni bir üye bu gün/saatlere eklenirse yer kalmayan hücreler: [(gün, saat, hücre bilgisi)]
+        sonuc = []
+        for gun in gunler:
+            bilgi = self.hucre(gun, saat, bugun)
+            if (bilgi['bos_kort'] if ozel_mi else bilgi['grup_bos_yer']) < 1:
+                sonuc.append((gun, saat_anahtari(saat), bilgi))
+        return sonuc
+
+    def izgara(self, deger='uye', bugun=None):
+        # Saat x gün tablosu: 'uye' (grup + özel) veya 'kort' (kullanılan kort)
+        self.sona_erenleri_cikar(bugun or date.today())
+        with self._kilit:
+            grup, ozel = self.grup.copy(), self.ozel.copy()
+        tablo = grup + ozel if deger == 'uye' else self._kort(grup, ozel)
+        return pd.DataFrame(tablo.T, index=self.saatler, columns=self.gunler)
+
+    def asiri_dolu(self, bugun=None):
+        kort = self.izgara('kort', bugun)
+        return [(g, s, int(kort.at[s, g])) for s in kort.index for g in kort.columns
+                if kort.at[s, g] > self.kort_sayisi]
@@ -0,0 +1,158 @@
+import codecs
+import importlib.util
+import io
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+# Rapor sütunlarının Türkçe başlıkları
+ETIKETLER = {
+    'ad_soyad': 'Ad Soyad', 'telefon': 'Telefon', 'cinsiyet': 'Cinsiyet', 'yas': 'Yaş',
+    'ders_tipi': 'Ders Tipi', 'kalan_hak': 'Kalan Hak', 'durum': 'Durum', 'veli_adi': 'Veli Adı',
+    'gunler': 'Günler', 'saat': 'Saat', 'toplam_hak': 'Paket Büyüklüğü', 'ucret': 'Ücret',
+    'baslangic_tarihi': 'Kayıt Tarihi',
+}
+
+# Rapor tanımları: filtre (sütun, değer) veya None + gösterilecek sütunlar.
+# Yeni rapor = yeni satır; filtre sütunları tek geçişte gruplanır.
+RAPORLAR = {
+    "Tüm Üyeler (Detaylı)": {'filtre': None,
+                             'sutunlar': ['ad_soyad', 'telefon', 'cinsiyet', 'yas', 'ders_tipi', 'gunler', 'saat', 'kalan_hak', 'durum']},
+    "Çocuklar ve Velileri": {'filtre': ('yas_grubu', 'Çocuk (Junior)'),
+                             'sutunlar': ['ad_soyad', 'veli_adi', 'telefon', 'kalan_hak']},
+    "Grup Dersi Alanlar": {'filtre': ('ders_tipi', 'Grup Dersi'),
+                           'sutunlar': ['ad_soyad', 'telefon', 'gunler', 'saat', 'kalan_hak']},
+    "Özel Ders Alanlar": {'filtre': ('ders_tipi', 'Özel Ders'),
+                          'sutunlar': ['ad_soyad', 'telefon', 'gunler', 'saat', 'kalan_hak', 'toplam_hak']},
+    "Kadın Üyeler": {'filtre': ('cinsiyet', 'Kadın'), 'sutunlar': ['ad_soyad', 'telefon', 'yas', 'ders_tipi']},
+    "Erkek Üyeler": {'filtre': ('cinsiyet', 'Erkek'), 'sutunlar': ['ad_soyad', 'telefon', 'yas', 'ders_tipi']},
+    "Nakit Ödeyenler": {'filtre': ('odeme_yontemi', 'Nakit'), 'sutunlar': ['ad_soyad', 'ucret', 'baslangic_tarihi']},
+    "Kredi Kartı ile Ödeyenler": {'filtre': ('odeme_yontemi', 'Kredi Kartı'), 'sutunlar': ['ad_soyad', 'ucret', 'baslangic_tarihi']},
+    "IBAN ile Ödeyenler": {'filtre': ('odeme_yontemi', 'IBAN'), 'sutunlar': ['ad_soyad', 'ucret', 'baslangic_tarihi']},
+}
+
+# Durum filtresi -> aktif_mi değeri (None: hepsi)
+DURUM_FILTRELERI = {"Hepsi": None, "Sadece Aktifler": True, "Sadece Pasifler": False}
+
+# Dışa aktarımda bir seferde dönüştürülen satır sayısı (bellek tepe noktası bununla sınırlı kalır)
+PARCA_BOYUTU = 5000
+
+# Biçim -> (dosya adı, MIME, gereken paket)
+BICIMLER = {
+    "Excel (tek dosya, çok sayfa)": ("raporlar.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsxwriter"),
+    "CSV (zip)": ("raporlar_csv.zip", "application/zip", None),
+    "Parquet (zip)": ("raporlar_parquet.zip", "application/zip", "pyarrow"),
+}
+
+
+def kullanilabilir_bicimler():
+    return [ad for ad, (_, _, paket) in BICIMLER.items() if paket is None or importlib.util.find_spec(paket)]
+
+
+def rapor_satirlari(df, durum_filtresi="Hepsi"):
+    # Tüm raporların satır konumları: durum süzgeci bir kez, filtre sütunu başına tek groupby
+    taban = np.arange(len(df))
+    aktif = DURUM_FILTRELERI[durum_filtresi]
+    if aktif is not None:
+        taban = np.flatnonzero(df['aktif_mi'].to_numpy() == aktif)
+    alt = df.iloc[taban]
+
+    gruplar = {
+        sutun: alt.groupby(sutun, observed=True, sort=False).indices
+        for sutun in {r['filtre'][0] for r in RAPORLAR.values() if r['filtre']}
+    }
+    bos = np.array([], dtype=np.int64)
+    return {
+        ad: taban if r['filtre'] is None else taban[gruplar[r['filtre'][0]].get(r['filtre'][1], bos)]
+        for ad, r in RAPORLAR.items()
+    }
+
+
+def rapor_tablosu(df, satirlar, rapor_adi):
+    # Ekranda gösterilecek tablo (sadece raporun satır ve sütunları)
+    return df.iloc[satirlar][RAPORLAR[rapor_adi]['sutunlar']].rename(columns=ETIKETLER)
+
+
+def _parcalar(df, satirlar, rapor_adi):
+    sutunlar = RAPORLAR[rapor_adi]['sutunlar']
+    for i in range(0, len(satirlar), PARCA_BOYUTU):
+        yield df.iloc[satirlar[i:i + PARCA_BOYUTU]][sutunlar].rename(columns=ETIKETLER)
+
+
+def csv_yaz(hedef, df, satirlar, rapor_adi):
+    # Excel'in Türkçe karakterleri doğru açması için UTF-8 BOM ile, parça parça
+    hedef.write(codecs.BOM_UTF8)
+    for i, parca in enumerate(_parcalar(df, satirlar, rapor_adi)):
+        hedef.write(parca.to_csv(index=False, header=(i == 0)).encode('utf-8'))
+    if len(satirlar) == 0:
+        hedef.write(",".join(ETIKETLER.get(s, s) for s in RAPORLAR[rapor_adi]['sutunlar']).encode('utf-8') + b"\n")
+
+
+def _excel_yaz(hedef, df, satirlar_sozlugu):
+    import xlsxwriter
+
+    # constant_memory: satırlar yazıldıkça diske aktarılır, çalışma kitabı bellekte birikmez
+    kitap = xlsxwriter.Workbook(hedef, {'constant_memory': True, 'default_date_format': 'dd.mm.yyyy'})
+    try:
+        for rapor_adi, satirlar in satirlar_sozlugu.items():
+            sayfa = kitap.add_worksheet(rapor_adi[:31])
+            sayfa.write_row(0, 0, [ETIKETLER.get(s, s) for s in RAPORLAR[rapor_adi]['sutunlar']])
+            satir_no = 1
+            for parca in _parcalar(df, satirlar, rapor_adi):
+                degerler = parca.astype(object).where(parca.notna(), None)
+                for satir in degerler.itertuples(index=False, name=None):
+                    sayfa.write_row(satir_no, 0, satir)
+                    satir_no += 1
+    finally:
+        kitap.close()
+
+
+def _parquet_yaz(yol, df, satirlar, rapor_adi):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    yazici = None
+    try:
+        for parca in _parcalar(df, satirlar, rapor_adi):
+            tablo = pa.Table.from_pandas(parca, preserve_index=False)
+            if yazici is None:
+                yazici = pq.ParquetWriter(yol, tablo.schema)
+            yazici.write_table(tablo)
+    finally:
+        if yazici is not None:
+            yazici.close()
+    if yazici is None:
+        pq.write_table(pa.Table.from_pandas(df.iloc[:0][RAPORLAR[rapor_adi]['sutunlar']].rename(columns=ETIKETLER),
+                                            preserve_index=False), yol)
+
+
+def disa_aktar(df, satirlar_sozlugu, bicim):
+    # Verilen raporları seçilen biçimde bellekteki bir dosyaya (BytesIO) yazar, başa sarılmış döndürür.
+    # st.download_button'a fonksiyon olarak verilir: dosya sadece indirme istenince üretilir.
+    # (Açık disk dosyası verilemez: download_button onu kabul etmez, kapatan da olmaz.)
+    cikti = io.BytesIO()
+    if bicim.startswith("Excel"):
+        _excel_yaz(cikti, df, satirlar_sozlugu)
+    elif bicim.startswith("CSV"):
+        with zipfile.ZipFile(cikti, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for rapor_adi, satirlar in satirlar_sozlugu.items():
+                with zf.open(f"{rapor_adi}.csv", 'w') as hedef:
+                    csv_yaz(hedef, df, satirlar, rapor_adi)
+    else:
+        with zipfile.ZipFile(cikti, 'w', zipfile.ZIP_DEFLATED) as zf, tempfile.TemporaryDirectory() as klasor:
+            for rapor_adi, satirlar in satirlar_sozlugu.items():
+                yol = os.path.join(klasor, f"{rapor_adi}.parquet")
+                _parquet_yaz(yol, df, satirlar, rapor_adi)
+                zf.write(yol, f"{rapor_adi}.parquet")
+                os.remove(yol)
+    cikti.seek(0)
+    return cikti
+
+
+def tek_rapor_csv(df, satirlar, rapor_adi):
+    cikti = io.BytesIO()
+    csv_yaz(cikti, df, satirlar, rapor_adi)
+    cikti.seek(0)
+    return cikti
@@ -0,0 +1,35 @@
+from tenis.arama import AramaEndeksi, katla, rakamlar
+
+UYELER = [
+    {'id': 1, 'ad_soyad': 'Şahin Işık', 'veli_adi': '', 'telefon': '05321234567'},
+    {'id': 2, 'ad_soyad': 'Ayşe Şahinoğlu', 'veli_adi': 'Fatma Şahinoğlu', 'telefon': 5551112233},
+    {'id': 3, 'ad_soyad': 'Mehmet Kaya', 'veli_adi': 'Ali Sahin', 'telefon': '05427654321'},
+]
+
+
+def test_katla_turkce_harfleri_ve_buyuk_harfi_esitler():
+    assert katla("ŞAHİN IŞIK") == katla("şahin ışık") == "sahin isik"
+    assert rakamlar("0532 123 45 67") == "5321234567"
+
+
+def test_puanlar():
+    endeks = AramaEndeksi().yukle(UYELER)
+    # 2: ad kelime başı (4) + veli (1); 1: ad kelime başı (4); 3: sadece veli (1)
+    assert endeks.ara("sahin").tolist() == [2, 1, 3]
+    assert endeks.ara("ışık").tolist() == endeks.ara("ISIK").tolist() == [1]
+
+
+def test_kelime_ici_ve_telefon():
+    endeks = AramaEndeksi().yukle(UYELER)
+    assert endeks.ara("hinoğ").tolist() == [2]
+    assert endeks.ara("0555").tolist() == [2]
+    assert endeks.ara("kaya 0542").tolist() == [3]
+    assert endeks.ara("kaya 0555").tolist() == []
+
+
+def test_guncelle_endeksi_tazeler():
+    endeks = AramaEndeksi().yukle(UYELER)
+    endeks.guncelle(3, dict(UYELER[2], veli_adi='Ali Demir'))
+    endeks.guncelle(1, None)
+    assert endeks.ara("sahin").tolist() == [2]
+    assert endeks.ara("demir").tolist() == [3]
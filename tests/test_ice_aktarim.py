@@ -0,0 +1,81 @@
+import io
+from datetime import date
+
+import pandas as pd
+
+from tenis.ice_aktarim import BASLIKLAR, ORNEK_SATIR, dogrula, dosya_oku, sablon_csv
+
+BUGUN = date(2025, 9, 1)
+SAATLER = [f"{s:02d}:00" for s in range(7, 23)]
+
+
+def tablo(*satirlar, basliklar=None):
+    return pd.DataFrame([list(s) for s in satirlar], columns=basliklar or list(BASLIKLAR))
+
+
+def satir(**degisen):
+    degerler = dict(zip(BASLIKLAR, ORNEK_SATIR))
+    degerler.update(degisen)
+    return [degerler[b] for b in BASLIKLAR]
+
+
+def hatalar(hata_tablosu):
+    return dict(zip(hata_tablosu['Satır'], hata_tablosu['Hata']))
+
+
+def test_gecerli_satir_uye_kaydina_cevrilir():
+    kayitlar, hata = dogrula(tablo(satir()), [], BUGUN, SAATLER)
+    assert hata.empty
+    assert kayitlar == [{
+        'ad_soyad': 'Ayşe Yılmaz', 'telefon': '05321234567', 'cinsiyet': 'Kadın', 'dogum_tarihi': '2015-03-14',
+        'baslangic_tarihi': '2025-09-01', 'bitis_tarihi': '2025-10-01', 'toplam_hak': 8, 'kalan_hak': 8,
+        'ucret': 3000, 'odeme_yontemi': 'Nakit', 'gunler': 'Salı,Perşembe', 'ders_tipi': 'Grup Dersi',
+        'veli_adi': 'Fatma Yılmaz', 'durum': 'Aktif', 'kategori': 'Çocuk', 'saat': '17:00',
+    }]
+
+
+def test_basliklar_ve_degerler_harf_farki_gozetmez():
+    basliklar = [b.upper().replace('İ', 'I') for b in BASLIKLAR]
+    kayitlar, hata = dogrula(tablo(satir(**{'Günler': 'sali; PERSEMBE', 'Telefon': '5321234567',
+                                            'Paket Tipi': 'ozel ders', 'Saat': '17.30'}),
+                                   basliklar=basliklar), [], BUGUN, SAATLER)
+    assert hata.empty
+    assert (kayitlar[0]['gunler'], kayitlar[0]['telefon'], kayitlar[0]['ders_tipi'], kayitlar[0]['saat']) == \
+        ('Salı,Perşembe', '05321234567', 'Özel Ders', '17:00')
+
+
+def test_hatalar_dosyadaki_satir_numarasiyla_listelenir():
+    kayitlar, hata = dogrula(tablo(
+        satir(),
+        satir(**{'Ad Soyad': 'Ali', 'Telefon': '123', 'Ders Sayısı': '0'}),
+        satir(**{'Ad Soyad': 'Can', 'Saat': '23:00', 'Günler': 'Pazartes'}),
+        satir(**{'Ad Soyad': 'Deniz', 'Bitiş Tarihi': '01.08.2025'}),
+        satir(),
+    ), [], BUGUN, SAATLER)
+    assert [k['ad_soyad'] for k in kayitlar] == ['Ayşe Yılmaz']
+    assert hatalar(hata) == {
+        3: "Telefon 11 hane olmalı (05xxxxxxxxx); Ders Sayısı pozitif tam sayı olmalı",
+        4: "Günler geçersiz (ör. Salı,Perşembe); Saat geçersiz (07:00-22:00 arası tam saat olmalı)",
+        5: "Bitiş Tarihi başlangıçtan önce",
+        6: "Dosyada tekrar ediyor",
+    }
+
+
+def test_kayitli_uye_tekrar_eklenmez():
+    mevcut = [{'ad_soyad': 'AYŞE YILMAZ', 'telefon': 5321234567}]
+    kayitlar, hata = dogrula(tablo(satir()), mevcut, BUGUN, SAATLER)
+    assert kayitlar == []
+    assert hatalar(hata) == {2: "Zaten kayıtlı (aynı ad ve telefon)"}
+
+
+def test_eksik_zorunlu_sutun():
+    kayitlar, hata = dogrula(tablo(['Ayşe', '8'], basliklar=['Ad Soyad', 'Ders Sayısı']), [], BUGUN, SAATLER)
+    assert kayitlar == []
+    assert hata['Hata'].tolist() == ["Eksik sütun: Günler, Saat"]
+
+
+def test_sablon_noktali_virgullu_csv_olarak_da_okunur():
+    assert dosya_oku(io.BytesIO(sablon_csv()), 'sablon.csv').iloc[0].tolist() == ORNEK_SATIR
+    metin = ';'.join(BASLIKLAR) + '\n' + ';'.join(ORNEK_SATIR)
+    okunan = dosya_oku(io.BytesIO(metin.encode('cp1254')), 'uyeler.csv')
+    assert dogrula(okunan, [], BUGUN, SAATLER)[0][0]['ad_soyad'] == 'Ayşe Yılmaz'
@@ -0,0 +1,104 @@
+from datetime import date
+
+import pytest
+
+from benchmarks.sahte_gspread import SahteKitap
+from tenis.depolama import ISLENEN_SUTUNU, SAYFA_SUTUNLARI, SheetsDepo, SqliteDepo
+from tenis.islemler import dusum_yap, gecmisi_arsivle, yeni_uye_kaydi
+
+# Pazartesi/Çarşamba üyesi, 1 Eylül 2025 (pazartesi) başlar: 10 Eylül'e kadar 4 ders
+BASLANGIC = date(2025, 9, 1)
+BUGUN = date(2025, 9, 10)
+DERSLER = ['2025-09-01', '2025-09-03', '2025-09-08', '2025-09-10']
+
+
+def uye(uye_id=1, hak=8, gunler=('Pazartesi', 'Çarşamba')):
+    return yeni_uye_kaydi(uye_id, 'Ayşe Yılmaz', '05321234567', 'Kadın', '2015-03-14', BASLANGIC,
+                          date(2025, 10, 1), 3000, 'Nakit', list(gunler), 'Grup Dersi', hak, '', 'Çocuk', '17:00')
+
+
+@pytest.fixture(params=['sheets', 'sqlite'])
+def depo(request):
+    if request.param == 'sheets':
+        return SheetsDepo(SahteKitap({ad: [list(s)] for ad, s in SAYFA_SUTUNLARI.items()}), ttl_sn=0)
+    return SqliteDepo(':memory:')
+
+
+def gecmis(depo):
+    return sorted(str(g['tarih']) for g in depo.kayitlar("ders_gecmisi", taze=True))
+
+
+def test_dusum_dersleri_duser_ve_isaretciyi_ilerletir(depo):
+    depo.satirlari_ekle("uyelikler", [uye()])
+    sonuc = dusum_yap(depo, bugun=BUGUN)
+    assert sonuc['yazilan_satir'] == 4
+    assert gecmis(depo) == DERSLER
+    kayit = depo.uyeler(taze=True)[0]
+    assert int(kayit['kalan_hak']) == 4
+    assert str(kayit[ISLENEN_SUTUNU]) == str(BUGUN)
+
+
+def test_ayni_gun_tekrar_calismak_bir_sey_yazmaz(depo):
+    depo.satirlari_ekle("uyelikler", [uye()])
+    dusum_yap(depo, bugun=BUGUN)
+    sonuc = dusum_yap(depo, bugun=BUGUN)
+    assert sonuc['yazilan_satir'] == 0
+    assert sonuc['guncellenen_uye'] == 0
+    assert gecmis(depo) == DERSLER
+    assert int(depo.uyeler(taze=True)[0]['kalan_hak']) == 4
+
+
+def test_sonraki_calisma_sadece_yeni_gunleri_duser(depo):
+    depo.satirlari_ekle("uyelikler", [uye()])
+    dusum_yap(depo, bugun=date(2025, 9, 3))
+    sonuc = dusum_yap(depo, bugun=BUGUN)
+    assert sonuc['dersler'] == {'2025-09-08': 1, '2025-09-10': 1}
+    assert gecmis(depo) == DERSLER
+
+
+def test_kuru_calisma_yazmaz(depo):
+    depo.satirlari_ekle("uyelikler", [uye()])
+    sonuc = dusum_yap(depo, bugun=BUGUN, kuru=True)
+    assert sonuc['yazilan_satir'] == 4
+    assert gecmis(depo) == []
+    assert int(depo.uyeler(taze=True)[0]['kalan_hak']) == 8
+
+
+def test_tatil_ve_hak_siniri(depo):
+    depo.satirlari_ekle("uyelikler", [uye(hak=2)])
+    depo.satirlari_ekle("tatiller", [{'tarih': '2025-09-03'}])
+    sonuc = dusum_yap(depo, bugun=BUGUN)
+    assert gecmis(depo) == ['2025-09-01', '2025-09-08', '2025-09-10']
+    assert int(depo.uyeler(taze=True)[0]['kalan_hak']) == 0
+    assert sonuc['hakki_biten'] == [1]
+
+
+def test_isaretcisi_olmayan_uye_gecmise_bakar(depo):
+    # Eski kayıt: işaretçi yok, iki ders zaten yazılmış (biri arşivde)
+    kayit = dict(uye(), **{ISLENEN_SUTUNU: ''})
+    depo.satirlari_ekle("uyelikler", [kayit])
+    depo.satirlari_ekle("ders_gecmisi", [{'uye_id': 1, 'tarih': '2025-09-01', 'islem_tipi': 'Otomatik'},
+                                         {'uye_id': 1, 'tarih': '2025-09-03', 'islem_tipi': 'Otomatik'}])
+    gecmisi_arsivle(depo, bugun=date(2025, 9, 2))
+    sonuc = dusum_yap(depo, bugun=BUGUN)
+    assert sonuc['dersler'] == {'2025-09-08': 1, '2025-09-10': 1}
+
+
+def test_uye_guncellemesi_yazilamazsa_gecmis_de_yazilmaz(depo, monkeypatch):
+    depo.satirlari_ekle("uyelikler", [uye()])
+
+    def bozuk(*args, **kwargs):
+        raise RuntimeError("yazılamadı")
+
+    if isinstance(depo, SqliteDepo):
+        monkeypatch.setattr(depo, '_guncelle', bozuk)
+    else:
+        monkeypatch.setattr(depo.sh, 'batch_update', bozuk)
+    with pytest.raises(RuntimeError):
+        dusum_yap(depo, bugun=BUGUN)
+    monkeypatch.undo()
+
+    assert gecmis(depo) == []
+    # Sonraki çalıştırma aynı dersleri bir kez yazar
+    assert dusum_yap(depo, bugun=BUGUN)['yazilan_satir'] == 4
+    assert gecmis(depo) == DERSLER
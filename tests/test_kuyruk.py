@@ -0,0 +1,126 @@
+import json
+
+from benchmarks.sahte_gspread import SahteKitap
+from tenis.depolama import SAYFA_SUTUNLARI, SheetsDepo, SqliteDepo
+from tenis.kuyruk import YazmaKuyrugu, _birlestir, _bos_durum, _eskileri_ayikla, _guncelle, _sil
+
+
+def parti(**alanlar):
+    durum = _bos_durum()
+    durum.update(alanlar)
+    return durum
+
+
+def test_ayni_uyenin_guncellemeleri_birlesir():
+    durum = _bos_durum()
+    _guncelle(durum, {1: {'kalan_hak': 5}})
+    _guncelle(durum, {1: {'kalan_hak': 4, 'durum': 'Aktif'}, 2: {'kalan_hak': 1}})
+    assert durum['guncellemeler'] == {'1': {'id': 1, 'alanlar': {'kalan_hak': 4, 'durum': 'Aktif'}},
+                                      '2': {'id': 2, 'alanlar': {'kalan_hak': 1}}}
+
+
+def test_bekleyen_eklemeye_gelen_guncelleme_kayda_islenir():
+    durum = parti(eklemeler={'uyelikler': [{'id': 7, 'kalan_hak': 8}]})
+    _guncelle(durum, {7: {'kalan_hak': 6}})
+    assert durum['eklemeler']['uyelikler'] == [{'id': 7, 'kalan_hak': 6}]
+    assert durum['guncellemeler'] == {}
+
+
+def test_silme_bekleyen_ekleme_ve_guncellemeleri_duser():
+    durum = parti(eklemeler={'uyelikler': [{'id': 7}]})
+    _guncelle(durum, {3: {'kalan_hak': 1}})
+    _sil(durum, 7)
+    _sil(durum, 3)
+    _guncelle(durum, {3: {'kalan_hak': 0}})
+    assert durum['eklemeler']['uyelikler'] == []
+    assert durum['guncellemeler'] == {}
+    assert durum['silmeler'] == [3]
+
+
+def test_birlestir_yeniyi_eskinin_ustune_uygular():
+    eski = parti(guncellemeler={'1': {'id': 1, 'alanlar': {'kalan_hak': 5, 'saat': '17:00'}}})
+    yeni = parti(guncellemeler={'1': {'id': 1, 'alanlar': {'kalan_hak': 4}}},
+                 eklemeler={'ders_gecmisi': [{'uye_id': 1, 'tarih': '2025-09-01'}]})
+    sonuc = _birlestir(eski, yeni)
+    assert sonuc['guncellemeler']['1']['alanlar'] == {'kalan_hak': 4, 'saat': '17:00'}
+    assert sonuc['eklemeler']['ders_gecmisi'] == [{'uye_id': 1, 'tarih': '2025-09-01'}]
+    assert eski['guncellemeler']['1']['alanlar']['kalan_hak'] == 5
+
+
+def test_gonderilen_yeni_deger_parktaki_eskiyi_ayiklar():
+    parkta = [parti(guncellemeler={'1': {'id': 1, 'alanlar': {'kalan_hak': 5, 'saat': '17:00'}},
+                                   '2': {'id': 2, 'alanlar': {'kalan_hak': 3}}},
+                    sifreler={'admin': 'eski'})]
+    gonderilen = parti(guncellemeler={'1': {'id': 1, 'alanlar': {'kalan_hak': 4}}},
+                       silmeler=[2], sifreler={'admin': 'yeni'})
+    _eskileri_ayikla(parkta, gonderilen, _bos_durum())
+    assert parkta == [parti(guncellemeler={'1': {'id': 1, 'alanlar': {'saat': '17:00'}}})]
+
+
+def bos_kitap():
+    return SahteKitap({ad: [list(s)] for ad, s in SAYFA_SUTUNLARI.items()})
+
+
+def test_yenileme_tek_istekte_gider():
+    kitap = bos_kitap()
+    depo = SheetsDepo(kitap)
+    depo.satirlari_ekle("uyelikler", [{'id': 1, 'ad_soyad': 'Ayşe', 'kalan_hak': 2}])
+    kuyruk = YazmaKuyrugu(depo, birlestirme_sn=0.2)
+    kitap.sayac.sifirla()
+
+    kuyruk.uyeleri_guncelle({1: {'kalan_hak': 10}})
+    kuyruk.satirlari_ekle("ozetler", [{'metrik': 'yenileme', 'donem': '2025-09', 'anahtar': '', 'deger': 1}])
+    # Gönderilmeden önce de okumalarda görünür
+    assert kuyruk.uye(1)['kalan_hak'] == 10
+    assert kuyruk.bosalt_bekle(5)
+
+    assert kitap.sayac.cagrilar['batch_update'] == 1
+    assert kitap.sayac.cagrilar['append_rows'] == 0
+    assert int(depo.uyeler(taze=True)[0]['kalan_hak']) == 10
+    assert len(depo.kayitlar("ozetler", taze=True)) == 1
+
+
+def test_bekleyenler_dosyada_kalir_ve_yeniden_acilista_gonderilir(tmp_path):
+    yol = str(tmp_path / "kuyruk.json")
+    # Birleştirme süresi uzun: işçi göndermeden süreç "kapanır"
+    ilk = YazmaKuyrugu(SqliteDepo(':memory:'), yol=yol, birlestirme_sn=3600)
+    ilk.satirlari_ekle("uyelikler", [{'id': 1, 'ad_soyad': 'Ayşe', 'kalan_hak': 8}])
+    ilk.uyeleri_guncelle({1: {'kalan_hak': 7}})
+    ilk.sifre_guncelle('admin', 'yeni')
+    with open(yol, encoding='utf-8') as f:
+        assert json.load(f)['bekleyen']['eklemeler']['uyelikler'] == [{'id': 1, 'ad_soyad': 'Ayşe', 'kalan_hak': 7}]
+
+    depo = SqliteDepo(':memory:')
+    depo.satirlari_ekle("yoneticiler", [{'kullanici_adi': 'admin', 'sifre': 'eski'}])
+    ikinci = YazmaKuyrugu(depo, yol=yol, birlestirme_sn=0)
+    assert ikinci.bosalt_bekle(5)
+    assert [(u['id'], u['kalan_hak']) for u in depo.uyeler(taze=True)] == [(1, 7)]
+    assert depo.kayitlar("yoneticiler", taze=True)[0]['sifre'] == 'yeni'
+
+
+class BozukDepo(SqliteDepo):
+    # Güncellemeler kalıcı bir hatayla reddedilir
+    bozuk = True
+
+    def toplu_yaz(self, eklemeler, degisiklikler):
+        if self.bozuk:
+            raise ValueError("izin yok")
+        return super().toplu_yaz(eklemeler, degisiklikler)
+
+
+def test_gonderilemeyen_parti_park_edilir_ve_gorunur_kalir(tmp_path):
+    depo = BozukDepo(':memory:')
+    depo.satirlari_ekle("uyelikler", [{'id': 1, 'ad_soyad': 'Ayşe', 'kalan_hak': 8}])
+    kuyruk = YazmaKuyrugu(depo, yol=str(tmp_path / "kuyruk.json"), birlestirme_sn=0)
+    kuyruk.uyeleri_guncelle({1: {'kalan_hak': 5}})
+    assert kuyruk.bosalt_bekle(5)
+
+    assert kuyruk.durum()['basarisiz'] == 1
+    assert kuyruk.uye(1)['kalan_hak'] == 5
+    assert depo.uye(1)['kalan_hak'] == 8
+
+    depo.bozuk = False
+    kuyruk.basarisizlari_tekrar_dene()
+    assert kuyruk.bosalt_bekle(5)
+    assert kuyruk.basarisiz == []
+    assert depo.uye(1)['kalan_hak'] == 5
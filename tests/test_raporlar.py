@@ -0,0 +1,37 @@
+from datetime import date
+
+from tenis.islemler import uye_tablosu_kur
+from tenis.raporlar import RAPORLAR, rapor_satirlari, rapor_tablosu
+
+UYELER = [
+    {'id': 1, 'ad_soyad': 'Ayşe', 'telefon': '05321234567', 'cinsiyet': 'Kadın', 'dogum_tarihi': '2015-03-14',
+     'veli_adi': 'Fatma', 'ders_tipi': 'Grup Dersi', 'odeme_yontemi': 'Nakit', 'toplam_hak': 8, 'kalan_hak': 4,
+     'ucret': 3000, 'baslangic_tarihi': '2025-09-01', 'bitis_tarihi': '2025-10-01', 'gunler': 'Salı',
+     'saat': '17:00', 'durum': 'Aktif', 'kategori': 'Çocuk'},
+    {'id': 2, 'ad_soyad': 'Mehmet', 'telefon': '05427654321', 'cinsiyet': 'Erkek', 'dogum_tarihi': '1990-01-01',
+     'veli_adi': '', 'ders_tipi': 'Özel Ders', 'odeme_yontemi': 'IBAN', 'toplam_hak': 4, 'kalan_hak': 0,
+     'ucret': 4000, 'baslangic_tarihi': '2025-08-01', 'bitis_tarihi': '2025-09-01', 'gunler': 'Cuma',
+     'saat': '18:00', 'durum': 'Aktif', 'kategori': 'Yetişkin'},
+]
+
+
+def test_rapor_satirlari_filtre_ve_durum_suzgeci():
+    df = uye_tablosu_kur(UYELER, date(2025, 9, 15))
+    satirlar = rapor_satirlari(df)
+    assert set(satirlar) == set(RAPORLAR)
+    assert satirlar["Tüm Üyeler (Detaylı)"].tolist() == [0, 1]
+    assert satirlar["Çocuklar ve Velileri"].tolist() == [0]
+    assert satirlar["Özel Ders Alanlar"].tolist() == [1]
+    assert satirlar["Kredi Kartı ile Ödeyenler"].tolist() == []
+
+    aktifler = rapor_satirlari(df, "Sadece Aktifler")
+    assert aktifler["Tüm Üyeler (Detaylı)"].tolist() == [0]
+    assert aktifler["Erkek Üyeler"].tolist() == []
+    assert rapor_satirlari(df, "Sadece Pasifler")["Erkek Üyeler"].tolist() == [1]
+
+
+def test_rapor_tablosu_etiketli_sutunlar():
+    df = uye_tablosu_kur(UYELER, date(2025, 9, 15))
+    tablo = rapor_tablosu(df, rapor_satirlari(df)["Nakit Ödeyenler"], "Nakit Ödeyenler")
+    assert list(tablo.columns) == ['Ad Soyad', 'Ücret', 'Kayıt Tarihi']
+    assert tablo['Ad Soyad'].tolist() == ['Ayşe']